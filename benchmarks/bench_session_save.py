@@ -0,0 +1,94 @@
+"""
+Benchmark: session save and load cost as conversations grow.
+
+Compares the append-only log against rewriting the whole file on every save
+(the previous behaviour), and tail loading against parsing every line.
+
+Usage:
+    python benchmarks/bench_session_save.py [--sizes 1000 10000 100000] [--turns 50] [--backend sqlite]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from nanobot.session.manager import Session, SessionManager
+
+
+def make_session(key: str, size: int) -> Session:
+    session = Session(key=key)
+    for i in range(size):
+        session.messages.append({
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": f"message {i} " + "lorem ipsum dolor sit amet " * 8,
+            "timestamp": "2024-01-01T00:00:00",
+            "tokens": 60,
+        })
+    return session
+
+
+def rewrite_save(manager: SessionManager, session: Session) -> None:
+    """The previous save: metadata line plus every message, rewritten each time."""
+    with open(manager.store.sessions_dir / f"{session.key.replace(':', '_')}.jsonl", "w") as f:
+        f.write(json.dumps({
+            "_type": "metadata",
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata,
+        }) + "\n")
+        for msg in session.messages:
+            f.write(json.dumps(msg) + "\n")
+
+
+def time_saves(save, manager: SessionManager, session: Session, turns: int) -> list[float]:
+    times = []
+    for _ in range(turns):
+        session.add_message("user", "how are you?")
+        session.add_message("assistant", "fine, thanks")
+        started = time.perf_counter()
+        save(manager, session)
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def time_load(manager: SessionManager, key: str) -> tuple[float, int]:
+    manager._cache.clear()
+    started = time.perf_counter()
+    session = manager.get_or_create(key)
+    return (time.perf_counter() - started) * 1000, len(session.messages)
+
+
+def run(sizes: list[int], turns: int, backend: str) -> None:
+    print(f"{'messages':>9} {'rewrite ms':>11} {'append ms':>10} {'append max':>11} "
+          f"{'full load ms':>13} {'tail load ms':>13} {'loaded':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["HOME"] = tmp
+        for size in sizes:
+            manager = SessionManager(Path(tmp))
+            store_manager = SessionManager(Path(tmp), backend=backend)
+            tail_manager = SessionManager(Path(tmp), load_tokens=16000, backend=backend)
+            
+            legacy = make_session(f"bench:legacy{size}", size)
+            rewrite = time_saves(rewrite_save, manager, legacy, turns)
+            
+            session = make_session(f"bench:log{size}", size)
+            store_manager.save(session)  # Initial write of the existing history
+            append = time_saves(SessionManager.save, store_manager, session, turns)
+            
+            full_ms, _ = time_load(store_manager, session.key)
+            tail_ms, loaded = time_load(tail_manager, session.key)
+            print(f"{size:>9} {statistics.median(rewrite):>11.2f} {statistics.median(append):>10.3f} "
+                  f"{max(append):>11.3f} {full_ms:>13.1f} {tail_ms:>13.2f} {loaded:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--backend", choices=["jsonl", "sqlite"], default="jsonl")
+    args = parser.parse_args()
+    run(args.sizes, args.turns, args.backend)
@@ -0,0 +1,89 @@
+"""
+Benchmark: prompt size with all skills listed vs. top-k retrieval.
+
+Generates N synthetic skills, then for a set of sample messages measures the
+tokens spent on skills (system prompt summary plus per-message relevant
+skills) and the time to build the prompt.
+
+Usage:
+    python benchmarks/bench_skills_retrieval.py [--sizes 10 50 100 500 1000] [--top-k 8]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.utils.tokens import count_tokens
+
+VOCABULARY = (
+    "weather forecast rain github issue pull request pdf table extract calendar meeting "
+    "translate language email inbox invoice spreadsheet csv chart docker container deploy "
+    "kubernetes database sql backup photo resize video transcode audio podcast transcript "
+    "recipe cooking fitness workout travel flight hotel budget expense stock crypto news "
+    "summary article research paper citation latex slides presentation music playlist"
+).split()
+
+MESSAGES = [
+    "Can you check the weather forecast for Berlin tomorrow?",
+    "Extract the tables from this PDF invoice into a CSV spreadsheet",
+    "Summarize this research paper and list its citations",
+    "Back up the SQL database and deploy the docker container",
+]
+
+
+def make_skills(root: Path, count: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    for i in range(count):
+        words = rng.sample(VOCABULARY, 6)
+        name = f"{words[0]}-{words[1]}-{i}"
+        skill = root / "skills" / name
+        skill.mkdir(parents=True)
+        body = " ".join(rng.choice(VOCABULARY) for _ in range(120))
+        skill.joinpath("SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: Helps with {' '.join(words[:4])} tasks.\n---\n\n# {name}\n\n{body}\n"
+        )
+
+
+def skills_tokens(builder: ContextBuilder, message: str) -> int:
+    """Tokens spent on skills: the system prompt section plus the runtime context list."""
+    system = builder.build_system_prompt()
+    section = system[system.find("# Skills"):] if "# Skills" in system else ""
+    runtime = builder.build_runtime_context(skills_query=message)
+    return count_tokens(section) + count_tokens(runtime)
+
+
+def run(sizes: list[int], top_k: int) -> None:
+    print(f"{'skills':>7} {'all (tok)':>10} {'top-k (tok)':>12} {'reduction':>10} {'build ms':>9}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            workspace = Path(tmp)
+            make_skills(workspace, size)
+            
+            full = ContextBuilder(workspace, skills_top_k=0)
+            ranked = ContextBuilder(workspace, skills_top_k=top_k)
+            for b in (full, ranked):
+                b.skills.builtin_skills = None
+                b.skills.index_path = workspace / f"index-{id(b)}.json"
+            
+            all_tokens = statistics.mean(skills_tokens(full, m) for m in MESSAGES)
+            topk_tokens = statistics.mean(skills_tokens(ranked, m) for m in MESSAGES)
+            
+            started = time.perf_counter()
+            for m in MESSAGES:
+                ranked.build_messages(history=[], current_message=m)
+            build_ms = (time.perf_counter() - started) * 1000 / len(MESSAGES)
+            
+            reduction = 1 - topk_tokens / all_tokens if all_tokens else 0.0
+            print(f"{size:>7} {all_tokens:>10.0f} {topk_tokens:>12.0f} {reduction:>9.0%} {build_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500, 1000])
+    parser.add_argument("--top-k", type=int, default=8)
+    args = parser.parse_args()
+    run(args.sizes, args.top_k)
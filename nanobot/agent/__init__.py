@@ -1,8 +1,9 @@
 """Agent core module."""
 
 from nanobot.agent.loop import AgentLoop
+from nanobot.agent.artifacts import ArtifactStore
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.skills import SkillsLoader
 
-__all__ = ["AgentLoop", "ContextBuilder", "MemoryStore", "SkillsLoader"]
+__all__ = ["AgentLoop", "ArtifactStore", "ContextBuilder", "MemoryStore", "SkillsLoader"]
@@ -0,0 +1,65 @@
+"""Artifact store for tool outputs too large to keep in context."""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.utils.helpers import ensure_dir
+
+
+class ArtifactStore:
+    """
+    Stores oversized tool outputs on disk, addressed by content hash.
+    
+    The agent keeps only a preview and the artifact ID in its context and
+    pages through the rest with the read_artifact tool.
+    """
+    
+    def __init__(self, root: Path, max_age_days: float = 7):
+        self.root = ensure_dir(root)
+        self.max_age_s = max_age_days * 86400
+        self._prune()
+    
+    def put(self, content: str) -> str:
+        """
+        Store content and return its artifact ID.
+        
+        Identical content maps to the same ID and is only written once.
+        """
+        artifact_id = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        path = self._path(artifact_id)
+        if path.exists():
+            os.utime(path)  # Keep recently used artifacts from being pruned
+        else:
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(content, encoding="utf-8")
+            tmp.replace(path)
+        return artifact_id
+    
+    def get(self, artifact_id: str) -> str | None:
+        """Get the full content of an artifact, or None if it does not exist."""
+        path = self._path(artifact_id)
+        if not path.is_file():
+            return None
+        return path.read_text(encoding="utf-8")
+    
+    def _path(self, artifact_id: str) -> Path:
+        # IDs are hex digests; reject anything that could escape the store
+        if not artifact_id.isalnum():
+            artifact_id = "invalid"
+        return self.root / f"{artifact_id}.txt"
+    
+    def _prune(self) -> None:
+        """Delete artifacts that have not been used for max_age_days."""
+        if self.max_age_s <= 0:
+            return
+        cutoff = time.time() - self.max_age_s
+        for path in self.root.glob("*.txt"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError as e:
+                logger.debug(f"Failed to prune artifact {path.name}: {e}")
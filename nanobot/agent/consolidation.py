@@ -0,0 +1,292 @@
+"""Background consolidation of memory files."""
+
+import asyncio
+import json
+import re
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.providers.base import LLMProvider
+from nanobot.utils.aio import run_io
+from nanobot.utils.filecache import Fingerprint, fingerprint
+from nanobot.utils.helpers import atomic_write, ensure_dir
+
+DIGEST_PROMPT = """You maintain an assistant's memory. Summarize the notes below into a concise digest.
+Keep every concrete fact, decision, commitment, date, name and number that could matter later.
+Drop chit-chat, repetition and anything already resolved. Use short Markdown bullet points grouped under headings.
+Reply with the digest only."""
+
+LONG_TERM_PROMPT = """You maintain an assistant's long-term memory file (MEMORY.md).
+Merge the durable facts from the new digests into it: facts about the user, their preferences, people,
+projects and standing instructions. Remove duplicates and outdated entries; when facts conflict, keep the newest.
+Keep the existing structure where it makes sense. The result must stay under {budget} characters.
+Reply with the complete new MEMORY.md only."""
+
+_DAILY_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+_LIST_ITEM_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*\w.*)$")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_WEEKLY_RE = re.compile(r"^(\d{4})-W(\d{2})$")
+
+
+class MemoryConsolidator:
+    """
+    Periodically folds old memory files into digests.
+    
+    Runs off the hot path as its own background task:
+    - Daily notes older than keep_days are summarized into one digest per
+      ISO week (memory/digests/YYYY-Www.md).
+    - Weekly digests older than monthly_after_days are merged per month
+      (memory/digests/YYYY-MM.md).
+    - Durable facts from new digests are merged into MEMORY.md, which is
+      deduplicated and kept under max_long_term_chars.
+    Consolidated files are moved to memory/archive/, where memory_search
+    still finds them. Weekly digests not merged into MEMORY.md yet are
+    recorded in memory/digests/.pending.json, so a failed or skipped merge
+    is retried on the next run.
+    """
+    
+    def __init__(
+        self,
+        workspace: Path,
+        provider: LLMProvider,
+        model: str | None = None,
+        interval_s: float = 6 * 3600,
+        keep_days: int = 7,
+        monthly_after_days: int = 60,
+        max_long_term_chars: int = 4000,
+        enabled: bool = True,
+    ):
+        self.memory = MemoryStore(workspace)
+        self.provider = provider
+        self.model = model
+        self.interval_s = interval_s
+        self.keep_days = keep_days
+        self.monthly_after_days = monthly_after_days
+        self.max_long_term_chars = max_long_term_chars
+        self.enabled = enabled
+        self.digests_dir = self.memory.memory_dir / "digests"
+        self.archive_dir = self.memory.memory_dir / "archive"
+        self.pending_path = self.digests_dir / ".pending.json"
+        self._running = False
+        self._task: asyncio.Task | None = None
+    
+    async def start(self) -> None:
+        """Start the consolidation service."""
+        if not self.enabled:
+            logger.info("Memory consolidation disabled")
+            return
+        
+        self._running = True
+        self._task = asyncio.create_task(self._run_loop())
+        logger.info(f"Memory consolidation started (every {self.interval_s / 3600:g}h)")
+    
+    def stop(self) -> None:
+        """Stop the consolidation service."""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+    
+    async def _run_loop(self) -> None:
+        """Main consolidation loop; the first run waits a minute so startup stays fast."""
+        delay = min(60.0, self.interval_s)
+        while self._running:
+            try:
+                await asyncio.sleep(delay)
+                delay = self.interval_s
+                if self._running:
+                    await self.run_once()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Memory consolidation error: {e}")
+    
+    async def run_once(self, today: date | None = None) -> dict[str, int]:
+        """
+        Run one consolidation pass.
+        
+        Args:
+            today: Reference date (defaults to the current date).
+        
+        Returns:
+            Counts of weekly digests, monthly digests and MEMORY.md rewrites.
+        """
+        today = today or datetime.now().date()
+        stats = {"weekly": 0, "monthly": 0, "long_term": 0}
+        
+        for key, notes in (await run_io(self._due_weeks, today)).items():
+            await self._digest(key, notes, f"Week {key}", pending=True)
+            stats["weekly"] += 1
+        
+        for key, digests in (await run_io(self._due_months, today)).items():
+            await self._digest(key, digests, f"Month {key}")
+            stats["monthly"] += 1
+        
+        # Includes digests of earlier runs whose merge failed or was skipped
+        if await self._update_long_term(await run_io(self._load_pending)):
+            stats["long_term"] = 1
+        
+        if any(stats.values()):
+            logger.info(
+                f"Memory consolidated: {stats['weekly']} weekly, {stats['monthly']} monthly digests"
+                + (", MEMORY.md updated" if stats["long_term"] else "")
+            )
+        return stats
+    
+    def _due_weeks(self, today: date) -> dict[str, list[Path]]:
+        """Group daily notes of ISO weeks that ended before the keep_days cutoff."""
+        cutoff = today - timedelta(days=self.keep_days)
+        weeks: dict[str, list[Path]] = {}
+        for path in sorted(self.memory.memory_dir.glob("????-??-??.md")):
+            m = _DAILY_RE.match(path.stem)
+            if not m:
+                continue
+            try:
+                day = date(int(m[1]), int(m[2]), int(m[3]))
+            except ValueError:
+                continue
+            year, week, _ = day.isocalendar()
+            if date.fromisocalendar(year, week, 7) < cutoff:
+                weeks.setdefault(f"{year}-W{week:02d}", []).append(path)
+        return weeks
+    
+    def _due_months(self, today: date) -> dict[str, list[Path]]:
+        """Group weekly digests of months that ended before the monthly cutoff."""
+        cutoff = today - timedelta(days=self.monthly_after_days)
+        months: dict[str, list[Path]] = {}
+        if not self.digests_dir.exists():
+            return months
+        for path in sorted(self.digests_dir.glob("????-W??.md")):
+            m = _WEEKLY_RE.match(path.stem)
+            if not m:
+                continue
+            # An ISO week belongs to the month its Thursday falls in
+            thursday = date.fromisocalendar(int(m[1]), int(m[2]), 4)
+            next_month = (thursday.replace(day=28) + timedelta(days=4)).replace(day=1)
+            if next_month <= cutoff:
+                months.setdefault(thursday.strftime("%Y-%m"), []).append(path)
+        return months
+    
+    async def _digest(self, key: str, sources: list[Path], title: str, pending: bool = False) -> None:
+        """Summarize source files into digests/<key>.md and archive the sources."""
+        target = self.digests_dir / f"{key}.md"
+        parts = await run_io(_read_all, [target, *sources])
+        
+        summary = await self._complete(DIGEST_PROMPT, "\n\n---\n\n".join(parts))
+        content = f"# {title}\n\n{summary.strip()}\n"
+        await run_io(self._store_digest, key, content, sources, pending)
+    
+    def _store_digest(self, key: str, content: str, sources: list[Path], pending: bool) -> None:
+        target = self.digests_dir / f"{key}.md"
+        ensure_dir(target.parent)
+        atomic_write(target, content)
+        if pending:
+            # Recorded before the notes are archived, so the digest cannot be lost for MEMORY.md
+            digests = self._load_pending()
+            digests[key] = content
+            self._save_pending(digests)
+        
+        # Only archive once the digest is safely written
+        archive = ensure_dir(self.archive_dir)
+        for path in sources:
+            path.replace(archive / path.name)
+    
+    async def _update_long_term(self, pending: dict[str, str]) -> bool:
+        """Merge pending digests into MEMORY.md, keeping it deduplicated and within budget."""
+        if not pending:
+            return False  # MEMORY.md is the user's file too; only touch it to add something
+        path = self.memory.memory_file
+        stamp = await run_io(fingerprint, path)
+        current = "".join(await run_io(_read_all, [path]))
+        
+        prompt = LONG_TERM_PROMPT.format(budget=self.max_long_term_chars)
+        digests = "\n\n".join(pending.values())
+        updated = dedupe_lines(await self._complete(
+            prompt, f"## Current MEMORY.md\n\n{current or '(empty)'}\n\n## New digests\n\n{digests}"
+        )).strip() + "\n"
+        if len(updated) > self.max_long_term_chars:
+            logger.warning(
+                f"MEMORY.md is {len(updated)} chars after consolidation "
+                f"(budget {self.max_long_term_chars})"
+            )
+        
+        return await run_io(self._write_long_term, updated, stamp, list(pending))
+    
+    def _write_long_term(self, content: str, stamp: Fingerprint, merged: list[str]) -> bool:
+        # The agent may have written MEMORY.md while we were summarizing: keep its version
+        path = self.memory.memory_file
+        with self.memory.lock:
+            if fingerprint(path) != stamp:
+                logger.info("MEMORY.md changed during consolidation, will retry next run")
+                return False
+            atomic_write(path, content)
+        
+        if merged:
+            digests = self._load_pending()
+            for key in merged:
+                digests.pop(key, None)
+            self._save_pending(digests)
+        return True
+    
+    def _load_pending(self) -> dict[str, str]:
+        """Get the weekly digests not merged into MEMORY.md yet (key -> content)."""
+        try:
+            return json.loads(self.pending_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable list of pending digests: {e}")
+            return {}
+    
+    def _save_pending(self, digests: dict[str, str]) -> None:
+        if digests:
+            atomic_write(self.pending_path, json.dumps(digests, ensure_ascii=False, indent=2))
+        else:
+            self.pending_path.unlink(missing_ok=True)
+    
+    async def _complete(self, instructions: str, content: str) -> str:
+        """Run a single summarization request."""
+        response = await self.provider.chat(
+            messages=[
+                {"role": "system", "content": instructions},
+                {"role": "user", "content": content},
+            ],
+            model=self.model,
+            max_tokens=2048,
+            temperature=0.2,
+        )
+        if response.finish_reason == "error" or not (response.content or "").strip():
+            raise RuntimeError(response.content or "empty summary")
+        return response.content
+
+
+def dedupe_lines(text: str) -> str:
+    """
+    Drop repeated list items from a Markdown memory file.
+
+    Items are compared ignoring case, whitespace and their list marker. Any
+    other line (headings, rules, tables, code blocks) is always kept.
+    """
+    seen = set()
+    lines = []
+    in_code = False
+    for line in text.splitlines():
+        if _FENCE_RE.match(line):
+            in_code = not in_code
+        item = None if in_code else _LIST_ITEM_RE.match(line)
+        if item:
+            key = " ".join(item[1].casefold().split())
+            if key in seen:
+                continue
+            seen.add(key)
+        lines.append(line)
+    result = "\n".join(lines)
+    return result + "\n" if text.endswith("\n") else result
+
+
+def _read_all(paths: list[Path]) -> list[str]:
+    """Read the given files that exist."""
+    return [p.read_text(encoding="utf-8") for p in paths if p.exists()]
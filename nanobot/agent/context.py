@@ -1,13 +1,15 @@
 """Context builder for assembling agent prompts."""
 
-import base64
-import mimetypes
 import platform
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.skills import SkillsLoader
+from nanobot.media.images import DEFAULT_MAX_EDGE, ImageProcessor
+from nanobot.utils.filecache import FileCache
+from nanobot.utils.tokens import fit_newest, message_tokens
 
 
 class ContextBuilder:
@@ -15,19 +17,30 @@ class ContextBuilder:
     Builds the context (system prompt + messages) for the agent.
     
     Assembles bootstrap files, memory, skills, and conversation history
-    into a coherent prompt for the LLM.
+    into a coherent prompt for the LLM. Every file read goes through a shared
+    FileCache, so sections are only rebuilt when their source files change.
     """
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        skills_top_k: int = 8,
+        memory_max_chars: int = 6000,
+        image_max_edge: int = DEFAULT_MAX_EDGE,
+    ):
         self.workspace = workspace
-        self.memory = MemoryStore(workspace)
-        self.skills = SkillsLoader(workspace)
+        self.skills_top_k = skills_top_k
+        self.cache = FileCache()
+        self.images = ImageProcessor(max_edge=image_max_edge)
+        self.memory = MemoryStore(workspace, cache=self.cache, max_context_chars=memory_max_chars)
+        self.skills = SkillsLoader(workspace, cache=self.cache)
+        self._identity: str | None = None
     
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """
-        Build the system prompt from bootstrap files, memory, and skills.
+        Build the system prompt from bootstrap files, skills, and memory.
         
         Args:
             skill_names: Optional list of skills to include.
@@ -35,21 +48,40 @@ class ContextBuilder:
         Returns:
             Complete system prompt.
         """
+        return "\n\n---\n\n".join(self.build_system_blocks(skill_names))
+    
+    def build_system_blocks(self, skill_names: list[str] | None = None) -> list[str]:
+        """
+        Build the system prompt as cacheable blocks, most stable first.
+        
+        The first block (identity, bootstrap files, skills) only changes when
+        those files do. Memory, which the agent edits as it works, comes last
+        so changes to it leave the prefix before it intact for prompt caching.
+        Per-turn details (time, channel) are not part of the system prompt;
+        see build_runtime_context.
+        
+        Args:
+            skill_names: Optional list of skills to include.
+        
+        Returns:
+            One or two non-empty prompt blocks.
+        """
         parts = []
         
-        # Core identity
-        parts.append(self._get_identity())
+        # Core identity (depends only on the workspace path and runtime)
+        if self._identity is None:
+            self._identity = self._get_identity()
+        parts.append(self._identity)
         
         # Bootstrap files
-        bootstrap = self._load_bootstrap_files()
+        bootstrap = self.cache.derive(
+            "bootstrap",
+            [self.workspace / f for f in self.BOOTSTRAP_FILES],
+            self._load_bootstrap_files,
+        )
         if bootstrap:
             parts.append(bootstrap)
         
-        # Memory context
-        memory = self.memory.get_memory_context()
-        if memory:
-            parts.append(f"# Memory\n\n{memory}")
-        
         # Skills - progressive loading
         # 1. Always-loaded skills: include full content
         always_skills = self.skills.get_always_skills()
@@ -59,8 +91,15 @@ class ContextBuilder:
                 parts.append(f"# Active Skills\n\n{always_content}")
         
         # 2. Available skills: only show summary (agent uses read_file to load)
-        skills_summary = self.skills.build_skills_summary()
-        if skills_summary:
+        skill_count = len(self.skills.list_skills(filter_unavailable=False))
+        if self._retrieves_skills(skill_count):
+            # Too many to list: the most relevant ones go in each message's runtime context
+            parts.append(f"""# Skills
+
+{skill_count} skills extend your capabilities. The ones most relevant to the current message are listed in its runtime context; use the list_skills tool to search all of them. To use a skill, read its SKILL.md file using the read_file tool.
+Skills with available="false" need dependencies installed first - you can try installing them with apt/brew.""")
+        elif skill_count:
+            skills_summary = self.skills.build_skills_summary()
             parts.append(f"""# Skills
 
 The following skills extend your capabilities. To use a skill, read its SKILL.md file using the read_file tool.
@@ -68,12 +107,52 @@ Skills with available="false" need dependencies installed first - you can try in
 
 {skills_summary}""")
         
-        return "\n\n---\n\n".join(parts)
+        blocks = ["\n\n---\n\n".join(parts)]
+        
+        # Memory context
+        memory = self.memory.get_memory_context()
+        if memory:
+            blocks.append(f"# Memory\n\n{memory}")
+        
+        return blocks
+    
+    def build_runtime_context(
+        self,
+        channel: str | None = None,
+        chat_id: str | None = None,
+        skills_query: str | None = None,
+    ) -> str:
+        """
+        Build the per-turn context sent with the user message.
+        
+        Args:
+            channel: Current channel.
+            chat_id: Current chat/user ID.
+            skills_query: Text to rank skills against when there are too many
+                to list in the system prompt.
+        
+        Returns:
+            Current time, session and relevant skills.
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+        lines = ["[Runtime Context]", f"Current Time: {now}"]
+        if channel and chat_id:
+            lines += [f"Channel: {channel}", f"Chat ID: {chat_id}"]
+        
+        if skills_query and self._retrieves_skills():
+            relevant = self.skills.search(skills_query, self.skills_top_k)
+            if relevant:
+                lines += ["Relevant Skills:", self.skills.build_skills_summary(relevant)]
+        return "\n".join(lines)
+    
+    def _retrieves_skills(self, skill_count: int | None = None) -> bool:
+        """Whether skills are retrieved per message instead of all listed up front."""
+        if skill_count is None:
+            skill_count = len(self.skills.list_skills(filter_unavailable=False))
+        return 0 < self.skills_top_k < skill_count
     
     def _get_identity(self) -> str:
         """Get the core identity section."""
-        from datetime import datetime
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
         workspace_path = str(self.workspace.expanduser().resolve())
         system = platform.system()
         runtime = f"{'macOS' if system == 'Darwin' else system} {platform.machine()}, Python {platform.python_version()}"
@@ -87,9 +166,6 @@ You are nanobot, a helpful AI assistant. You have access to tools that allow you
 - Send messages to users on chat channels
 - Spawn subagents for complex background tasks
 
-## Current Time
-{now}
-
 ## Runtime
 {runtime}
 
@@ -104,7 +180,8 @@ Only use the 'message' tool when you need to send a message to a specific chat c
 For normal conversation, just respond with text - do not call the message tool.
 
 Always be helpful, accurate, and concise. When using tools, explain what you're doing.
-When remembering something, write to {workspace_path}/memory/MEMORY.md"""
+When remembering something, write to {workspace_path}/memory/MEMORY.md
+To recall something that is not in your prompt, use the memory_search tool (or session_search for earlier conversations)."""
     
     def _load_bootstrap_files(self) -> str:
         """Load all bootstrap files from workspace."""
@@ -126,9 +203,16 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         media: list[str] | None = None,
         channel: str | None = None,
         chat_id: str | None = None,
+        max_input_tokens: int | None = None,
+        cache_control: bool = False,
+        summary: str | None = None,
     ) -> list[dict[str, Any]]:
         """
         Build the complete message list for an LLM call.
+        
+        Content is ordered from most to least stable (system prompt, history,
+        then the current message with the runtime context), so consecutive
+        calls share the longest possible prefix for provider prompt caching.
 
         Args:
             history: Previous conversation messages.
@@ -137,40 +221,58 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
             media: Optional list of local file paths for images/media.
             channel: Current channel (telegram, feishu, etc.).
             chat_id: Current chat/user ID.
+            max_input_tokens: Optional token budget for the whole prompt. History
+                fills what the system prompt and current message leave, newest first.
+            cache_control: Mark cache breakpoints on the system prompt blocks and
+                the end of history (for providers such as Anthropic).
+            summary: Optional summary of the conversation before history. It
+                goes last in the system prompt, since it changes only when
+                older history is condensed.
 
         Returns:
             List of messages including system prompt.
         """
-        messages = []
-
         # System prompt
-        system_prompt = self.build_system_prompt(skill_names)
-        if channel and chat_id:
-            system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
-        messages.append({"role": "system", "content": system_prompt})
+        blocks = self.build_system_blocks(skill_names)
+        if summary:
+            blocks.append(f"# Earlier in this conversation\n\n{summary}")
+        if cache_control:
+            system_content: str | list[dict[str, Any]] = [_cached_text(block) for block in blocks]
+        else:
+            system_content = "\n\n---\n\n".join(blocks)
+        system = {"role": "system", "content": system_content}
 
-        # History
-        messages.extend(history)
+        # Current message (with optional image attachments), led by the runtime context
+        recent = [m["content"] for m in history[-4:] if m["role"] == "user" and isinstance(m["content"], str)]
+        runtime = self.build_runtime_context(channel, chat_id, " ".join([*recent, current_message]))
+        user_content = self._build_user_content(f"{runtime}\n\n{current_message}", media)
+        user = {"role": "user", "content": user_content}
 
-        # Current message (with optional image attachments)
-        user_content = self._build_user_content(current_message, media)
-        messages.append({"role": "user", "content": user_content})
+        # History
+        if max_input_tokens is not None:
+            remaining = max_input_tokens - message_tokens(system) - message_tokens(user)
+            history = fit_newest(history, max(0, remaining))
+        history_messages = [{"role": m["role"], "content": m["content"]} for m in history]
+        
+        if cache_control:
+            # Cache everything up to the newest history message with text content
+            for m in reversed(history_messages):
+                if isinstance(m["content"], str) and m["content"]:
+                    m["content"] = [_cached_text(m["content"])]
+                    break
 
-        return messages
+        return [system, *history_messages, user]
 
     def _build_user_content(self, text: str, media: list[str] | None) -> str | list[dict[str, Any]]:
-        """Build user message content with optional base64-encoded images."""
+        """Build user message content with optional images (downscaled, as cached data URLs)."""
         if not media:
             return text
         
         images = []
         for path in media:
-            p = Path(path)
-            mime, _ = mimetypes.guess_type(path)
-            if not p.is_file() or not mime or not mime.startswith("image/"):
-                continue
-            b64 = base64.b64encode(p.read_bytes()).decode()
-            images.append({"type": "image_url", "image_url": {"url": f"data:{mime};base64,{b64}"}})
+            url = self.images.data_url(path)
+            if url is not None:
+                images.append({"type": "image_url", "image_url": {"url": url}})
         
         if not images:
             return text
@@ -227,3 +329,8 @@ When remembering something, write to {workspace_path}/memory/MEMORY.md"""
         
         messages.append(msg)
         return messages
+
+
+def _cached_text(text: str) -> dict[str, Any]:
+    """Build a text content block marked as a prompt cache breakpoint."""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
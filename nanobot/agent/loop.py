@@ -2,24 +2,85 @@
 
 import asyncio
 import json
+import time
+import uuid
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable, NamedTuple
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.agent.artifacts import ArtifactStore
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.artifacts import ReadArtifactTool
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.tools.memory import MemorySearchTool
+from nanobot.agent.tools.sessions import SessionSearchTool
+from nanobot.agent.tools.skills import ListSkillsTool
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.subagent import SubagentManager
-from nanobot.session.manager import SessionManager
+from nanobot.agent.summarizer import ConversationSummarizer
+from nanobot.media.images import max_image_edge
+from nanobot.session.manager import Session, SessionManager, create_archive, create_index
+from nanobot.tracing import get_tracer, new_trace_id, span
+from nanobot.utils.aio import run_io
+from nanobot.utils.helpers import get_data_path
+from nanobot.utils.tokens import get_context_window
+
+
+# Receives partial reply text as it is generated
+DeltaCallback = Callable[[str], Awaitable[None]]
+
+
+class _QueuedTurn(NamedTuple):
+    """A message waiting on its session worker."""
+    msg: InboundMessage
+    session_key: str | None
+    reply: "asyncio.Future[OutboundMessage | None] | None"
+    on_delta: DeltaCallback | None = None
+
+
+class _DraftPublisher:
+    """Publishes a turn's partial reply to the bus as draft outbound messages."""
+    
+    def __init__(
+        self,
+        bus: MessageBus,
+        channel: str,
+        chat_id: str,
+        stream_id: str,
+        min_interval_s: float = 0.3,
+    ):
+        self.bus = bus
+        self.channel = channel
+        self.chat_id = chat_id
+        self.stream_id = stream_id
+        self.min_interval_s = min_interval_s
+        self._parts: list[str] = []
+        self._last_publish = 0.0
+    
+    async def __call__(self, delta: str) -> None:
+        self._parts.append(delta)
+        now = time.monotonic()
+        if now - self._last_publish < self.min_interval_s:
+            return
+        self._last_publish = now
+        text = "".join(self._parts)
+        if text.strip():
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=self.channel,
+                chat_id=self.chat_id,
+                content=text,
+                stream_id=self.stream_id,
+                draft=True,
+            ))
 
 
 class AgentLoop:
@@ -44,21 +105,72 @@ class AgentLoop:
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         cron_service: "CronService | None" = None,
+        max_concurrent_turns: int = 4,
+        max_tokens: int = 8192,
+        context_window: int | None = None,
+        artifacts_config: "ArtifactsConfig | None" = None,
+        skills_top_k: int = 8,
+        memory_max_chars: int = 6000,
+        image_max_edge: int = 0,
+        summary_model: str | None = None,
+        summarize_after_tokens: int = 0,
+        sessions_config: "SessionsConfig | None" = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ArtifactsConfig, ExecToolConfig, SessionsConfig
         from nanobot.cron.service import CronService
         self.bus = bus
         self.provider = provider
         self.workspace = workspace
         self.model = model or provider.get_default_model()
         self.max_iterations = max_iterations
+        self.max_tokens = max_tokens
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
+        self.artifacts_config = artifacts_config or ArtifactsConfig()
         self.cron_service = cron_service
         
-        self.context = ContextBuilder(workspace)
-        self.sessions = SessionManager(workspace)
-        self.tools = ToolRegistry()
+        # Prompt budget: the model's input window minus room for the reply, less
+        # a 10% margin since our tokenizer only approximates the provider's
+        window = context_window or get_context_window(self.model)
+        available = window - max_tokens if window > max_tokens else window // 2
+        self.max_input_tokens = int(available * 0.9)
+        self.prompt_caching = provider.supports_prompt_caching(self.model)
+        
+        self.context = ContextBuilder(
+            workspace,
+            skills_top_k=skills_top_k,
+            memory_max_chars=memory_max_chars,
+            image_max_edge=image_max_edge or max_image_edge(self.model),
+        )
+        sessions_config = sessions_config or SessionsConfig()
+        self.sessions = SessionManager(
+            workspace,
+            load_tokens=self.max_input_tokens,
+            cache_entries=sessions_config.cache_entries,
+            cache_bytes=sessions_config.cache_mb * 1024 * 1024,
+            idle_s=sessions_config.idle_minutes * 60 or None,
+            backend=sessions_config.backend,
+            index=create_index() if sessions_config.search else None,
+            archive=create_archive(),
+        )
+        
+        # Old history is condensed in the background once a session outgrows
+        # half the prompt budget (or summarize_after_tokens when set)
+        self.summarizer = ConversationSummarizer(
+            provider,
+            model=summary_model or self.model,
+            trigger_tokens=summarize_after_tokens or self.max_input_tokens // 2,
+        )
+        self._summary_tasks: dict[str, asyncio.Task[None]] = {}
+        self.artifacts = (
+            ArtifactStore(get_data_path() / "artifacts", max_age_days=self.artifacts_config.max_age_days)
+            if self.artifacts_config.enabled else None
+        )
+        self.tools = ToolRegistry(
+            artifacts=self.artifacts,
+            spill_chars=self.artifacts_config.spill_chars,
+            preview_chars=self.artifacts_config.preview_chars,
+        )
         self.subagents = SubagentManager(
             provider=provider,
             workspace=workspace,
@@ -66,8 +178,19 @@ class AgentLoop:
             model=self.model,
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
+            artifacts=self.artifacts,
+            artifacts_config=self.artifacts_config,
         )
         
+        # Turns for different sessions run concurrently (bounded by _turn_slots);
+        # turns within one session are queued and processed strictly in order.
+        self._turn_slots = asyncio.Semaphore(max(1, max_concurrent_turns))
+        self._session_queues: dict[str, asyncio.Queue[_QueuedTurn]] = {}
+        self._session_workers: dict[str, asyncio.Task[None]] = {}
+        
+        # Channels that render streamed replies as edited drafts (set by the gateway)
+        self.draft_channels: set[str] = set()
+        
         self._running = False
         self._register_default_tools()
     
@@ -90,6 +213,16 @@ class AgentLoop:
         self.tools.register(WebSearchTool(api_key=self.brave_api_key))
         self.tools.register(WebFetchTool())
         
+        # Artifact paging tool (for tool outputs too large to keep in context)
+        if self.artifacts:
+            self.tools.register(ReadArtifactTool(self.artifacts, max_chars=self.artifacts_config.spill_chars))
+        
+        # Skill, memory and conversation search (the prompt only carries part of each)
+        self.tools.register(ListSkillsTool(self.context.skills))
+        self.tools.register(MemorySearchTool(self.context.memory))
+        if self.sessions.index is not None:
+            self.tools.register(SessionSearchTool(self.sessions))
+        
         # Message tool
         message_tool = MessageTool(send_callback=self.bus.publish_outbound)
         self.tools.register(message_tool)
@@ -103,45 +236,253 @@ class AgentLoop:
             self.tools.register(CronTool(self.cron_service))
     
     async def run(self) -> None:
-        """Run the agent loop, processing messages from the bus."""
+        """Run the agent loop, dispatching messages from the bus to per-session workers."""
         self._running = True
         logger.info("Agent loop started")
         
         while self._running:
             try:
-                # Wait for next message
                 msg = await asyncio.wait_for(
                     self.bus.consume_inbound(),
                     timeout=1.0
                 )
-                
-                # Process it
-                try:
-                    response = await self._process_message(msg)
-                    if response:
-                        await self.bus.publish_outbound(response)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    # Send error response
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an error: {str(e)}"
-                    ))
+                self._submit(msg)
             except asyncio.TimeoutError:
                 continue
     
-    def stop(self) -> None:
-        """Stop the agent loop."""
+    async def stop(self) -> None:
+        """Stop the agent loop, cancelling running and queued turns and summaries."""
         self._running = False
         logger.info("Agent loop stopping")
+        tasks = [*self._session_workers.values(), *self._summary_tasks.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    @staticmethod
+    def _route_key(msg: InboundMessage) -> str:
+        """Get the session key a message must be ordered against."""
+        # System messages carry the origin "channel:chat_id" in chat_id
+        if msg.channel == "system":
+            return msg.chat_id if ":" in msg.chat_id else f"cli:{msg.chat_id}"
+        return msg.session_key
+    
+    def _submit(
+        self,
+        msg: InboundMessage,
+        session_key: str | None = None,
+        reply: "asyncio.Future[OutboundMessage | None] | None" = None,
+        on_delta: DeltaCallback | None = None,
+    ) -> None:
+        """
+        Queue a message on its session's worker, starting the worker if needed.
+        
+        Args:
+            msg: The inbound message.
+            session_key: Optional session key overriding the message's own.
+            reply: Optional future to resolve with the response. When omitted,
+                the response is published to the bus.
+            on_delta: Optional callback receiving reply text as it streams in.
+        """
+        key = session_key or self._route_key(msg)
+        queue = self._session_queues.get(key)
+        if queue is None:
+            queue = self._session_queues[key] = asyncio.Queue()
+            self._session_workers[key] = asyncio.create_task(self._session_worker(key, queue))
+        queue.put_nowait(_QueuedTurn(msg, session_key, reply, on_delta))
+    
+    async def _session_worker(self, key: str, queue: "asyncio.Queue[_QueuedTurn]") -> None:
+        """Process one session's turns in order; exits once its queue drains."""
+        turn = None
+        try:
+            while not queue.empty():
+                turn = queue.get_nowait()
+                async with self._turn_slots:
+                    await self._run_turn(turn)
+                turn = None
+        finally:
+            # Cancelled: callers waiting for a reply to an unfinished turn get cancelled too
+            unfinished = [turn] if turn else []
+            while not queue.empty():
+                unfinished.append(queue.get_nowait())
+            for t in unfinished:
+                if t.reply is not None and not t.reply.done():
+                    t.reply.cancel()
+            self._session_queues.pop(key, None)
+            self._session_workers.pop(key, None)
+    
+    async def _run_turn(self, turn: "_QueuedTurn") -> None:
+        """Run a single queued turn and deliver its response."""
+        msg = turn.msg
+        on_delta = turn.on_delta
+        stream_id = None
+        if turn.reply is None and msg.channel in self.draft_channels:
+            stream_id = uuid.uuid4().hex[:12]
+            on_delta = _DraftPublisher(self.bus, msg.channel, msg.chat_id, stream_id)
+        
+        tracer = get_tracer()
+        trace_id = msg.metadata.get("trace_id") or new_trace_id()
+        received = msg.timestamp.timestamp()
+        
+        # The trace starts when the message was received, so it covers queueing too
+        with tracer.trace(
+            "turn",
+            trace_id=trace_id,
+            start=received,
+            channel=msg.channel,
+            session=turn.session_key or self._route_key(msg),
+            streamed=on_delta is not None,
+        ) as root:
+            tracer.add_span("bus.wait", start=received, duration_ms=max(0.0, time.time() - received) * 1000)
+            try:
+                response = await self._process_message(
+                    msg, session_key=turn.session_key, on_delta=on_delta
+                )
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+                root.error = f"{type(e).__name__}: {e}"
+                if turn.reply is not None:
+                    if not turn.reply.done():
+                        turn.reply.set_exception(e)
+                    return
+                # Send error response
+                response = OutboundMessage(
+                    channel=msg.channel,
+                    chat_id=msg.chat_id,
+                    content=f"Sorry, I encountered an error: {str(e)}"
+                )
+        
+        if turn.reply is not None:
+            if not turn.reply.done():
+                turn.reply.set_result(response)
+        elif response:
+            # The final reply replaces any draft streamed to the same chat
+            if stream_id and (response.channel, response.chat_id) == (msg.channel, msg.chat_id):
+                response.stream_id = stream_id
+            response.metadata.setdefault("trace_id", trace_id)
+            await self.bus.publish_outbound(response)
+    
+    def _set_tool_context(self, channel: str, chat_id: str) -> None:
+        """Bind the routing context of the current turn to the context-aware tools."""
+        message_tool = self.tools.get("message")
+        if isinstance(message_tool, MessageTool):
+            message_tool.set_context(channel, chat_id)
+        
+        spawn_tool = self.tools.get("spawn")
+        if isinstance(spawn_tool, SpawnTool):
+            spawn_tool.set_context(channel, chat_id)
+        
+        cron_tool = self.tools.get("cron")
+        if isinstance(cron_tool, CronTool):
+            cron_tool.set_context(channel, chat_id)
+    
+    async def _get_session(self, key: str) -> Session:
+        """Get a session (off the event loop), tracing whether it came from the session cache."""
+        def load() -> tuple[Session, bool]:
+            hits = self.sessions.cache_stats()["hits"]
+            session = self.sessions.get_or_create(key)
+            return session, self.sessions.cache_stats()["hits"] > hits
+        
+        with span("session.load") as s:
+            session, cached = await run_io(load)
+            s.set(cached=cached)
+        return session
+    
+    async def _save_session(self, session: Session) -> None:
+        """
+        Save a session off the event loop.
+        
+        The I/O thread stores a copy, since turns and the summarizer keep
+        changing the session on the loop meanwhile.
+        """
+        snapshot = session.snapshot()
+        copied, offset = snapshot.messages, snapshot.offset
+        await run_io(self.sessions.save, session, snapshot)
+        session.merge_saved(snapshot, copied, offset)
+    
+    def _schedule_summary(self, session: Session) -> None:
+        """Condense the session's oldest history after the turn, if it has grown too long."""
+        if session.key in self._summary_tasks or self.summarizer.pending_span(session) is None:
+            return
+        task = asyncio.create_task(self._summarize(session))
+        self._summary_tasks[session.key] = task
+        task.add_done_callback(lambda _: self._summary_tasks.pop(session.key, None))
     
-    async def _process_message(self, msg: InboundMessage) -> OutboundMessage | None:
+    async def _summarize(self, session: Session) -> None:
+        try:
+            if await self.summarizer.summarize(session):
+                await self._save_session(session)
+        except Exception as e:
+            logger.warning(f"Summarizing session {session.key} failed: {e}")
+    
+    async def _build_messages(self, session: Session, **kwargs: Any) -> list[dict[str, Any]]:
+        """Build the prompt for a turn within the token budget, tracing file cache use."""
+        cache = self.context.cache
+        hits, misses = cache.hits, cache.misses
+        with span("context.build") as s:
+            # Reads bootstrap files, memory, skills and attached images
+            messages = await run_io(
+                self.context.build_messages,
+                history=session.get_history(max_messages=None, max_tokens=self.max_input_tokens),
+                max_input_tokens=self.max_input_tokens,
+                cache_control=self.prompt_caching,
+                summary=session.summary,
+                **kwargs,
+            )
+            s.set(
+                messages=len(messages),
+                file_cache_hits=cache.hits - hits,
+                file_cache_misses=cache.misses - misses,
+            )
+        return messages
+    
+    async def _chat(
+        self,
+        messages: list[dict[str, Any]],
+        on_delta: DeltaCallback | None = None,
+    ) -> LLMResponse:
+        """Call the LLM, streaming content deltas to on_delta when given."""
+        with span("llm.chat", model=self.model, stream=on_delta is not None) as s:
+            if on_delta is None:
+                response = await self.provider.chat(
+                    messages=messages,
+                    tools=self.tools.get_definitions(),
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                )
+            else:
+                response = None
+                started = time.perf_counter()
+                async for chunk in self.provider.chat_stream(
+                    messages=messages,
+                    tools=self.tools.get_definitions(),
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                ):
+                    if chunk.content:
+                        if "first_token_ms" not in s.attrs:
+                            s.set(first_token_ms=round((time.perf_counter() - started) * 1000, 2))
+                        await on_delta(chunk.content)
+                    if chunk.response is not None:
+                        response = chunk.response
+                response = response or LLMResponse(content=None, finish_reason="error")
+            
+            s.set(finish_reason=response.finish_reason, tool_calls=len(response.tool_calls), **response.usage)
+            return response
+    
+    async def _process_message(
+        self,
+        msg: InboundMessage,
+        session_key: str | None = None,
+        on_delta: DeltaCallback | None = None,
+    ) -> OutboundMessage | None:
         """
         Process a single inbound message.
         
         Args:
             msg: The inbound message to process.
+            session_key: Optional session key overriding the message's own.
+            on_delta: Optional callback receiving reply text as it streams in.
         
         Returns:
             The response message, or None if no response needed.
@@ -154,24 +495,14 @@ class AgentLoop:
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}")
         
         # Get or create session
-        session = self.sessions.get_or_create(msg.session_key)
+        session = await self._get_session(session_key or msg.session_key)
         
-        # Update tool contexts
-        message_tool = self.tools.get("message")
-        if isinstance(message_tool, MessageTool):
-            message_tool.set_context(msg.channel, msg.chat_id)
-        
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(msg.channel, msg.chat_id)
+        # Update tool contexts (scoped to this turn's task)
+        self._set_tool_context(msg.channel, msg.chat_id)
         
-        cron_tool = self.tools.get("cron")
-        if isinstance(cron_tool, CronTool):
-            cron_tool.set_context(msg.channel, msg.chat_id)
-        
-        # Build initial messages (use get_history for LLM-formatted messages)
-        messages = self.context.build_messages(
-            history=session.get_history(),
+        # Build initial messages; history fills the token budget newest-first
+        messages = await self._build_messages(
+            session,
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel,
@@ -186,14 +517,14 @@ class AgentLoop:
             iteration += 1
             
             # Call LLM
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
+            response = await self._chat(messages, on_delta)
             
             # Handle tool calls
             if response.has_tool_calls:
+                # Keep text streamed before the tool calls apart from what follows
+                if on_delta and response.content:
+                    await on_delta("\n\n")
+                
                 # Add assistant message with tool calls
                 tool_call_dicts = [
                     {
@@ -210,11 +541,14 @@ class AgentLoop:
                     messages, response.content, tool_call_dicts
                 )
                 
-                # Execute tools
+                # Execute tools (independent calls run concurrently)
                 for tool_call in response.tool_calls:
                     args_str = json.dumps(tool_call.arguments)
                     logger.debug(f"Executing tool: {tool_call.name} with arguments: {args_str}")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                results = await self.tools.execute_batch(
+                    [(tc.name, tc.arguments) for tc in response.tool_calls]
+                )
+                for tool_call, result in zip(response.tool_calls, results):
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
                     )
@@ -229,7 +563,9 @@ class AgentLoop:
         # Save to session
         session.add_message("user", msg.content)
         session.add_message("assistant", final_content)
-        self.sessions.save(session)
+        with span("session.save"):
+            await self._save_session(session)
+        self._schedule_summary(session)
         
         return OutboundMessage(
             channel=msg.channel,
@@ -258,24 +594,14 @@ class AgentLoop:
         
         # Use the origin session for context
         session_key = f"{origin_channel}:{origin_chat_id}"
-        session = self.sessions.get_or_create(session_key)
+        session = await self._get_session(session_key)
         
-        # Update tool contexts
-        message_tool = self.tools.get("message")
-        if isinstance(message_tool, MessageTool):
-            message_tool.set_context(origin_channel, origin_chat_id)
-        
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(origin_channel, origin_chat_id)
-        
-        cron_tool = self.tools.get("cron")
-        if isinstance(cron_tool, CronTool):
-            cron_tool.set_context(origin_channel, origin_chat_id)
+        # Update tool contexts (scoped to this turn's task)
+        self._set_tool_context(origin_channel, origin_chat_id)
         
         # Build messages with the announce content
-        messages = self.context.build_messages(
-            history=session.get_history(),
+        messages = await self._build_messages(
+            session,
             current_message=msg.content,
             channel=origin_channel,
             chat_id=origin_chat_id,
@@ -288,11 +614,7 @@ class AgentLoop:
         while iteration < self.max_iterations:
             iteration += 1
             
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model
-            )
+            response = await self._chat(messages)
             
             if response.has_tool_calls:
                 tool_call_dicts = [
@@ -313,7 +635,10 @@ class AgentLoop:
                 for tool_call in response.tool_calls:
                     args_str = json.dumps(tool_call.arguments)
                     logger.debug(f"Executing tool: {tool_call.name} with arguments: {args_str}")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                results = await self.tools.execute_batch(
+                    [(tc.name, tc.arguments) for tc in response.tool_calls]
+                )
+                for tool_call, result in zip(response.tool_calls, results):
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
                     )
@@ -327,7 +652,9 @@ class AgentLoop:
         # Save to session (mark as system message in history)
         session.add_message("user", f"[System: {msg.sender_id}] {msg.content}")
         session.add_message("assistant", final_content)
-        self.sessions.save(session)
+        with span("session.save"):
+            await self._save_session(session)
+        self._schedule_summary(session)
         
         return OutboundMessage(
             channel=origin_channel,
@@ -341,15 +668,19 @@ class AgentLoop:
         session_key: str = "cli:direct",
         channel: str = "cli",
         chat_id: str = "direct",
+        on_delta: DeltaCallback | None = None,
     ) -> str:
         """
         Process a message directly (for CLI or cron usage).
         
+        The message is queued behind any in-flight turns of the same session.
+        
         Args:
             content: The message content.
             session_key: Session identifier.
             channel: Source channel (for context).
             chat_id: Source chat ID (for context).
+            on_delta: Optional callback receiving reply text as it streams in.
         
         Returns:
             The agent's response.
@@ -361,5 +692,7 @@ class AgentLoop:
             content=content
         )
         
-        response = await self._process_message(msg)
+        reply: asyncio.Future[OutboundMessage | None] = asyncio.get_running_loop().create_future()
+        self._submit(msg, session_key=session_key, reply=reply, on_delta=on_delta)
+        response = await reply
         return response.content if response else ""
@@ -1,9 +1,122 @@
 """Memory system for persistent agent memory."""
 
+import re
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
 
-from nanobot.utils.helpers import ensure_dir, today_date
+from nanobot.utils.bm25 import BM25Index
+from nanobot.utils.filecache import FileCache, Fingerprint, fingerprint
+from nanobot.utils.filelock import lock_for
+from nanobot.utils.helpers import atomic_write, ensure_dir, today_date
+
+# Daily notes (YYYY-MM-DD) and weekly or monthly digests (YYYY-Www, YYYY-MM)
+_DATE_RE = re.compile(r"^\d{4}-(\d{2}-\d{2}|W\d{2}|\d{2})$")
+
+
+@dataclass
+class MemoryChunk:
+    """A searchable passage of a memory file."""
+    path: Path
+    date: str | None  # Date (or week/month of a digest), None for long-term memory
+    heading: str | None  # Nearest Markdown heading above the passage
+    text: str
+
+
+class MemoryIndex:
+    """
+    Incrementally updated BM25 index over the Markdown files in memory/,
+    including consolidated digests and archived notes in its subdirectories.
+    
+    Files are split into paragraph-aligned chunks of about chunk_chars.
+    Each search stats the files and re-chunks only those whose (mtime, size)
+    changed since the last one, so notes the agent just wrote are searchable
+    straight away.
+    """
+    
+    def __init__(self, memory_dir: Path, chunk_chars: int = 800):
+        self.memory_dir = memory_dir
+        self.chunk_chars = chunk_chars
+        self._bm25 = BM25Index()
+        self._chunks: dict[tuple[str, int], MemoryChunk] = {}
+        self._files: dict[str, tuple[Fingerprint, int]] = {}  # name -> (fingerprint, chunk count)
+        self._lock = threading.RLock()  # Prompt building and memory_search run in I/O threads
+    
+    def __len__(self) -> int:
+        return len(self._chunks)
+    
+    def search(self, query: str, k: int = 5) -> list[tuple[MemoryChunk, float]]:
+        """
+        Find the memory passages most relevant to a query.
+        
+        Args:
+            query: Free-text query.
+            k: Maximum results.
+        
+        Returns:
+            (chunk, score) pairs, best first.
+        """
+        with self._lock:
+            self.sync()
+            return [(self._chunks[doc_id], score) for doc_id, score in self._bm25.search(query, k)]
+    
+    def sync(self) -> None:
+        """Bring the index up to date with the files on disk."""
+        with self._lock:
+            seen = set()
+            for path in self.memory_dir.rglob("*.md"):
+                name = path.relative_to(self.memory_dir).as_posix()
+                seen.add(name)
+                stamp = fingerprint(path)
+                indexed = self._files.get(name)
+                if indexed is not None and indexed[0] == stamp:
+                    continue
+                self._drop(name)
+                try:
+                    content = path.read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    continue
+                chunks = self._chunk(path, content)
+                for i, chunk in enumerate(chunks):
+                    self._chunks[(name, i)] = chunk
+                    self._bm25.add((name, i), f"{chunk.heading or ''}\n{chunk.text}")
+                self._files[name] = (stamp, len(chunks))
+            
+            for name in set(self._files) - seen:
+                self._drop(name)
+    
+    def _drop(self, name: str) -> None:
+        _, count = self._files.pop(name, (None, 0))
+        for i in range(count):
+            self._chunks.pop((name, i), None)
+            self._bm25.remove((name, i))
+    
+    def _chunk(self, path: Path, content: str) -> list[MemoryChunk]:
+        """Split a file into chunks of whole paragraphs, tagged with their heading."""
+        date = path.stem if _DATE_RE.match(path.stem) else None
+        chunks: list[MemoryChunk] = []
+        heading: str | None = None
+        buffer: list[str] = []
+        
+        def flush() -> None:
+            if buffer:
+                chunks.append(MemoryChunk(path, date, heading, "\n\n".join(buffer)))
+                buffer.clear()
+        
+        for para in re.split(r"\n\s*\n", content):
+            para = para.strip()
+            if not para:
+                continue
+            if para.startswith("#") and "\n" not in para:
+                flush()
+                heading = para.lstrip("#").strip()
+                continue
+            if buffer and sum(len(p) + 2 for p in buffer) + len(para) > self.chunk_chars:
+                flush()
+            buffer.append(para)
+        flush()
+        return chunks
 
 
 class MemoryStore:
@@ -11,12 +124,19 @@ class MemoryStore:
     Memory system for the agent.
     
     Supports daily notes (memory/YYYY-MM-DD.md) and long-term memory (MEMORY.md).
+    Only a bounded excerpt goes into the prompt; everything is searchable
+    through the memory index. Writes take the memory directory's file lock,
+    which other processes sharing the workspace honour as well.
     """
     
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, cache: FileCache | None = None, max_context_chars: int = 6000):
         self.workspace = workspace
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
+        self.cache = cache or FileCache()
+        self.max_context_chars = max_context_chars
+        self.index = MemoryIndex(self.memory_dir)
+        self.lock = lock_for(self.memory_dir / ".lock")
     
     def get_today_file(self) -> Path:
         """Get path to today's memory file."""
@@ -24,34 +144,30 @@ class MemoryStore:
     
     def read_today(self) -> str:
         """Read today's memory notes."""
-        today_file = self.get_today_file()
-        if today_file.exists():
-            return today_file.read_text(encoding="utf-8")
-        return ""
+        return self.cache.read_text(self.get_today_file()) or ""
     
     def append_today(self, content: str) -> None:
         """Append content to today's memory notes."""
         today_file = self.get_today_file()
         
-        if today_file.exists():
-            existing = today_file.read_text(encoding="utf-8")
-            content = existing + "\n" + content
-        else:
-            # Add header for new day
-            header = f"# {today_date()}\n\n"
-            content = header + content
-        
-        today_file.write_text(content, encoding="utf-8")
+        with self.lock:
+            if today_file.exists():
+                content = "\n" + content
+            else:
+                # Add header for new day
+                content = f"# {today_date()}\n\n" + content
+            # Append rather than rewrite, so notes added by other processes are kept
+            with open(today_file, "a", encoding="utf-8") as f:
+                f.write(content)
     
     def read_long_term(self) -> str:
         """Read long-term memory (MEMORY.md)."""
-        if self.memory_file.exists():
-            return self.memory_file.read_text(encoding="utf-8")
-        return ""
+        return self.cache.read_text(self.memory_file) or ""
     
     def write_long_term(self, content: str) -> None:
         """Write to long-term memory (MEMORY.md)."""
-        self.memory_file.write_text(content, encoding="utf-8")
+        with self.lock:
+            atomic_write(self.memory_file, content)
     
     def get_recent_memories(self, days: int = 7) -> str:
         """
@@ -87,23 +203,84 @@ class MemoryStore:
         files = list(self.memory_dir.glob("????-??-??.md"))
         return sorted(files, reverse=True)
     
+    def search(self, query: str, k: int = 5) -> list[tuple[MemoryChunk, float]]:
+        """Search long-term memory and all daily notes."""
+        return self.index.search(query, k)
+    
     def get_memory_context(self) -> str:
         """
         Get memory context for the agent.
         
+        Long-term memory and today's notes share max_context_chars (0 means
+        no limit). Long-term memory keeps its beginning and today's notes
+        their most recent entries; whatever is cut, like older daily notes,
+        stays reachable through memory_search.
+        
         Returns:
             Formatted memory context including long-term and recent memories.
         """
+        long_term = self.read_long_term()
+        today = self.read_today()
+        limit = self.max_context_chars
+        truncated = False
+        if limit > 0 and len(long_term) + len(today) > limit:
+            # Today's notes get at least a third of the budget, long-term memory the rest
+            today_limit = max(limit - len(long_term), limit // 3)
+            if len(today) > today_limit:
+                today = _tail(today, today_limit)
+                truncated = True
+            if len(long_term) > limit - len(today):
+                long_term = _head(long_term, limit - len(today))
+                truncated = True
+        
         parts = []
         
         # Long-term memory
-        long_term = self.read_long_term()
         if long_term:
             parts.append("## Long-term Memory\n" + long_term)
         
         # Today's notes
-        today = self.read_today()
         if today:
             parts.append("## Today's Notes\n" + today)
         
+        if parts and (truncated or self._has_older_notes()):
+            parts.append(
+                "Only part of your memory is shown here. "
+                "Use the memory_search tool to recall older notes and details."
+            )
+        
         return "\n\n".join(parts) if parts else ""
+    
+    def _has_older_notes(self) -> bool:
+        """
+        Check for notes besides today's: past daily files, digests or archives.
+        
+        Memoized on the memory directory, whose mtime changes whenever a file
+        or subdirectory is added to it or removed from it.
+        """
+        today = self.get_today_file()
+        return self.cache.derive(
+            ("older-notes", str(self.memory_dir), today.name),
+            [self.memory_dir],
+            lambda: (
+                any(f != today for f in self.list_memory_files())
+                or (self.memory_dir / "digests").is_dir()
+                or (self.memory_dir / "archive").is_dir()
+            ),
+        )
+
+
+def _head(text: str, limit: int) -> str:
+    """Keep the beginning of text, cut at a line break."""
+    cut = text[:limit]
+    if "\n" in cut:
+        cut = cut[:cut.rindex("\n")]
+    return cut.rstrip() + "\n[...]"
+
+
+def _tail(text: str, limit: int) -> str:
+    """Keep the end of text, cut at a line break."""
+    cut = text[-limit:] if limit > 0 else ""
+    if "\n" in cut:
+        cut = cut[cut.index("\n") + 1:]
+    return "[...]\n" + cut.lstrip()
@@ -1,14 +1,47 @@
 """Skills loader for agent capabilities."""
 
+import hashlib
 import json
 import os
 import re
 import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import Any
+
+import yaml
+from loguru import logger
+
+from nanobot.utils.bm25 import BM25Index
+from nanobot.utils.filecache import FileCache, Fingerprint, fingerprint
+from nanobot.utils.helpers import get_data_path
 
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
+# Bumped whenever the on-disk index format changes
+INDEX_VERSION = 1
+
+
+@dataclass
+class SkillEntry:
+    """Index entry for one skill."""
+    
+    name: str
+    path: str  # Path of SKILL.md
+    source: str  # "workspace" or "builtin"
+    description: str
+    metadata: dict[str, Any]  # Parsed frontmatter
+    nanobot: dict[str, Any]  # The "nanobot" section of the frontmatter metadata
+    stamp: list[int] | None  # (mtime_ns, size) of SKILL.md when it was parsed
+    missing: list[str] = field(default_factory=list)  # Unmet requirements, e.g. "CLI: gh"
+    
+    @property
+    def available(self) -> bool:
+        return not self.missing
+
 
 class SkillsLoader:
     """
@@ -16,12 +49,42 @@ class SkillsLoader:
     
     Skills are markdown files (SKILL.md) that teach the agent how to use
     specific tools or perform certain tasks.
+    
+    Skills are served from an index (name, description, path, source, parsed
+    frontmatter and requirement status) persisted as a JSON manifest, so
+    queries are in-memory lookups. The index is checked for changes at most
+    every check_interval_s: a skills directory is only rescanned when its
+    mtime changes, and a SKILL.md is only re-parsed when its own mtime or
+    size does. Requirement status (binaries on PATH, env vars) is rechecked
+    every requirements_ttl_s.
     """
     
-    def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
+    check_interval_s = 1.0
+    requirements_ttl_s = 60.0
+    
+    def __init__(
+        self,
+        workspace: Path,
+        builtin_skills_dir: Path | None = None,
+        cache: FileCache | None = None,
+        index_path: Path | None = None,
+    ):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self.cache = cache or FileCache()
+        self.index_path = index_path or self._default_index_path()
+        
+        self._entries: dict[str, SkillEntry] = {}
+        self._dirs: dict[str, dict[str, Any]] = {}  # root -> {"mtime_ns", "children"}
+        self._loaded = False
+        self._checked_at = float("-inf")  # time.monotonic() of the last change check
+        self._requirements_at = 0.0  # time.time() of the last requirement check
+        self._lock = threading.RLock()  # Prompt building and list_skills run in I/O threads
+        
+        # Retrieval index over skill text, synced lazily with the skill index
+        self._search = BM25Index()
+        self._search_versions: dict[str, tuple[str, tuple[int, ...]]] = {}
     
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
@@ -33,28 +96,11 @@ class SkillsLoader:
         Returns:
             List of skill info dicts with 'name', 'path', 'source'.
         """
-        skills = []
-        
-        # Workspace skills (highest priority)
-        if self.workspace_skills.exists():
-            for skill_dir in self.workspace_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists():
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
-        
-        # Built-in skills
-        if self.builtin_skills and self.builtin_skills.exists():
-            for skill_dir in self.builtin_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
-        
-        # Filter by requirements
-        if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
-        return skills
+        return [
+            {"name": e.name, "path": e.path, "source": e.source}
+            for e in self._index().values()
+            if e.available or not filter_unavailable
+        ]
     
     def load_skill(self, name: str) -> str | None:
         """
@@ -66,19 +112,21 @@ class SkillsLoader:
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-        
-        # Check built-in
-        if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-        
+        entry = self._index().get(name)
+        paths = [Path(entry.path)] if entry else self._skill_paths(name)
+        for path in paths:
+            content = self.cache.read_text(path)
+            if content is not None:
+                return content
         return None
     
+    def _skill_paths(self, name: str) -> list[Path]:
+        """Candidate SKILL.md paths for a skill, in priority order."""
+        paths = [self.workspace_skills / name / "SKILL.md"]
+        if self.builtin_skills:
+            paths.append(self.builtin_skills / name / "SKILL.md")
+        return paths
+    
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
         Load specific skills for inclusion in agent context.
@@ -98,49 +146,242 @@ class SkillsLoader:
         
         return "\n\n---\n\n".join(parts) if parts else ""
     
-    def build_skills_summary(self) -> str:
+    def build_skills_summary(self, names: list[str] | None = None) -> str:
         """
-        Build a summary of all skills (name, description, path, availability).
+        Build a summary of skills (name, description, path, availability).
         
         This is used for progressive loading - the agent can read the full
         skill content using read_file when needed.
         
+        Args:
+            names: Optional skills to include, in order. Defaults to all skills.
+        
         Returns:
             XML-formatted skills summary.
         """
-        all_skills = self.list_skills(filter_unavailable=False)
-        if not all_skills:
+        index = self._index()
+        if names is None:
+            entries = list(index.values())
+        else:
+            entries = [index[n] for n in names if n in index]
+        if not entries:
             return ""
         
         def escape_xml(s: str) -> str:
             return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
         
         lines = ["<skills>"]
-        for s in all_skills:
-            name = escape_xml(s["name"])
-            path = s["path"]
-            desc = escape_xml(self._get_skill_description(s["name"]))
-            skill_meta = self._get_skill_meta(s["name"])
-            available = self._check_requirements(skill_meta)
-            
-            lines.append(f"  <skill available=\"{str(available).lower()}\">")
-            lines.append(f"    <name>{name}</name>")
-            lines.append(f"    <description>{desc}</description>")
-            lines.append(f"    <location>{path}</location>")
+        for e in entries:
+            lines.append(f"  <skill available=\"{str(e.available).lower()}\">")
+            lines.append(f"    <name>{escape_xml(e.name)}</name>")
+            lines.append(f"    <description>{escape_xml(e.description)}</description>")
+            lines.append(f"    <location>{e.path}</location>")
             
             # Show missing requirements for unavailable skills
-            if not available:
-                missing = self._get_missing_requirements(skill_meta)
-                if missing:
-                    lines.append(f"    <requires>{escape_xml(missing)}</requires>")
+            if e.missing:
+                lines.append(f"    <requires>{escape_xml(', '.join(e.missing))}</requires>")
             
             lines.append(f"  </skill>")
         lines.append("</skills>")
         
         return "\n".join(lines)
     
-    def _get_missing_requirements(self, skill_meta: dict) -> str:
-        """Get a description of missing requirements."""
+    def get_always_skills(self) -> list[str]:
+        """Get skills marked as always=true that meet requirements."""
+        return [
+            e.name for e in self._index().values()
+            if e.available and (e.nanobot.get("always") or e.metadata.get("always"))
+        ]
+    
+    def get_skill_metadata(self, name: str) -> dict | None:
+        """
+        Get metadata from a skill's frontmatter.
+        
+        Args:
+            name: Skill name.
+        
+        Returns:
+            Metadata dict or None.
+        """
+        entry = self._index().get(name)
+        return (entry.metadata or None) if entry else None
+    
+    def search(self, query: str, k: int = 8) -> list[str]:
+        """
+        Rank skills by relevance to a query.
+        
+        Uses BM25 over each skill's name, description and body, all local.
+        
+        Args:
+            query: Free text, e.g. the user's message.
+            k: Maximum number of skills to return.
+        
+        Returns:
+            Names of matching skills, most relevant first.
+        """
+        with self._lock:
+            entries = self._index()
+            
+            # Re-index only skills whose SKILL.md changed since they were indexed
+            for name in [n for n in self._search_versions if n not in entries]:
+                self._search.remove(name)
+                del self._search_versions[name]
+            for name, entry in entries.items():
+                version = (entry.path, tuple(entry.stamp or ()))
+                if self._search_versions.get(name) == version:
+                    continue
+                try:
+                    body = self._strip_frontmatter(Path(entry.path).read_text(encoding="utf-8"))
+                except OSError:
+                    body = ""
+                title = name.replace("-", " ").replace("_", " ")
+                # Repeat the name and description so they outweigh the body
+                self._search.add(name, f"{title} {title} {entry.description} {entry.description} {body}")
+                self._search_versions[name] = version
+            
+            return [name for name, _ in self._search.search(query, k)]
+    
+    def refresh(self) -> None:
+        """Check the skill directories for changes now."""
+        self._checked_at = float("-inf")
+        self._index()
+    
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    
+    def _index(self) -> dict[str, SkillEntry]:
+        """Get the skill index (workspace skills first), updating it if due."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval_s:
+            return self._entries
+        with self._lock:
+            if now - self._checked_at < self.check_interval_s:
+                return self._entries
+            self._checked_at = now
+            
+            if not self._loaded:
+                self._load_index()
+                self._loaded = True
+            
+            changed = self._scan()
+            if time.time() - self._requirements_at >= self.requirements_ttl_s:
+                changed = self._check_all_requirements() or changed
+            if changed:
+                self._save_index()
+            return self._entries
+    
+    def _scan(self) -> bool:
+        """Bring the index up to date with the skill directories; True if it changed."""
+        changed = False
+        found: dict[str, tuple[Path, str, Fingerprint]] = {}
+        
+        for root, source in ((self.workspace_skills, "workspace"), (self.builtin_skills, "builtin")):
+            stamp = fingerprint(root) if root else None
+            key = str(root)
+            if stamp is None:
+                changed = self._dirs.pop(key, None) is not None or changed
+                continue
+            
+            # Adding or removing a skill directory changes the root's mtime
+            cached = self._dirs.get(key)
+            if cached is None or cached["mtime_ns"] != stamp[0]:
+                children = sorted(p.name for p in root.iterdir() if p.is_dir())
+                self._dirs[key] = {"mtime_ns": stamp[0], "children": children}
+                changed = True
+            
+            for name in self._dirs[key]["children"]:
+                if name in found:
+                    continue  # Workspace skills shadow builtin ones
+                skill_file = root / name / "SKILL.md"
+                file_stamp = fingerprint(skill_file)
+                if file_stamp is not None:
+                    found[name] = (skill_file, source, file_stamp)
+        
+        entries: dict[str, SkillEntry] = {}
+        for name, (skill_file, source, file_stamp) in found.items():
+            entry = self._entries.get(name)
+            if entry is None or entry.path != str(skill_file) or entry.stamp != list(file_stamp):
+                entry = self._parse_skill(name, skill_file, source, file_stamp)
+                changed = True
+            entries[name] = entry
+        
+        changed = changed or entries.keys() != self._entries.keys()
+        self._entries = entries
+        return changed
+    
+    def _parse_skill(self, name: str, skill_file: Path, source: str, stamp: Fingerprint) -> SkillEntry:
+        """Build the index entry of a skill from its SKILL.md."""
+        try:
+            content = skill_file.read_text(encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to read skill {name}: {e}")
+            content = ""
+        
+        metadata = self._parse_frontmatter(content, name) or {}
+        nanobot = self._parse_nanobot_metadata(metadata.get("metadata"))
+        return SkillEntry(
+            name=name,
+            path=str(skill_file),
+            source=source,
+            description=str(metadata.get("description") or name),
+            metadata=metadata,
+            nanobot=nanobot,
+            stamp=list(stamp) if stamp else None,
+            missing=self._get_missing_requirements(nanobot),
+        )
+    
+    def _check_all_requirements(self) -> bool:
+        """Recheck every skill's requirements; True if any status changed."""
+        self._requirements_at = time.time()
+        changed = False
+        for entry in self._entries.values():
+            missing = self._get_missing_requirements(entry.nanobot)
+            if missing != entry.missing:
+                entry.missing = missing
+                changed = True
+        return changed
+    
+    def _default_index_path(self) -> Path:
+        digest = hashlib.sha1(f"{self.workspace_skills}|{self.builtin_skills}".encode()).hexdigest()[:12]
+        return get_data_path() / "cache" / f"skills-{digest}.json"
+    
+    def _load_index(self) -> None:
+        """Load the persisted index, ignoring it if missing or stale."""
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION:
+                return
+            self._dirs = data.get("dirs", {})
+            self._entries = {s["name"]: SkillEntry(**s) for s in data.get("skills", [])}
+            self._requirements_at = data.get("requirements_checked_at", 0.0)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable skills index {self.index_path}: {e}")
+            self._dirs, self._entries = {}, {}
+    
+    def _save_index(self) -> None:
+        data = {
+            "version": INDEX_VERSION,
+            "dirs": self._dirs,
+            "requirements_checked_at": self._requirements_at,
+            "skills": [asdict(e) for e in self._entries.values()],
+        }
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False, default=str), encoding="utf-8")
+            tmp.replace(self.index_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to save skills index: {e}")
+    
+    # ------------------------------------------------------------------
+    # Parsing and requirement checks
+    # ------------------------------------------------------------------
+    
+    def _get_missing_requirements(self, skill_meta: dict) -> list[str]:
+        """Get the unmet requirements (binaries, env vars) of a skill."""
         missing = []
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
@@ -149,14 +390,7 @@ class SkillsLoader:
         for env in requires.get("env", []):
             if not os.environ.get(env):
                 missing.append(f"ENV: {env}")
-        return ", ".join(missing)
-    
-    def _get_skill_description(self, name: str) -> str:
-        """Get the description of a skill from its frontmatter."""
-        meta = self.get_skill_metadata(name)
-        if meta and meta.get("description"):
-            return meta["description"]
-        return name  # Fallback to skill name
+        return missing
     
     def _strip_frontmatter(self, content: str) -> str:
         """Remove YAML frontmatter from markdown content."""
@@ -166,63 +400,38 @@ class SkillsLoader:
                 return content[match.end():].strip()
         return content
     
-    def _parse_nanobot_metadata(self, raw: str) -> dict:
-        """Parse nanobot metadata JSON from frontmatter."""
-        try:
-            data = json.loads(raw)
-            return data.get("nanobot", {}) if isinstance(data, dict) else {}
-        except (json.JSONDecodeError, TypeError):
-            return {}
-    
-    def _check_requirements(self, skill_meta: dict) -> bool:
-        """Check if skill requirements are met (bins, env vars)."""
-        requires = skill_meta.get("requires", {})
-        for b in requires.get("bins", []):
-            if not shutil.which(b):
-                return False
-        for env in requires.get("env", []):
-            if not os.environ.get(env):
-                return False
-        return True
-    
-    def _get_skill_meta(self, name: str) -> dict:
-        """Get nanobot metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_nanobot_metadata(meta.get("metadata", ""))
-    
-    def get_always_skills(self) -> list[str]:
-        """Get skills marked as always=true that meet requirements."""
-        result = []
-        for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_nanobot_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
-                result.append(s["name"])
-        return result
-    
-    def get_skill_metadata(self, name: str) -> dict | None:
-        """
-        Get metadata from a skill's frontmatter.
-        
-        Args:
-            name: Skill name.
-        
-        Returns:
-            Metadata dict or None.
-        """
-        content = self.load_skill(name)
-        if not content:
+    @staticmethod
+    def _parse_frontmatter(content: str, name: str = "") -> dict | None:
+        """Parse the YAML frontmatter of a SKILL.md file."""
+        if not content.startswith("---"):
+            return None
+        match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
+        if not match:
             return None
         
-        if content.startswith("---"):
-            match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-            if match:
-                # Simple YAML parsing
-                metadata = {}
-                for line in match.group(1).split("\n"):
-                    if ":" in line:
-                        key, value = line.split(":", 1)
-                        metadata[key.strip()] = value.strip().strip('"\'')
-                return metadata
-        
-        return None
+        try:
+            data = yaml.safe_load(match.group(1))
+        except yaml.YAMLError as e:
+            # Plain "key: value" lines that are not valid YAML (e.g. an unquoted ": ") used to work
+            logger.debug(f"Frontmatter of skill {name} is not valid YAML, reading it line by line: {e}")
+            data = {}
+            for line in match.group(1).split("\n"):
+                if ":" in line:
+                    key, value = line.split(":", 1)
+                    data[key.strip()] = value.strip().strip('"\'')
+        if not isinstance(data, dict):
+            return None
+        # YAML turns values like 2024-05-01 into dates; keep the index JSON-safe
+        return json.loads(json.dumps(data, default=str))
+    
+    def _parse_nanobot_metadata(self, raw: Any) -> dict:
+        """Parse the nanobot section of frontmatter metadata (a mapping or a JSON string)."""
+        if isinstance(raw, str):
+            try:
+                raw = json.loads(raw)
+            except json.JSONDecodeError:
+                return {}
+        if not isinstance(raw, dict):
+            return {}
+        nanobot = raw.get("nanobot", {})
+        return nanobot if isinstance(nanobot, dict) else {}
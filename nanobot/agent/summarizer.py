@@ -0,0 +1,130 @@
+"""Rolling summarization of long conversations."""
+
+from datetime import datetime
+from typing import Any
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider
+from nanobot.session.manager import Session
+from nanobot.tracing import get_tracer
+from nanobot.utils.tokens import fit_newest, message_tokens
+
+SUMMARY_PROMPT = """You keep a running summary of a conversation between a user and an AI assistant.
+Update the summary with the new messages below. Keep what later turns may rely on: the user's goals and
+requests, decisions, facts, names, numbers, open tasks and promises the assistant made. Drop small talk and
+anything superseded. Write in the third person, as compact Markdown bullets, under {words} words.
+Reply with the updated summary only."""
+
+# Longest stretch of a single message sent to the summarizer
+_MAX_MESSAGE_CHARS = 4000
+
+
+class ConversationSummarizer:
+    """
+    Condenses the oldest part of a session into a rolling summary.
+    
+    Once the messages after the summary watermark exceed trigger_tokens, all
+    but the newest keep_tokens of them are folded into the summary by a
+    (typically cheaper) model, and the watermark moves past them. The summary
+    and watermark live in Session.metadata, so history before the watermark
+    is replaced by the summary rather than forgotten.
+    """
+    
+    def __init__(
+        self,
+        provider: LLMProvider,
+        model: str | None = None,
+        trigger_tokens: int = 16000,
+        keep_tokens: int | None = None,
+        summary_words: int = 400,
+    ):
+        self.provider = provider
+        self.model = model
+        self.trigger_tokens = trigger_tokens
+        self.keep_tokens = keep_tokens if keep_tokens is not None else trigger_tokens // 2
+        self.summary_words = summary_words
+    
+    def pending_span(self, session: Session) -> tuple[int, int] | None:
+        """
+        Get the range of messages due for summarization.
+        
+        Returns:
+            (start, end) message indexes counted from the start of the
+            conversation, or None if the session is still short enough.
+        """
+        # Messages that were not loaded from disk can no longer be summarized
+        start = max(session.summarized_upto, session.offset)
+        pending = session.messages[start - session.offset:]
+        if sum(message_tokens(m) for m in pending) <= self.trigger_tokens:
+            return None
+        end = session.offset + len(session.messages) - len(fit_newest(pending, self.keep_tokens))
+        return (start, end) if end > start else None
+    
+    async def summarize(self, session: Session) -> bool:
+        """
+        Fold the oldest unsummarized messages into the session summary.
+        
+        Args:
+            session: The session; its metadata is updated in place.
+        
+        Returns:
+            True if the summary was updated (the caller should save the session).
+        """
+        span = self.pending_span(session)
+        if span is None:
+            return False
+        start, end = span
+        previous = session.summary
+        offset = session.offset
+        last = session.messages[end - 1 - offset]
+        
+        with get_tracer().trace("summarize", session=session.key, messages=end - start) as root:
+            parts = []
+            if previous:
+                parts.append(f"## Summary so far\n\n{previous}")
+            parts.append(f"## New messages\n\n{_transcript(session.messages[start - offset:end - offset])}")
+            response = await self.provider.chat(
+                messages=[
+                    {"role": "system", "content": SUMMARY_PROMPT.format(words=self.summary_words)},
+                    {"role": "user", "content": "\n\n".join(parts)},
+                ],
+                model=self.model,
+                max_tokens=self.summary_words * 3,
+                temperature=0.2,
+            )
+            root.set(usage=response.usage)
+            text = (response.content or "").strip()
+            if response.finish_reason == "error" or not text:
+                root.error = text or "empty summary"
+                logger.warning(f"Summarizing session {session.key} failed: {text or 'empty summary'}")
+                return False
+        
+        # The session may have been cleared or summarized again meanwhile
+        if (
+            session.offset != offset
+            or max(session.summarized_upto, offset) != start
+            or len(session.messages) < end - offset
+            or session.messages[end - 1 - offset] is not last
+        ):
+            return False
+        session.metadata["summary"] = {
+            "text": text,
+            "upto": end,
+            "updated_at": datetime.now().isoformat(),
+        }
+        logger.debug(f"Summarized messages {start}-{end} of session {session.key}")
+        return True
+
+
+def _transcript(messages: list[dict[str, Any]]) -> str:
+    """Render messages as a plain-text transcript."""
+    lines = []
+    for m in messages:
+        content = m.get("content") or ""
+        if not isinstance(content, str):
+            content = " ".join(p.get("text", "") for p in content if isinstance(p, dict))
+        if len(content) > _MAX_MESSAGE_CHARS:
+            content = content[:_MAX_MESSAGE_CHARS] + " [...]"
+        lines.append(f"{m.get('role', 'user').capitalize()}: {content}")
+    return "\n\n".join(lines)
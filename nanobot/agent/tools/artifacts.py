@@ -0,0 +1,67 @@
+"""Artifact paging tool."""
+
+from typing import Any
+
+from nanobot.agent.artifacts import ArtifactStore
+from nanobot.agent.tools.base import Tool
+from nanobot.utils.aio import run_io
+
+
+class ReadArtifactTool(Tool):
+    """Tool to read slices of a stored tool output."""
+    
+    concurrency = "read_only"
+    spill_output = False  # Pages are already sized to fit the context
+    
+    def __init__(self, store: ArtifactStore, max_chars: int = 8000):
+        self.store = store
+        self.max_chars = max_chars
+    
+    @property
+    def name(self) -> str:
+        return "read_artifact"
+    
+    @property
+    def description(self) -> str:
+        return (
+            "Read part of a large tool output that was saved as an artifact. "
+            "Use the artifact ID and offset given in the truncation notice."
+        )
+    
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "id": {
+                    "type": "string",
+                    "description": "The artifact ID"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Character offset to start reading from (default 0)",
+                    "minimum": 0
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": f"Maximum characters to read (default and max {self.max_chars})",
+                    "minimum": 1
+                }
+            },
+            "required": ["id"]
+        }
+    
+    async def execute(self, id: str, offset: int = 0, limit: int | None = None, **kwargs: Any) -> str:
+        content = await run_io(self.store.get, id)
+        if content is None:
+            return f"Error: Artifact not found: {id}"
+        
+        total = len(content)
+        if offset >= total:
+            return f"Error: Offset {offset} is past the end of the artifact ({total} chars)"
+        
+        end = min(total, offset + min(limit or self.max_chars, self.max_chars))
+        page = content[offset:end]
+        if end < total:
+            return f"{page}\n\n[Characters {offset}-{end} of {total}. Next: read_artifact(id=\"{id}\", offset={end})]"
+        return f"{page}\n\n[Characters {offset}-{end} of {total}. End of artifact.]"
@@ -1,7 +1,9 @@
 """Base class for agent tools."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Literal
+
+ToolConcurrency = Literal["read_only", "side_effect", "exclusive"]
 
 
 class Tool(ABC):
@@ -21,6 +23,15 @@ class Tool(ABC):
         "object": dict,
     }
     
+    # How the tool may be scheduled when one LLM response requests several calls:
+    # - "read_only": no side effects, runs alongside any other call
+    # - "side_effect": runs alongside read-only calls, but in order with other side-effecting calls
+    # - "exclusive": runs alone, after every earlier call has finished
+    concurrency: ToolConcurrency = "side_effect"
+    
+    # Whether oversized results may be moved to the artifact store (see ToolRegistry)
+    spill_output: bool = True
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -1,10 +1,12 @@
 """Cron tool for scheduling reminders and tasks."""
 
+from contextvars import ContextVar
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
 from nanobot.cron.service import CronService
 from nanobot.cron.types import CronSchedule
+from nanobot.utils.aio import run_io
 
 
 class CronTool(Tool):
@@ -12,13 +14,14 @@ class CronTool(Tool):
     
     def __init__(self, cron_service: CronService):
         self._cron = cron_service
-        self._channel = ""
-        self._chat_id = ""
+        # Per-turn delivery target: concurrent turns each schedule for their own chat
+        self._context: ContextVar[tuple[str, str]] = ContextVar(
+            "cron_tool_context", default=("", "")
+        )
     
     def set_context(self, channel: str, chat_id: str) -> None:
-        """Set the current session context for delivery."""
-        self._channel = channel
-        self._chat_id = chat_id
+        """Set the session context for delivery in the current turn."""
+        self._context.set((channel, chat_id))
     
     @property
     def name(self) -> str:
@@ -67,18 +70,20 @@ class CronTool(Tool):
         job_id: str | None = None,
         **kwargs: Any
     ) -> str:
+        # Job changes lock and rewrite the store file
         if action == "add":
-            return self._add_job(message, every_seconds, cron_expr)
+            return await run_io(self._add_job, message, every_seconds, cron_expr)
         elif action == "list":
-            return self._list_jobs()
+            return await run_io(self._list_jobs)
         elif action == "remove":
-            return self._remove_job(job_id)
+            return await run_io(self._remove_job, job_id)
         return f"Unknown action: {action}"
     
     def _add_job(self, message: str, every_seconds: int | None, cron_expr: str | None) -> str:
         if not message:
             return "Error: message is required for add"
-        if not self._channel or not self._chat_id:
+        channel, chat_id = self._context.get()
+        if not channel or not chat_id:
             return "Error: no session context (channel/chat_id)"
         
         # Build schedule
@@ -94,8 +99,8 @@ class CronTool(Tool):
             schedule=schedule,
             message=message,
             deliver=True,
-            channel=self._channel,
-            to=self._chat_id,
+            channel=channel,
+            to=chat_id,
         )
         return f"Created job '{job.name}' (id: {job.id})"
     
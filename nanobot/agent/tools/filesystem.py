@@ -4,11 +4,14 @@ from pathlib import Path
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.aio import run_io
 
 
 class ReadFileTool(Tool):
     """Tool to read file contents."""
     
+    concurrency = "read_only"
+    
     @property
     def name(self) -> str:
         return "read_file"
@@ -31,6 +34,9 @@ class ReadFileTool(Tool):
         }
     
     async def execute(self, path: str, **kwargs: Any) -> str:
+        return await run_io(self._execute, path)
+    
+    def _execute(self, path: str) -> str:
         try:
             file_path = Path(path).expanduser()
             if not file_path.exists():
@@ -49,6 +55,8 @@ class ReadFileTool(Tool):
 class WriteFileTool(Tool):
     """Tool to write content to a file."""
     
+    concurrency = "side_effect"
+    
     @property
     def name(self) -> str:
         return "write_file"
@@ -75,6 +83,9 @@ class WriteFileTool(Tool):
         }
     
     async def execute(self, path: str, content: str, **kwargs: Any) -> str:
+        return await run_io(self._execute, path, content)
+    
+    def _execute(self, path: str, content: str) -> str:
         try:
             file_path = Path(path).expanduser()
             file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -89,6 +100,8 @@ class WriteFileTool(Tool):
 class EditFileTool(Tool):
     """Tool to edit a file by replacing text."""
     
+    concurrency = "side_effect"
+    
     @property
     def name(self) -> str:
         return "edit_file"
@@ -119,6 +132,9 @@ class EditFileTool(Tool):
         }
     
     async def execute(self, path: str, old_text: str, new_text: str, **kwargs: Any) -> str:
+        return await run_io(self._execute, path, old_text, new_text)
+    
+    def _execute(self, path: str, old_text: str, new_text: str) -> str:
         try:
             file_path = Path(path).expanduser()
             if not file_path.exists():
@@ -147,6 +163,8 @@ class EditFileTool(Tool):
 class ListDirTool(Tool):
     """Tool to list directory contents."""
     
+    concurrency = "read_only"
+    
     @property
     def name(self) -> str:
         return "list_dir"
@@ -169,6 +187,9 @@ class ListDirTool(Tool):
         }
     
     async def execute(self, path: str, **kwargs: Any) -> str:
+        return await run_io(self._execute, path)
+    
+    def _execute(self, path: str) -> str:
         try:
             dir_path = Path(path).expanduser()
             if not dir_path.exists():
@@ -0,0 +1,59 @@
+"""Memory search tool."""
+
+from typing import Any
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.tools.base import Tool
+from nanobot.utils.aio import run_io
+
+
+class MemorySearchTool(Tool):
+    """Tool to search long-term memory and daily notes."""
+    
+    concurrency = "read_only"
+    
+    def __init__(self, memory: MemoryStore):
+        self.memory = memory
+    
+    @property
+    def name(self) -> str:
+        return "memory_search"
+    
+    @property
+    def description(self) -> str:
+        return (
+            "Search your long-term memory and all past daily notes by keywords. "
+            "Returns the most relevant passages with their date and file."
+        )
+    
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Keywords to look for"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum passages to return (default 5)",
+                    "minimum": 1,
+                    "maximum": 20
+                }
+            },
+            "required": ["query"]
+        }
+    
+    async def execute(self, query: str, limit: int = 5, **kwargs: Any) -> str:
+        hits = await run_io(self.memory.search, query, limit)
+        if not hits:
+            return f"No memories match '{query}'."
+        
+        results = []
+        for chunk, _ in hits:
+            source = chunk.date or "long-term"
+            title = f" - {chunk.heading}" if chunk.heading and chunk.heading != chunk.date else ""
+            rel = chunk.path.relative_to(self.memory.workspace)
+            results.append(f"[{source}{title}] ({rel})\n{chunk.text}")
+        return "\n\n---\n\n".join(results)
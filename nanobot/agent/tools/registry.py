@@ -1,19 +1,33 @@
 """Tool registry for dynamic tool management."""
 
+import asyncio
 from typing import Any
 
-from nanobot.agent.tools.base import Tool
+from nanobot.agent.artifacts import ArtifactStore
+from nanobot.agent.tools.base import Tool, ToolConcurrency
+from nanobot.tracing import span
+from nanobot.utils.aio import run_io
 
 
 class ToolRegistry:
     """
     Registry for agent tools.
     
-    Allows dynamic registration and execution of tools.
+    Allows dynamic registration and execution of tools. With an artifact store,
+    results longer than spill_chars are saved there and replaced by a preview
+    and the artifact ID, which the read_artifact tool pages through.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        artifacts: ArtifactStore | None = None,
+        spill_chars: int = 8000,
+        preview_chars: int = 2000,
+    ):
         self._tools: dict[str, Tool] = {}
+        self.artifacts = artifacts
+        self.spill_chars = spill_chars
+        self.preview_chars = preview_chars
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
@@ -49,6 +63,17 @@ class ToolRegistry:
         Raises:
             KeyError: If tool not found.
         """
+        with span("tool.execute", tool=name) as s:
+            result = await self._execute(name, params)
+            s.set(result_chars=len(result))
+            if result.startswith("Error"):
+                s.error = result[:200]
+            elif self._should_spill(name, result):
+                result = await run_io(self._spill, result)
+                s.set(spilled=True)
+            return result
+    
+    async def _execute(self, name: str, params: dict[str, Any]) -> str:
         tool = self._tools.get(name)
         if not tool:
             return f"Error: Tool '{name}' not found"
@@ -61,6 +86,88 @@ class ToolRegistry:
         except Exception as e:
             return f"Error executing {name}: {str(e)}"
     
+    async def execute_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        """
+        Execute several tool calls concurrently, honouring each tool's concurrency class.
+        
+        Read-only calls run in parallel with each other, but start only after the
+        side-effecting call requested before them (so a read sees an earlier
+        write). Side-effecting calls run in request order, each after the calls
+        requested before it, and exclusive calls act as a barrier and run alone.
+        
+        Args:
+            calls: (name, params) pairs in the order the LLM requested them.
+        
+        Returns:
+            Results in the same order as calls.
+        """
+        if len(calls) == 1:
+            name, params = calls[0]
+            return [await self.execute(name, params)]
+        
+        results = [""] * len(calls)
+        pending: list[asyncio.Task[None]] = []
+        last_side_effect: asyncio.Task[None] | None = None
+        reads: list[asyncio.Task[None]] = []  # Read-only calls since the last side effect
+        
+        async def run(index: int, name: str, params: dict[str, Any],
+                      after: list[asyncio.Task[None]]) -> None:
+            if after:
+                await asyncio.wait(after)
+            results[index] = await self.execute(name, params)
+        
+        for index, (name, params) in enumerate(calls):
+            mode = self._concurrency(name)
+            if mode == "exclusive":
+                if pending:
+                    await asyncio.gather(*pending)
+                    pending.clear()
+                    last_side_effect = None
+                    reads.clear()
+                results[index] = await self.execute(name, params)
+            elif mode == "side_effect":
+                after = reads + ([last_side_effect] if last_side_effect else [])
+                last_side_effect = asyncio.create_task(run(index, name, params, after))
+                pending.append(last_side_effect)
+                reads = []
+            else:
+                task = asyncio.create_task(run(index, name, params, [last_side_effect] if last_side_effect else []))
+                pending.append(task)
+                reads.append(task)
+        
+        if pending:
+            await asyncio.gather(*pending)
+        return results
+    
+    def _should_spill(self, name: str, result: str) -> bool:
+        tool = self._tools.get(name)
+        return (
+            self.artifacts is not None
+            and tool is not None
+            and tool.spill_output
+            and len(result) > self.spill_chars
+        )
+    
+    def _spill(self, result: str) -> str:
+        """Store a result as an artifact and return its head, tail and handle."""
+        artifact_id = self.artifacts.put(result)
+        head_chars = self.preview_chars * 3 // 4
+        tail_chars = self.preview_chars - head_chars
+        head = result[:head_chars]
+        tail = result[-tail_chars:] if tail_chars else ""
+        return (
+            f"{head}\n\n"
+            f"[... {len(result) - head_chars - tail_chars} chars omitted. Full output "
+            f"({len(result)} chars) saved as artifact \"{artifact_id}\"; "
+            f"read more with read_artifact(id=\"{artifact_id}\", offset={head_chars}) ...]\n\n"
+            f"{tail}"
+        )
+    
+    def _concurrency(self, name: str) -> ToolConcurrency:
+        """Get the concurrency class of a tool (unknown tools just return an error)."""
+        tool = self._tools.get(name)
+        return tool.concurrency if tool else "read_only"
+    
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
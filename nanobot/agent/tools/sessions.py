@@ -0,0 +1,62 @@
+"""Session search tool."""
+
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.session.manager import SessionManager
+from nanobot.utils.aio import run_io
+
+
+class SessionSearchTool(Tool):
+    """Tool to search the history of all past conversations."""
+    
+    concurrency = "read_only"
+    
+    def __init__(self, sessions: SessionManager):
+        self.sessions = sessions
+    
+    @property
+    def name(self) -> str:
+        return "session_search"
+    
+    @property
+    def description(self) -> str:
+        return (
+            "Search earlier conversations (all chats and channels) by keywords. "
+            "Returns matching messages with their session, position and time."
+        )
+    
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Keywords to look for"
+                },
+                "session": {
+                    "type": "string",
+                    "description": "Only search this session key (e.g. telegram:12345)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum messages to return (default 8)",
+                    "minimum": 1,
+                    "maximum": 30
+                }
+            },
+            "required": ["query"]
+        }
+    
+    async def execute(self, query: str, session: str | None = None, limit: int = 8, **kwargs: Any) -> str:
+        # The first search may index older history, so keep it off the event loop
+        hits = await run_io(self.sessions.search, query, limit, session)
+        if not hits:
+            return f"No earlier messages match '{query}'."
+        
+        results = []
+        for hit in hits:
+            when = f", {hit.timestamp[:16].replace('T', ' ')}" if hit.timestamp else ""
+            results.append(f"[{hit.session_key} #{hit.seq}, {hit.role}{when}]\n{hit.snippet}")
+        return "\n\n---\n\n".join(results)
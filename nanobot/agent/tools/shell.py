@@ -12,6 +12,9 @@ from nanobot.agent.tools.base import Tool
 class ExecTool(Tool):
     """Tool to execute shell commands."""
     
+    # Arbitrary commands may touch anything, so never overlap them with other calls
+    concurrency = "exclusive"
+    
     def __init__(
         self,
         timeout: int = 60,
@@ -19,8 +22,10 @@ class ExecTool(Tool):
         deny_patterns: list[str] | None = None,
         allow_patterns: list[str] | None = None,
         restrict_to_workspace: bool = False,
+        max_output_chars: int = 1_000_000,
     ):
         self.timeout = timeout
+        self.max_output_chars = max_output_chars
         self.working_dir = working_dir
         self.deny_patterns = deny_patterns or [
             r"\brm\s+-[rf]{1,2}\b",          # rm -r, rm -rf, rm -fr
@@ -98,8 +103,9 @@ class ExecTool(Tool):
             
             result = "\n".join(output_parts) if output_parts else "(no output)"
             
-            # Truncate very long output
-            max_len = 10000
+            # Cap runaway output; long results are otherwise kept whole and
+            # moved to the artifact store by the tool registry
+            max_len = self.max_output_chars
             if len(result) > max_len:
                 result = result[:max_len] + f"\n... (truncated, {len(result) - max_len} more chars)"
             
@@ -0,0 +1,56 @@
+"""Skill listing tool."""
+
+from typing import Any
+
+from nanobot.agent.skills import SkillsLoader
+from nanobot.agent.tools.base import Tool
+from nanobot.utils.aio import run_io
+
+
+class ListSkillsTool(Tool):
+    """Tool to search or list installed skills."""
+    
+    concurrency = "read_only"
+    
+    def __init__(self, loader: SkillsLoader):
+        self.loader = loader
+    
+    @property
+    def name(self) -> str:
+        return "list_skills"
+    
+    @property
+    def description(self) -> str:
+        return (
+            "Search installed skills by keywords, or list all of them when no query is given. "
+            "Returns each skill's name, description and SKILL.md location."
+        )
+    
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Keywords describing the task (omit to list all skills)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum skills to return when searching (default 10)",
+                    "minimum": 1
+                }
+            }
+        }
+    
+    async def execute(self, query: str | None = None, limit: int = 10, **kwargs: Any) -> str:
+        # Searching may re-scan and re-index skill files
+        return await run_io(self._list, query, limit)
+    
+    def _list(self, query: str | None, limit: int) -> str:
+        if query:
+            names = self.loader.search(query, limit)
+            if not names:
+                return f"No skills match '{query}'. Call list_skills without a query to see all skills."
+            return self.loader.build_skills_summary(names)
+        return self.loader.build_skills_summary() or "No skills installed."
@@ -10,6 +10,7 @@ from urllib.parse import urlparse
 import httpx
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.aio import run_io
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
@@ -48,6 +49,7 @@ class WebSearchTool(Tool):
     
     name = "web_search"
     description = "Search the web. Returns titles, URLs, and snippets."
+    concurrency = "read_only"
     parameters = {
         "type": "object",
         "properties": {
@@ -95,6 +97,7 @@ class WebFetchTool(Tool):
     
     name = "web_fetch"
     description = "Fetch URL and extract readable content (HTML → markdown/text)."
+    concurrency = "read_only"
     parameters = {
         "type": "object",
         "properties": {
@@ -109,8 +112,6 @@ class WebFetchTool(Tool):
         self.max_chars = max_chars
     
     async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
-        from readability import Document
-
         max_chars = maxChars or self.max_chars
 
         # Validate URL before fetching
@@ -134,9 +135,8 @@ class WebFetchTool(Tool):
                 text, extractor = json.dumps(r.json(), indent=2), "json"
             # HTML
             elif "text/html" in ctype or r.text[:256].lower().startswith(("<!doctype", "<html")):
-                doc = Document(r.text)
-                content = self._to_markdown(doc.summary()) if extractMode == "markdown" else _strip_tags(doc.summary())
-                text = f"# {doc.title()}\n\n{content}" if doc.title() else content
+                # Parsing large pages takes long enough to stall the event loop
+                text = await run_io(self._extract, r.text, extractMode)
                 extractor = "readability"
             else:
                 text, extractor = r.text, "raw"
@@ -150,6 +150,14 @@ class WebFetchTool(Tool):
         except Exception as e:
             return json.dumps({"error": str(e), "url": url})
     
+    def _extract(self, page: str, extract_mode: str) -> str:
+        """Extract the main content of an HTML page."""
+        from readability import Document
+        
+        doc = Document(page)
+        content = self._to_markdown(doc.summary()) if extract_mode == "markdown" else _strip_tags(doc.summary())
+        return f"# {doc.title()}\n\n{content}" if doc.title() else content
+    
     def _to_markdown(self, html: str) -> str:
         """Convert HTML to markdown."""
         # Convert links, headings, lists before stripping tags
@@ -33,5 +33,7 @@ class OutboundMessage:
     reply_to: str | None = None
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    stream_id: str | None = None  # Ties streamed drafts of one reply to its final message
+    draft: bool = False  # Partial reply text that a later message with the same stream_id replaces
 
 
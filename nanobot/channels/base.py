@@ -1,10 +1,33 @@
 """Base channel interface for chat platforms."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
+from nanobot.utils.aio import run_io
+
+if TYPE_CHECKING:
+    from nanobot.media.ingest import MediaIngestor, MediaSource
+
+
+@dataclass
+class _Draft:
+    """A placeholder message being edited in place while a reply streams in."""
+    chat_id: str
+    message_id: str | None = None
+    text: str = ""  # Latest partial text received
+    shown: str = ""  # Text currently displayed on the platform
+    last_edit: float = 0.0
+    updated: float = field(default_factory=time.monotonic)  # When text last arrived
+    closed: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    task: asyncio.Task | None = None
 
 
 class BaseChannel(ABC):
@@ -17,6 +40,12 @@ class BaseChannel(ABC):
     
     name: str = "base"
     
+    # Minimum seconds between edits of one draft (keeps within platform rate limits)
+    draft_interval_s: float = 1.0
+    
+    # Drafts whose reply never arrives (e.g. the turn ended without one) are dropped after this
+    draft_ttl_s: float = 600.0
+    
     def __init__(self, config: Any, bus: MessageBus):
         """
         Initialize the channel.
@@ -28,6 +57,8 @@ class BaseChannel(ABC):
         self.config = config
         self.bus = bus
         self._running = False
+        self._drafts: dict[str, _Draft] = {}
+        self.ingest: "MediaIngestor | None" = None  # Shared media downloader set by the ChannelManager
     
     @abstractmethod
     async def start(self) -> None:
@@ -56,6 +87,103 @@ class BaseChannel(ABC):
         """
         pass
     
+    @property
+    def supports_drafts(self) -> bool:
+        """Whether this channel renders streamed replies by editing a draft message."""
+        return False
+    
+    async def _post_draft(self, chat_id: str, text: str) -> str | None:
+        """Post a draft placeholder message and return its platform message ID."""
+        raise NotImplementedError
+    
+    async def _edit_draft(self, chat_id: str, message_id: str, text: str, final: bool = False) -> None:
+        """Replace the text of a draft message (final=True for the complete reply)."""
+        raise NotImplementedError
+    
+    async def _delete_draft(self, chat_id: str, message_id: str) -> None:
+        """Delete a draft message that could not be finalized in place."""
+        raise NotImplementedError
+    
+    def _update_draft(self, msg: OutboundMessage) -> None:
+        """
+        Record the latest partial text of a streamed reply.
+        
+        Edits are coalesced: at most one post/edit per draft_interval_s, always
+        showing the newest text received.
+        """
+        if not msg.stream_id:
+            return
+        draft = self._drafts.get(msg.stream_id)
+        if draft is None:
+            self._expire_drafts()
+            draft = self._drafts[msg.stream_id] = _Draft(chat_id=msg.chat_id)
+        draft.text = msg.content
+        draft.updated = time.monotonic()
+        if draft.task is None or draft.task.done():
+            draft.task = asyncio.create_task(self._flush_draft(draft))
+    
+    def _expire_drafts(self) -> None:
+        """Forget drafts that received no text for draft_ttl_s; they stay shown as they are."""
+        cutoff = time.monotonic() - self.draft_ttl_s
+        for stream_id in [sid for sid, d in self._drafts.items() if d.updated < cutoff]:
+            draft = self._drafts.pop(stream_id)
+            draft.closed = True
+            if draft.task and not draft.lock.locked():
+                draft.task.cancel()
+    
+    async def _flush_draft(self, draft: _Draft) -> None:
+        """Push the newest draft text to the platform until it is up to date."""
+        while not draft.closed:
+            delay = draft.last_edit + self.draft_interval_s - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            async with draft.lock:
+                if draft.closed or draft.text == draft.shown:
+                    return
+                text = draft.text
+                try:
+                    if draft.message_id is None:
+                        draft.message_id = await self._post_draft(draft.chat_id, text)
+                    else:
+                        await self._edit_draft(draft.chat_id, draft.message_id, text)
+                    draft.shown = text
+                except Exception as e:
+                    logger.warning(f"Failed to update {self.name} draft: {e}")
+                    draft.shown = text  # Skip this revision; retry on the next one
+                draft.last_edit = time.monotonic()
+    
+    async def _finish_draft(self, msg: OutboundMessage) -> bool:
+        """
+        Replace a streamed draft with the final reply.
+        
+        Returns:
+            True if the draft was edited into the final message, False if the
+            caller should send the reply as a new message.
+        """
+        draft = self._drafts.pop(msg.stream_id, None) if msg.stream_id else None
+        if draft is None:
+            return False
+        
+        draft.closed = True
+        if draft.task and not draft.lock.locked():
+            draft.task.cancel()
+        
+        # Wait for an in-flight post/edit so the draft's message ID is known
+        async with draft.lock:
+            if draft.message_id is None:
+                return False
+            try:
+                await self._edit_draft(draft.chat_id, draft.message_id, msg.content, final=True)
+                return True
+            except Exception as e:
+                logger.warning(f"Failed to finalize {self.name} draft, sending new message: {e}")
+                try:
+                    await self._delete_draft(draft.chat_id, draft.message_id)
+                except Exception:
+                    pass
+                return False
+    
     def is_allowed(self, sender_id: str) -> bool:
         """
         Check if a sender is allowed to use this bot.
@@ -87,12 +215,15 @@ class BaseChannel(ABC):
         chat_id: str,
         content: str,
         media: list[str] | None = None,
-        metadata: dict[str, Any] | None = None
+        metadata: dict[str, Any] | None = None,
+        sources: "list[MediaSource] | None" = None,
     ) -> None:
         """
         Handle an incoming message from the chat platform.
         
-        This method checks permissions and forwards to the bus.
+        This method checks permissions and forwards to the bus. Attachments
+        given as sources are downloaded in the background first, so this
+        returns without waiting for them.
         
         Args:
             sender_id: The sender's identifier.
@@ -100,6 +231,7 @@ class BaseChannel(ABC):
             content: Message text content.
             media: Optional list of media URLs.
             metadata: Optional channel-specific metadata.
+            sources: Optional attachments still to be downloaded.
         """
         if not self.is_allowed(sender_id):
             return
@@ -113,7 +245,14 @@ class BaseChannel(ABC):
             metadata=metadata or {}
         )
         
-        await self.bus.publish_inbound(msg)
+        if self.ingest is None:
+            if not sources:
+                await self.bus.publish_inbound(msg)
+                return
+            from nanobot.media.ingest import MediaIngestor
+            from nanobot.media.store import create_media_store
+            self.ingest = MediaIngestor(await run_io(create_media_store))
+        await self.ingest.submit(msg, sources or [], self.bus.publish_inbound)
     
     @property
     def is_running(self) -> bool:
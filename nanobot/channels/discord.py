@@ -3,7 +3,7 @@
 import asyncio
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 import websockets
@@ -13,16 +13,25 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import DiscordConfig
+from nanobot.media.ingest import MediaSource
 
 
 DISCORD_API_BASE = "https://discord.com/api/v10"
-MAX_ATTACHMENT_BYTES = 20 * 1024 * 1024  # 20MB
+MAX_MESSAGE_CHARS = 2000
+
+
+def _clip(text: str) -> str:
+    """Fit draft text into a single Discord message."""
+    if len(text) <= MAX_MESSAGE_CHARS:
+        return text
+    return text[: MAX_MESSAGE_CHARS - 1] + "…"
 
 
 class DiscordChannel(BaseChannel):
     """Discord channel using Gateway websocket."""
 
     name = "discord"
+    draft_interval_s = 1.2  # Discord allows 5 message edits per 5 seconds per channel
 
     def __init__(self, config: DiscordConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -72,12 +81,20 @@ class DiscordChannel(BaseChannel):
             await self._http.aclose()
             self._http = None
 
+    @property
+    def supports_drafts(self) -> bool:
+        return self.config.stream_replies
+
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Discord REST API."""
         if not self._http:
             logger.warning("Discord HTTP client not initialized")
             return
 
+        if msg.draft:
+            self._update_draft(msg)
+            return
+
         url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
         payload: dict[str, Any] = {"content": msg.content}
 
@@ -85,28 +102,60 @@ class DiscordChannel(BaseChannel):
             payload["message_reference"] = {"message_id": msg.reply_to}
             payload["allowed_mentions"] = {"replied_user": False}
 
-        headers = {"Authorization": f"Bot {self.config.token}"}
-
         try:
-            for attempt in range(3):
-                try:
-                    response = await self._http.post(url, headers=headers, json=payload)
-                    if response.status_code == 429:
-                        data = response.json()
-                        retry_after = float(data.get("retry_after", 1.0))
-                        logger.warning(f"Discord rate limited, retrying in {retry_after}s")
-                        await asyncio.sleep(retry_after)
-                        continue
-                    response.raise_for_status()
-                    return
-                except Exception as e:
-                    if attempt == 2:
-                        logger.error(f"Error sending Discord message: {e}")
-                    else:
-                        await asyncio.sleep(1)
+            if await self._finish_draft(msg):
+                return
+            await self._api("POST", url, payload)
+        except Exception as e:
+            logger.error(f"Error sending Discord message: {e}")
         finally:
             await self._stop_typing(msg.chat_id)
 
+    async def _api(
+        self,
+        method: str,
+        url: str,
+        payload: dict[str, Any] | None = None,
+        attempts: int = 3,
+    ) -> httpx.Response:
+        """Call the Discord REST API, retrying on rate limits and transient errors."""
+        if not self._http:
+            raise RuntimeError("Discord HTTP client not initialized")
+
+        headers = {"Authorization": f"Bot {self.config.token}"}
+        for attempt in range(attempts):
+            try:
+                response = await self._http.request(method, url, headers=headers, json=payload)
+                if response.status_code == 429 and attempt < attempts - 1:
+                    data = response.json()
+                    retry_after = float(data.get("retry_after", 1.0))
+                    logger.warning(f"Discord rate limited, retrying in {retry_after}s")
+                    await asyncio.sleep(retry_after)
+                    continue
+                response.raise_for_status()
+                return response
+            except Exception:
+                if attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(1)
+        raise RuntimeError("Discord request failed")
+
+    async def _post_draft(self, chat_id: str, text: str) -> str | None:
+        url = f"{DISCORD_API_BASE}/channels/{chat_id}/messages"
+        response = await self._api("POST", url, {"content": _clip(text)}, attempts=1)
+        await self._stop_typing(chat_id)
+        return str(response.json().get("id"))
+
+    async def _edit_draft(self, chat_id: str, message_id: str, text: str, final: bool = False) -> None:
+        if final and len(text) > MAX_MESSAGE_CHARS:
+            raise ValueError("reply too long to edit in place")
+        url = f"{DISCORD_API_BASE}/channels/{chat_id}/messages/{message_id}"
+        await self._api("PATCH", url, {"content": text if final else _clip(text)}, attempts=3 if final else 1)
+
+    async def _delete_draft(self, chat_id: str, message_id: str) -> None:
+        url = f"{DISCORD_API_BASE}/channels/{chat_id}/messages/{message_id}"
+        await self._api("DELETE", url, attempts=1)
+
     async def _gateway_loop(self) -> None:
         """Main gateway loop: identify, heartbeat, dispatch events."""
         if not self._ws:
@@ -197,30 +246,20 @@ class DiscordChannel(BaseChannel):
         if not self.is_allowed(sender_id):
             return
 
-        content_parts = [content] if content else []
-        media_paths: list[str] = []
-        media_dir = Path.home() / ".nanobot" / "media"
-
+        sources: list[MediaSource] = []
         for attachment in payload.get("attachments") or []:
             url = attachment.get("url")
             filename = attachment.get("filename") or "attachment"
-            size = attachment.get("size") or 0
             if not url or not self._http:
                 continue
-            if size and size > MAX_ATTACHMENT_BYTES:
-                content_parts.append(f"[attachment: {filename} - too large]")
-                continue
-            try:
-                media_dir.mkdir(parents=True, exist_ok=True)
-                file_path = media_dir / f"{attachment.get('id', 'file')}_{filename.replace('/', '_')}"
-                resp = await self._http.get(url)
-                resp.raise_for_status()
-                file_path.write_bytes(resp.content)
-                media_paths.append(str(file_path))
-                content_parts.append(f"[attachment: {file_path}]")
-            except Exception as e:
-                logger.warning(f"Failed to download Discord attachment: {e}")
-                content_parts.append(f"[attachment: {filename} - download failed]")
+            sources.append(MediaSource(
+                kind="attachment",
+                name=filename,
+                ext=Path(filename).suffix,
+                fetch=lambda url=url: self._download(url),
+                size=attachment.get("size") or 0,
+                transcribe=(attachment.get("content_type") or "").startswith("audio/"),
+            ))
 
         reply_to = (payload.get("referenced_message") or {}).get("id")
 
@@ -229,8 +268,8 @@ class DiscordChannel(BaseChannel):
         await self._handle_message(
             sender_id=sender_id,
             chat_id=channel_id,
-            content="\n".join(p for p in content_parts if p) or "[empty message]",
-            media=media_paths,
+            content=content,
+            sources=sources,
             metadata={
                 "message_id": str(payload.get("id", "")),
                 "guild_id": payload.get("guild_id"),
@@ -238,6 +277,13 @@ class DiscordChannel(BaseChannel):
             },
         )
 
+    async def _download(self, url: str) -> AsyncIterator[bytes]:
+        """Stream an attachment from the Discord CDN."""
+        async with self._http.stream("GET", url) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes():
+                yield chunk
+
     async def _start_typing(self, channel_id: str) -> None:
         """Start periodic typing indicator for a channel."""
         await self._stop_typing(channel_id)
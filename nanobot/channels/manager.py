@@ -1,6 +1,7 @@
 """Channel manager for coordinating chat channels."""
 
 import asyncio
+import time
 from typing import Any
 
 from loguru import logger
@@ -9,6 +10,10 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import Config
+from nanobot.media.ingest import MediaIngestor
+from nanobot.media.store import create_media_store
+from nanobot.providers.transcription import GroqTranscriptionProvider
+from nanobot.tracing import get_tracer
 
 
 class ChannelManager:
@@ -26,8 +31,16 @@ class ChannelManager:
         self.bus = bus
         self.channels: dict[str, BaseChannel] = {}
         self._dispatch_task: asyncio.Task | None = None
+        self.media = create_media_store(config.media)
+        self.ingest = MediaIngestor(
+            self.media,
+            max_concurrent=config.media.max_concurrent_downloads,
+            transcriber=GroqTranscriptionProvider(api_key=config.providers.groq.api_key).transcribe,
+        )
         
         self._init_channels()
+        for channel in self.channels.values():
+            channel.ingest = self.ingest
     
     def _init_channels(self) -> None:
         """Initialize channels based on config."""
@@ -39,7 +52,6 @@ class ChannelManager:
                 self.channels["telegram"] = TelegramChannel(
                     self.config.channels.telegram,
                     self.bus,
-                    groq_api_key=self.config.providers.groq.api_key,
                 )
                 logger.info("Telegram channel enabled")
             except ImportError as e:
@@ -115,6 +127,9 @@ class ChannelManager:
                 logger.info(f"Stopped {name} channel")
             except Exception as e:
                 logger.error(f"Error stopping {name}: {e}")
+        
+        # Drop messages still waiting for their media
+        await self.ingest.close()
     
     async def _dispatch_outbound(self) -> None:
         """Dispatch outbound messages to the appropriate channel."""
@@ -128,11 +143,22 @@ class ChannelManager:
                 )
                 
                 channel = self.channels.get(msg.channel)
+                if channel and msg.draft and not channel.supports_drafts:
+                    continue
                 if channel:
+                    started = time.time()
+                    error = None
                     try:
                         await channel.send(msg)
                     except Exception as e:
+                        error = str(e)
                         logger.error(f"Error sending to {msg.channel}: {e}")
+                    trace_id = msg.metadata.get("trace_id")
+                    if trace_id and not msg.draft:
+                        get_tracer().record(
+                            trace_id, "outbound.dispatch", started,
+                            (time.time() - started) * 1000, error=error, channel=msg.channel,
+                        )
                 else:
                     logger.warning(f"Unknown channel: {msg.channel}")
                     
@@ -159,3 +185,8 @@ class ChannelManager:
     def enabled_channels(self) -> list[str]:
         """Get list of enabled channel names."""
         return list(self.channels.keys())
+    
+    @property
+    def draft_channels(self) -> list[str]:
+        """Get names of channels that render streamed replies as edited drafts."""
+        return [name for name, channel in self.channels.items() if channel.supports_drafts]
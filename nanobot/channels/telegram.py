@@ -2,15 +2,18 @@
 
 import asyncio
 import re
+from typing import AsyncIterator
 
 from loguru import logger
 from telegram import Update
+from telegram.error import BadRequest
 from telegram.ext import Application, MessageHandler, filters, ContextTypes
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import TelegramConfig
+from nanobot.media.ingest import MediaSource
 
 
 def _markdown_to_telegram_html(text: str) -> str:
@@ -76,6 +79,10 @@ def _markdown_to_telegram_html(text: str) -> str:
     return text
 
 
+# Telegram's maximum message length
+MAX_MESSAGE_CHARS = 4096
+
+
 class TelegramChannel(BaseChannel):
     """
     Telegram channel using long polling.
@@ -84,11 +91,11 @@ class TelegramChannel(BaseChannel):
     """
     
     name = "telegram"
+    draft_interval_s = 1.0  # Telegram allows roughly one edit per second per chat
     
-    def __init__(self, config: TelegramConfig, bus: MessageBus, groq_api_key: str = ""):
+    def __init__(self, config: TelegramConfig, bus: MessageBus):
         super().__init__(config, bus)
         self.config: TelegramConfig = config
-        self.groq_api_key = groq_api_key
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
     
@@ -151,12 +158,22 @@ class TelegramChannel(BaseChannel):
             await self._app.shutdown()
             self._app = None
     
+    @property
+    def supports_drafts(self) -> bool:
+        return self.config.stream_replies
+    
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Telegram."""
         if not self._app:
             logger.warning("Telegram bot not running")
             return
         
+        if msg.draft:
+            self._update_draft(msg)
+            return
+        if await self._finish_draft(msg):
+            return
+        
         try:
             # chat_id should be the Telegram chat ID (integer)
             chat_id = int(msg.chat_id)
@@ -180,6 +197,50 @@ class TelegramChannel(BaseChannel):
             except Exception as e2:
                 logger.error(f"Error sending Telegram message: {e2}")
     
+    async def _post_draft(self, chat_id: str, text: str) -> str | None:
+        """Post the draft as plain text (partial markdown may not convert cleanly)."""
+        if not self._app:
+            return None
+        message = await self._app.bot.send_message(
+            chat_id=int(chat_id),
+            text=text[:MAX_MESSAGE_CHARS]
+        )
+        return str(message.message_id)
+    
+    async def _edit_draft(self, chat_id: str, message_id: str, text: str, final: bool = False) -> None:
+        """Edit the draft in place; the final edit is rendered as HTML."""
+        if not self._app:
+            raise RuntimeError("Telegram bot not running")
+        
+        try:
+            if final:
+                try:
+                    await self._app.bot.edit_message_text(
+                        chat_id=int(chat_id),
+                        message_id=int(message_id),
+                        text=_markdown_to_telegram_html(text),
+                        parse_mode="HTML"
+                    )
+                    return
+                except BadRequest as e:
+                    if "not modified" in str(e).lower() or len(text) > MAX_MESSAGE_CHARS:
+                        raise
+                    logger.warning(f"HTML parse failed, falling back to plain text: {e}")
+            
+            await self._app.bot.edit_message_text(
+                chat_id=int(chat_id),
+                message_id=int(message_id),
+                text=text if final else text[:MAX_MESSAGE_CHARS]
+            )
+        except BadRequest as e:
+            # Editing to identical text is not an error for us
+            if "not modified" not in str(e).lower():
+                raise
+    
+    async def _delete_draft(self, chat_id: str, message_id: str) -> None:
+        if self._app:
+            await self._app.bot.delete_message(chat_id=int(chat_id), message_id=int(message_id))
+    
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
         if not update.message or not update.effective_user:
@@ -210,7 +271,7 @@ class TelegramChannel(BaseChannel):
         
         # Build content from text and/or media
         content_parts = []
-        media_paths = []
+        sources = []
         
         # Text content
         if message.text:
@@ -235,41 +296,19 @@ class TelegramChannel(BaseChannel):
             media_file = message.document
             media_type = "file"
         
-        # Download media if present
+        # Download media in the background (the message is published once it is stored)
         if media_file and self._app:
-            try:
-                file = await self._app.bot.get_file(media_file.file_id)
-                ext = self._get_extension(media_type, getattr(media_file, 'mime_type', None))
-                
-                # Save to workspace/media/
-                from pathlib import Path
-                media_dir = Path.home() / ".nanobot" / "media"
-                media_dir.mkdir(parents=True, exist_ok=True)
-                
-                file_path = media_dir / f"{media_file.file_id[:16]}{ext}"
-                await file.download_to_drive(str(file_path))
-                
-                media_paths.append(str(file_path))
-                
-                # Handle voice transcription
-                if media_type == "voice" or media_type == "audio":
-                    from nanobot.providers.transcription import GroqTranscriptionProvider
-                    transcriber = GroqTranscriptionProvider(api_key=self.groq_api_key)
-                    transcription = await transcriber.transcribe(file_path)
-                    if transcription:
-                        logger.info(f"Transcribed {media_type}: {transcription[:50]}...")
-                        content_parts.append(f"[transcription: {transcription}]")
-                    else:
-                        content_parts.append(f"[{media_type}: {file_path}]")
-                else:
-                    content_parts.append(f"[{media_type}: {file_path}]")
-                    
-                logger.debug(f"Downloaded {media_type} to {file_path}")
-            except Exception as e:
-                logger.error(f"Failed to download media: {e}")
-                content_parts.append(f"[{media_type}: download failed]")
+            ext = self._get_extension(media_type, getattr(media_file, 'mime_type', None))
+            sources.append(MediaSource(
+                kind=media_type,
+                name=getattr(media_file, "file_name", None) or f"{media_type}{ext}",
+                ext=ext,
+                fetch=lambda: self._download(media_file.file_id),
+                size=getattr(media_file, "file_size", None) or 0,
+                transcribe=media_type in ("voice", "audio"),
+            ))
         
-        content = "\n".join(content_parts) if content_parts else "[empty message]"
+        content = "\n".join(content_parts)
         
         logger.debug(f"Telegram message from {sender_id}: {content[:50]}...")
         
@@ -278,7 +317,7 @@ class TelegramChannel(BaseChannel):
             sender_id=sender_id,
             chat_id=str(chat_id),
             content=content,
-            media=media_paths,
+            sources=sources,
             metadata={
                 "message_id": message.message_id,
                 "user_id": user.id,
@@ -288,6 +327,11 @@ class TelegramChannel(BaseChannel):
             }
         )
     
+    async def _download(self, file_id: str) -> AsyncIterator[bytes]:
+        """Stream a file from Telegram (the Bot API serves it in one piece)."""
+        file = await self._app.bot.get_file(file_id)
+        yield bytes(await file.download_as_bytearray())
+    
     def _get_extension(self, media_type: str, mime_type: str | None) -> str:
         """Get file extension based on media type."""
         if mime_type:
@@ -2,12 +2,17 @@
 
 import asyncio
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 from rich.console import Console
 from rich.table import Table
 
-from nanobot import __version__, __logo__
+from nanobot import __logo__, __version__
+
+if TYPE_CHECKING:
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.config.schema import Config
 
 app = typer.Typer(
     name="nanobot",
@@ -158,14 +163,18 @@ def gateway(
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ):
     """Start the nanobot gateway."""
-    from nanobot.config.loader import load_config, get_data_dir
-    from nanobot.bus.queue import MessageBus
-    from nanobot.providers.litellm_provider import LiteLLMProvider
+    from nanobot.agent.consolidation import MemoryConsolidator
     from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.queue import MessageBus
     from nanobot.channels.manager import ChannelManager
+    from nanobot.config.loader import get_data_dir, load_config
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
+    from nanobot.providers.litellm_provider import LiteLLMProvider
+    from nanobot.session.retention import SessionRetention
+    from nanobot.tracing import LoopMonitor
+    from nanobot.utils.aio import set_io_workers
     
     if verbose:
         import logging
@@ -174,6 +183,8 @@ def gateway(
     console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
     
     config = load_config()
+    _setup_tracing(config)
+    set_io_workers(config.agents.defaults.io_workers)
     
     # Create components
     bus = MessageBus()
@@ -209,6 +220,16 @@ def gateway(
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
         cron_service=cron,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        max_tokens=config.agents.defaults.max_tokens,
+        context_window=config.agents.defaults.context_window or None,
+        artifacts_config=config.tools.artifacts,
+        skills_top_k=config.agents.defaults.skills_top_k,
+        memory_max_chars=config.agents.defaults.memory_max_chars,
+        image_max_edge=config.agents.defaults.image_max_edge,
+        summary_model=config.agents.defaults.summary_model or None,
+        summarize_after_tokens=config.agents.defaults.summarize_after_tokens,
+        sessions_config=config.sessions,
     )
     
     # Set cron callback (needs agent)
@@ -242,8 +263,40 @@ def gateway(
         enabled=True
     )
     
+    # Create memory consolidation service
+    memory_config = config.memory
+    consolidator = MemoryConsolidator(
+        workspace=config.workspace_path,
+        provider=provider,
+        model=memory_config.model or config.agents.defaults.model,
+        interval_s=memory_config.interval_hours * 3600,
+        keep_days=memory_config.keep_days,
+        monthly_after_days=memory_config.monthly_after_days,
+        max_long_term_chars=memory_config.max_long_term_chars,
+        enabled=memory_config.consolidate,
+    )
+    
+    # Create session retention service
+    retention = SessionRetention(
+        agent.sessions,
+        archive_after_days=config.sessions.archive_after_days,
+        delete_archived_after_days=config.sessions.delete_archived_after_days,
+        max_messages=config.sessions.max_messages,
+    )
+    
+    # Create event loop lag monitor
+    monitor = LoopMonitor(
+        stall_ms=config.tracing.loop_stall_ms,
+        status_path=_get_loop_status_path(),
+        enabled=config.tracing.loop_monitor,
+    )
+    
     # Create channel manager
     channels = ChannelManager(config, bus)
+    retention.media = channels.media
+    
+    # Stream replies as edited drafts on channels that support it
+    agent.draft_channels = set(channels.draft_channels)
     
     if channels.enabled_channels:
         console.print(f"[green]✓[/green] Channels enabled: {', '.join(channels.enabled_channels)}")
@@ -255,11 +308,16 @@ def gateway(
         console.print(f"[green]✓[/green] Cron: {cron_status['jobs']} scheduled jobs")
     
     console.print(f"[green]✓[/green] Heartbeat: every 30m")
+    if memory_config.consolidate:
+        console.print(f"[green]✓[/green] Memory consolidation: every {memory_config.interval_hours:g}h")
     
     async def run():
         try:
+            await monitor.start()
             await cron.start()
             await heartbeat.start()
+            await consolidator.start()
+            await retention.start()
             await asyncio.gather(
                 agent.run(),
                 channels.start_all(),
@@ -267,8 +325,11 @@ def gateway(
         except KeyboardInterrupt:
             console.print("\nShutting down...")
             heartbeat.stop()
+            consolidator.stop()
+            retention.stop()
             cron.stop()
-            agent.stop()
+            monitor.stop()
+            await agent.stop()
             await channels.stop_all()
     
     asyncio.run(run())
@@ -287,12 +348,15 @@ def agent(
     session_id: str = typer.Option("cli:default", "--session", "-s", help="Session ID"),
 ):
     """Interact with the agent directly."""
-    from nanobot.config.loader import load_config
+    from nanobot.agent.loop import AgentLoop
     from nanobot.bus.queue import MessageBus
+    from nanobot.config.loader import load_config
     from nanobot.providers.litellm_provider import LiteLLMProvider
-    from nanobot.agent.loop import AgentLoop
+    from nanobot.utils.aio import set_io_workers
     
     config = load_config()
+    _setup_tracing(config)
+    set_io_workers(config.agents.defaults.io_workers)
     
     api_key = config.get_api_key()
     api_base = config.get_api_base()
@@ -316,13 +380,21 @@ def agent(
         workspace=config.workspace_path,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        max_tokens=config.agents.defaults.max_tokens,
+        context_window=config.agents.defaults.context_window or None,
+        artifacts_config=config.tools.artifacts,
+        skills_top_k=config.agents.defaults.skills_top_k,
+        memory_max_chars=config.agents.defaults.memory_max_chars,
+        image_max_edge=config.agents.defaults.image_max_edge,
+        summary_model=config.agents.defaults.summary_model or None,
+        summarize_after_tokens=config.agents.defaults.summarize_after_tokens,
+        sessions_config=config.sessions,
     )
     
     if message:
         # Single message mode
         async def run_once():
-            response = await agent_loop.process_direct(message, session_id)
-            console.print(f"\n{__logo__} {response}")
+            await _ask_streaming(agent_loop, message, session_id)
         
         asyncio.run(run_once())
     else:
@@ -336,8 +408,8 @@ def agent(
                     if not user_input.strip():
                         continue
                     
-                    response = await agent_loop.process_direct(user_input, session_id)
-                    console.print(f"\n{__logo__} {response}\n")
+                    await _ask_streaming(agent_loop, user_input, session_id)
+                    console.print()
                 except KeyboardInterrupt:
                     console.print("\nGoodbye!")
                     break
@@ -345,6 +417,180 @@ def agent(
         asyncio.run(run_interactive())
 
 
+async def _ask_streaming(agent_loop: "AgentLoop", message: str, session_id: str) -> None:
+    """Send a message to the agent, printing the reply token by token as it arrives."""
+    streamed = False
+    
+    async def on_delta(delta: str) -> None:
+        nonlocal streamed
+        if not streamed:
+            console.print(f"\n{__logo__} ", end="")
+            streamed = True
+        console.print(delta, end="", markup=False, highlight=False, soft_wrap=True)
+    
+    response = await agent_loop.process_direct(message, session_id, on_delta=on_delta)
+    if streamed:
+        console.print()
+    else:
+        console.print(f"\n{__logo__} {response}")
+
+
+def _get_trace_path() -> Path:
+    """Get the path of the trace file."""
+    from nanobot.config.loader import get_data_dir
+    return get_data_dir() / "traces" / "traces.jsonl"
+
+
+def _get_loop_status_path() -> Path:
+    """Get the path of the event loop stats written by the gateway."""
+    from nanobot.config.loader import get_data_dir
+    return get_data_dir() / "traces" / "loop.json"
+
+
+def _setup_tracing(config: "Config") -> None:
+    """Enable writing per-turn traces to disk according to config."""
+    from nanobot.tracing import Tracer, set_tracer
+    
+    if config.tracing.enabled:
+        set_tracer(Tracer(
+            path=_get_trace_path(),
+            max_bytes=config.tracing.max_file_mb * 1024 * 1024,
+            backups=config.tracing.backups,
+        ))
+
+
+# ============================================================================
+# Trace Commands
+# ============================================================================
+
+
+@app.command()
+def trace(
+    limit: int = typer.Option(10, "--limit", "-n", help="Number of slowest turns to show"),
+    trace_id: str = typer.Option(None, "--id", help="Show the span tree of one trace"),
+    loop: bool = typer.Option(False, "--loop", help="Show the gateway's event loop lag and stalls"),
+):
+    """Show the slowest turns and where their time went."""
+    from rich.markup import escape
+
+    from nanobot.config.loader import load_config
+    from nanobot.tracing import report
+    
+    config = load_config()
+    if loop:
+        _print_loop_status(config, limit)
+        return
+    
+    traces = report.load_traces(_get_trace_path(), backups=config.tracing.backups)
+    
+    if not traces:
+        console.print("No traces recorded yet.")
+        if not config.tracing.enabled:
+            console.print("Tracing is disabled; set tracing.enabled in ~/.nanobot/config.json")
+        return
+    
+    if trace_id:
+        found = report.find(traces, trace_id)
+        if not found:
+            console.print(f"[red]Trace {trace_id} not found (or prefix is ambiguous)[/red]")
+            raise typer.Exit(1)
+        
+        console.print(f"[cyan]{found['trace_id']}[/cyan] {found['ts']}  {found['duration_ms']:.0f} ms")
+        for depth, span in report.span_tree(found):
+            attrs = " ".join(f"{k}={v}" for k, v in span.get("attrs", {}).items())
+            line = f"{'  ' * (depth + 1)}{span['name']:<20} {span['duration_ms']:>9.1f} ms  [dim]{escape(attrs)}[/dim]"
+            if span.get("error"):
+                line += f" [red]{escape(span['error'])}[/red]"
+            console.print(line)
+        return
+    
+    table = Table(title=f"Slowest Turns ({len(traces)} recorded)")
+    table.add_column("Trace", style="cyan")
+    table.add_column("Time")
+    table.add_column("Session")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Wait ms", justify="right")
+    table.add_column("LLM ms", justify="right")
+    table.add_column("Tools ms", justify="right")
+    table.add_column("Send ms", justify="right")
+    
+    for t in report.slowest(traces, limit):
+        phases = report.phase_totals(t)
+        table.add_row(
+            t["trace_id"],
+            t["ts"][5:19].replace("T", " "),
+            str(t.get("attrs", {}).get("session", "")),
+            f"{t['duration_ms']:.0f}",
+            f"{phases.get('bus.wait', 0):.0f}",
+            f"{phases.get('llm.chat', 0):.0f}",
+            f"{phases.get('tool.execute', 0):.0f}",
+            f"{phases.get('outbound.dispatch', 0):.0f}",
+        )
+    console.print(table)
+    
+    phases_table = Table(title="Per-Phase Latency")
+    phases_table.add_column("Phase")
+    phases_table.add_column("Count", justify="right")
+    phases_table.add_column("Total ms", justify="right")
+    phases_table.add_column("p50 ms", justify="right")
+    phases_table.add_column("p95 ms", justify="right")
+    phases_table.add_column("Max ms", justify="right")
+    
+    for stats in report.phase_breakdown(traces):
+        phases_table.add_row(
+            stats.name,
+            str(stats.count),
+            f"{stats.total_ms:.0f}",
+            f"{stats.p50_ms:.1f}",
+            f"{stats.p95_ms:.1f}",
+            f"{stats.max_ms:.1f}",
+        )
+    console.print(phases_table)
+    
+    cache = report.cache_summary(traces)
+    if cache["prompt_tokens"]:
+        hit_rate = cache["cache_read_tokens"] / cache["prompt_tokens"] * 100
+        console.print(
+            f"Prompt cache: {cache['cache_read_tokens']:,} of {cache['prompt_tokens']:,} prompt tokens "
+            f"read from cache ({hit_rate:.0f}%), {cache['cache_creation_tokens']:,} written"
+        )
+
+
+def _print_loop_status(config: "Config", limit: int) -> None:
+    """Print the event loop lag histogram and the most recent stalls."""
+    from rich.markup import escape
+
+    from nanobot.tracing.loopmon import load_status
+    
+    status = load_status(_get_loop_status_path())
+    if status is None:
+        console.print("No event loop stats recorded yet (they are written while the gateway runs).")
+        if not config.tracing.loop_monitor:
+            console.print("The monitor is disabled; set tracing.loopMonitor in ~/.nanobot/config.json")
+        return
+    
+    lag = status["lag"]
+    console.print(
+        f"Event loop lag ({lag['samples']:,} samples, updated {status['updated_at'].replace('T', ' ')}): "
+        f"mean {lag['mean_ms']:g} ms, p50 {lag['p50_ms']:g} ms, p99 {lag['p99_ms']:g} ms, max {lag['max_ms']:g} ms"
+    )
+    
+    table = Table(title="Lag Histogram")
+    table.add_column("Lag")
+    table.add_column("Samples", justify="right")
+    table.add_column("Share", justify="right")
+    for bucket, count in lag["buckets"].items():
+        if count:
+            table.add_row(bucket, f"{count:,}", f"{count / lag['samples'] * 100:.1f}%")
+    console.print(table)
+    
+    console.print(f"Stalls over {status['stall_ms']:g} ms: {status['stalls']}")
+    for stall in status["recent_stalls"][-limit:][::-1]:
+        where = f" in {escape(stall['task'])}" if stall.get("task") else ""
+        console.print(f"\n[yellow]{stall['ts'].replace('T', ' ')}[/yellow] blocked {stall['blocked_ms']:.0f} ms{where}")
+        console.print(f"[dim]{escape(stall['stack'].rstrip())}[/dim]")
+
+
 # ============================================================================
 # Channel Commands
 # ============================================================================
@@ -626,6 +872,268 @@ def cron_run(
         console.print(f"[red]Failed to run job {job_id}[/red]")
 
 
+# ============================================================================
+# Session Commands
+# ============================================================================
+
+
+sessions_app = typer.Typer(help="Manage conversation sessions")
+app.add_typer(sessions_app, name="sessions")
+
+
+@sessions_app.command("list")
+def sessions_list(
+    limit: int = typer.Option(20, "--limit", "-n", help="Number of sessions to show"),
+):
+    """List sessions, most recently active first."""
+    from nanobot.config.loader import load_config
+    from nanobot.session.manager import create_store
+    
+    config = load_config()
+    store = create_store(config.sessions.backend)
+    sessions = store.list_sessions()
+    store.close()
+    
+    if not sessions:
+        console.print("No sessions.")
+        return
+    
+    table = Table(title=f"Sessions ({config.sessions.backend})")
+    table.add_column("Key", style="cyan")
+    table.add_column("Messages", justify="right")
+    table.add_column("Updated")
+    table.add_column("Created")
+    
+    for info in sessions[:limit]:
+        count = info.get("messages")
+        table.add_row(
+            info["key"],
+            str(count) if count is not None else "?",
+            (info.get("updated_at") or "")[:16].replace("T", " "),
+            (info.get("created_at") or "")[:16].replace("T", " "),
+        )
+    
+    console.print(table)
+    if len(sessions) > limit:
+        console.print(f"[dim]{len(sessions) - limit} more not shown[/dim]")
+
+
+@sessions_app.command("search")
+def sessions_search(
+    query: str = typer.Argument(..., help="Keywords to look for"),
+    limit: int = typer.Option(10, "--limit", "-n", help="Maximum results"),
+    session: str = typer.Option(None, "--session", "-s", help="Only search this session key"),
+):
+    """Search the messages of all sessions."""
+    from rich.markup import escape
+
+    from nanobot.config.loader import load_config
+    from nanobot.session.manager import create_index, create_store
+    
+    config = load_config()
+    store, index = create_store(config.sessions.backend), create_index()
+    try:
+        # Index whatever was stored without the index (e.g. while search was disabled)
+        indexed = index.sync(store)
+        hits = index.search(query, limit, session_key=session)
+    finally:
+        store.close()
+        index.close()
+    
+    if indexed:
+        console.print(f"[dim]Indexed {indexed} new messages[/dim]")
+    if not hits:
+        console.print(f"No messages match '{escape(query)}'.")
+        return
+    
+    for hit in hits:
+        when = (hit.timestamp or "")[:16].replace("T", " ")
+        console.print(f"[cyan]{escape(hit.session_key)}[/cyan] #{hit.seq} {hit.role} [dim]{when}[/dim]")
+        console.print(f"  {escape(hit.snippet)}\n")
+
+
+@sessions_app.command("prune")
+def sessions_prune(
+    days: float = typer.Option(None, "--days", "-d", help="Archive sessions idle this many days (default from config)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only show what would be archived"),
+):
+    """Move idle sessions to the compressed archive and delete expired archives."""
+    from nanobot.config.loader import load_config
+    from nanobot.session.manager import SessionManager, create_archive, create_index
+    
+    config = load_config()
+    days = days if days is not None else config.sessions.archive_after_days
+    if not days:
+        console.print("[yellow]Archiving is disabled (sessions.archiveAfterDays is 0); pass --days[/yellow]")
+        raise typer.Exit(1)
+    
+    manager = SessionManager(
+        config.workspace_path,
+        backend=config.sessions.backend,
+        index=create_index() if config.sessions.search else None,
+        archive=create_archive(),
+    )
+    try:
+        archived = manager.archive_idle(days, dry_run=dry_run)
+        purged = 0
+        if not dry_run and config.sessions.delete_archived_after_days:
+            purged = manager.archive.purge(config.sessions.delete_archived_after_days)
+    finally:
+        manager.store.close()
+    
+    for key in archived:
+        console.print(f"  {key}")
+    verb = "Would archive" if dry_run else "Archived"
+    console.print(f"[green]✓[/green] {verb} {len(archived)} sessions idle for {days:g}+ days"
+                  + (f", deleted {purged} expired archives" if purged else ""))
+
+
+@sessions_app.command("compact")
+def sessions_compact(
+    max_messages: int = typer.Option(None, "--max-messages", "-m", help="Cap history per session (default from config)"),
+):
+    """Move history past the message cap to the archive and reclaim space."""
+    from nanobot.config.loader import load_config
+    from nanobot.session.manager import SessionManager, create_archive, create_index
+    
+    config = load_config()
+    max_messages = max_messages if max_messages is not None else config.sessions.max_messages
+    manager = SessionManager(
+        config.workspace_path,
+        backend=config.sessions.backend,
+        index=create_index() if config.sessions.search else None,
+        archive=create_archive(),
+    )
+    try:
+        before = manager.store.disk_usage()
+        moved = manager.trim_history(max_messages) if max_messages else 0
+        manager.store.compact_all()
+        after = manager.store.disk_usage()
+    finally:
+        manager.store.close()
+    
+    if max_messages:
+        console.print(f"[green]✓[/green] Archived {moved} messages beyond {max_messages} per session")
+    console.print(f"[green]✓[/green] Sessions take {_format_bytes(after)} (was {_format_bytes(before)})")
+
+
+@sessions_app.command("stats")
+def sessions_stats():
+    """Show disk usage of sessions, the archive, the search index and media."""
+    from nanobot.config.loader import load_config
+    from nanobot.session.manager import create_archive, create_store
+    from nanobot.utils.helpers import get_data_path
+    
+    config = load_config()
+    store = create_store(config.sessions.backend)
+    try:
+        sessions = store.list_sessions()
+        hot = store.disk_usage()
+    finally:
+        store.close()
+    archive = create_archive().stats()
+    data = get_data_path()
+    index = sum(p.stat().st_size for p in data.glob("session_index.db*"))
+    media = sum(p.stat().st_size for p in (data / "media").rglob("*") if p.is_file())
+    
+    table = Table(title="Session storage")
+    table.add_column("Tier", style="cyan")
+    table.add_column("Sessions", justify="right")
+    table.add_column("Messages", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_row(
+        f"Active ({config.sessions.backend})", str(len(sessions)),
+        str(sum(s.get("messages") or 0 for s in sessions)), _format_bytes(hot),
+    )
+    table.add_row("Archived", str(archive["sessions"]), "", _format_bytes(archive["bytes"]))
+    table.add_row("Trimmed history", "", "", _format_bytes(archive["trimmed_bytes"]))
+    table.add_row("Search index", "", "", _format_bytes(index))
+    table.add_row("Media", "", "", _format_bytes(media))
+    console.print(table)
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+@sessions_app.command("migrate")
+def sessions_migrate(
+    source: str = typer.Option("jsonl", "--from", help="Backend to read from"),
+    target: str = typer.Option("sqlite", "--to", help="Backend to write to"),
+    overwrite: bool = typer.Option(False, "--overwrite", help="Replace sessions that already exist"),
+):
+    """Copy all sessions from one storage backend to another."""
+    from nanobot.config.loader import load_config
+    from nanobot.session.manager import BACKENDS, create_store, migrate_sessions
+    
+    if source == target or source not in BACKENDS or target not in BACKENDS:
+        console.print(f"[red]Choose two different backends from: {', '.join(BACKENDS)}[/red]")
+        raise typer.Exit(1)
+    
+    src, dst = create_store(source), create_store(target)
+    try:
+        copied, skipped = migrate_sessions(src, dst, overwrite=overwrite)
+    finally:
+        src.close()
+        dst.close()
+    
+    console.print(f"[green]✓[/green] Copied {copied} sessions from {source} to {target}"
+                  + (f" ({skipped} already there)" if skipped else ""))
+    if load_config().sessions.backend != target:
+        console.print(f"Set sessions.backend to \"{target}\" in your config to use them.")
+
+
+# ============================================================================
+# Media Commands
+# ============================================================================
+
+
+media_app = typer.Typer(help="Manage received media files")
+app.add_typer(media_app, name="media")
+
+
+@media_app.command("stats")
+def media_stats():
+    """Show how many media files are stored and their size."""
+    from nanobot.config.loader import load_config
+    from nanobot.media import create_media_store
+    
+    config = load_config()
+    store = create_media_store(config.media)
+    stats = store.stats()
+    
+    console.print(f"Media store: {store.root}")
+    console.print(f"Files: {stats['files']} ({stats['referenced']} referenced by sessions)")
+    console.print(f"Size: {_format_bytes(stats['bytes'])} of {_format_bytes(stats['max_total_bytes'])}")
+    console.print(f"Unreferenced files are deleted after {config.media.ttl_days:g} days")
+
+
+@media_app.command("gc")
+def media_gc(
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only show what would be deleted"),
+):
+    """Delete media no longer referenced by a session, and fit the store to its size limit."""
+    from nanobot.config.loader import load_config
+    from nanobot.media import create_media_store
+    from nanobot.session.manager import create_store
+    
+    config = load_config()
+    sessions = create_store(config.sessions.backend)
+    try:
+        live = [info["key"] for info in sessions.list_sessions()]
+    finally:
+        sessions.close()
+    
+    result = create_media_store(config.media).gc(live, dry_run=dry_run)
+    verb = "Would delete" if dry_run else "Deleted"
+    console.print(f"[green]✓[/green] {verb} {result['deleted']} files ({_format_bytes(result['freed_bytes'])})")
+    console.print(f"{result['files']} files ({_format_bytes(result['bytes'])}) kept")
+
+
 # ============================================================================
 # Status Commands
 # ============================================================================
@@ -634,7 +1142,7 @@ def cron_run(
 @app.command()
 def status():
     """Show nanobot status."""
-    from nanobot.config.loader import load_config, get_config_path
+    from nanobot.config.loader import get_config_path, load_config
 
     config_path = get_config_path()
     config = load_config()
@@ -672,8 +1180,12 @@ def webui(
     Start the web UI server
     """
     import asyncio
+
+    from nanobot.config.loader import load_config
     from nanobot.web.server import run_web_ui
 
+    _setup_tracing(load_config())
+
     typer.echo(f"🌐 Starting web UI at http://{host}:{port}")
     typer.echo("Press Ctrl+C to stop")
 
@@ -18,6 +18,7 @@ class TelegramConfig(BaseModel):
     token: str = ""  # Bot token from @BotFather
     allow_from: list[str] = Field(default_factory=list)  # Allowed user IDs or usernames
     proxy: str | None = None  # HTTP/SOCKS5 proxy URL, e.g. "http://127.0.0.1:7890" or "socks5://127.0.0.1:1080"
+    stream_replies: bool = True  # Post a draft and edit it in place while the reply is generated
 
 
 class FeishuConfig(BaseModel):
@@ -37,6 +38,7 @@ class DiscordConfig(BaseModel):
     allow_from: list[str] = Field(default_factory=list)  # Allowed user IDs
     gateway_url: str = "wss://gateway.discord.gg/?v=10&encoding=json"
     intents: int = 37377  # GUILDS + GUILD_MESSAGES + DIRECT_MESSAGES + MESSAGE_CONTENT
+    stream_replies: bool = True  # Post a draft and edit it in place while the reply is generated
 
 
 class ChannelsConfig(BaseModel):
@@ -51,9 +53,17 @@ class AgentDefaults(BaseModel):
     """Default agent configuration."""
     workspace: str = "~/.nanobot/workspace"
     model: str = "anthropic/claude-opus-4-5"
-    max_tokens: int = 8192
+    max_tokens: int = 8192  # Reply budget, reserved out of the context window
+    context_window: int = 0  # Model input token limit (0 = look it up by model name)
     temperature: float = 0.7
     max_tool_iterations: int = 20
+    max_concurrent_turns: int = 4  # Turns of different sessions processed in parallel
+    io_workers: int = 8  # Threads doing file access (sessions, memory, skills, tools) off the event loop
+    skills_top_k: int = 8  # With more skills installed, list only this many relevant ones per message (0 = all)
+    memory_max_chars: int = 6000  # Memory shown in the system prompt; the rest is searchable (0 = no limit)
+    image_max_edge: int = 0  # Downscale attached images to this longest edge in px (0 = what the model uses)
+    summary_model: str = ""  # Cheaper model for condensing old history (empty = same model)
+    summarize_after_tokens: int = 0  # Unsummarized history that triggers condensing (0 = half the prompt budget)
 
 
 class AgentsConfig(BaseModel):
@@ -103,10 +113,58 @@ class ExecToolConfig(BaseModel):
     restrict_to_workspace: bool = False  # If true, block commands accessing paths outside workspace
 
 
+class ArtifactsConfig(BaseModel):
+    """Storage of oversized tool outputs."""
+    enabled: bool = True
+    spill_chars: int = 8000  # Tool results longer than this are stored in ~/.nanobot/artifacts
+    preview_chars: int = 2000  # How much of a stored result stays in context
+    max_age_days: float = 7  # Unused artifacts are deleted after this long
+
+
 class ToolsConfig(BaseModel):
     """Tools configuration."""
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
+    artifacts: ArtifactsConfig = Field(default_factory=ArtifactsConfig)
+
+
+class TracingConfig(BaseModel):
+    """Per-turn tracing configuration."""
+    enabled: bool = True  # Write span trees to ~/.nanobot/traces/traces.jsonl
+    max_file_mb: int = 10  # Rotate the trace file at this size
+    backups: int = 3  # Rotated trace files to keep
+    loop_monitor: bool = True  # Sample event loop lag in the gateway and web UI (`nanobot trace --loop`)
+    loop_stall_ms: int = 250  # Log the stack of whatever blocks the event loop for this long
+
+
+class SessionsConfig(BaseModel):
+    """Conversation session storage."""
+    backend: str = "jsonl"  # "jsonl" (~/.nanobot/sessions/*.jsonl) or "sqlite" (~/.nanobot/sessions.db)
+    cache_entries: int = 256  # Sessions kept in memory
+    cache_mb: int = 64  # Estimated memory budget of the cached sessions
+    idle_minutes: float = 60  # Unused sessions are flushed and evicted after this long (0 = never)
+    search: bool = True  # Keep a full-text index of messages (session_search tool, `nanobot sessions search`)
+    archive_after_days: float = 30  # Move sessions idle this long to the compressed archive (0 = never)
+    delete_archived_after_days: float = 0  # Delete archived sessions after this long (0 = keep forever)
+    max_messages: int = 0  # Move older messages of longer sessions to the archive (0 = no cap)
+
+
+class MemoryConfig(BaseModel):
+    """Background consolidation of memory files."""
+    consolidate: bool = True  # Fold old daily notes into digests and MEMORY.md (gateway only)
+    interval_hours: float = 6
+    keep_days: int = 7  # Daily notes stay untouched for this long
+    monthly_after_days: int = 60  # Weekly digests older than this are merged per month
+    max_long_term_chars: int = 4000  # Size budget for MEMORY.md
+    model: str = ""  # Model for summaries (empty = agents.defaults.model)
+
+
+class MediaConfig(BaseModel):
+    """Storage of media received on channels (~/.nanobot/media)."""
+    max_file_mb: int = 20  # Larger attachments are not downloaded
+    max_total_mb: int = 1024  # Least recently used media is deleted beyond this
+    ttl_days: float = 30  # Delete media unused this long that no session refers to (0 = keep)
+    max_concurrent_downloads: int = 4  # Attachments downloaded at the same time, across channels
 
 
 class Config(BaseSettings):
@@ -116,6 +174,10 @@ class Config(BaseSettings):
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
+    memory: MemoryConfig = Field(default_factory=MemoryConfig)
+    sessions: SessionsConfig = Field(default_factory=SessionsConfig)
+    media: MediaConfig = Field(default_factory=MediaConfig)
     
     @property
     def workspace_path(self) -> Path:
@@ -10,6 +10,10 @@ from typing import Any, Callable, Coroutine
 from loguru import logger
 
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from nanobot.utils.aio import run_io, running_loop
+from nanobot.utils.filecache import fingerprint
+from nanobot.utils.filelock import lock_for
+from nanobot.utils.helpers import atomic_write
 
 
 def _now_ms() -> int:
@@ -40,23 +44,36 @@ def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
 
 
 class CronService:
-    """Service for managing and executing scheduled jobs."""
+    """
+    Service for managing and executing scheduled jobs.
+    
+    The job store may be shared with other processes (e.g. `nanobot cron add`
+    while the gateway runs). Every change is made under a file lock on the
+    latest version of the store, which is re-read only when its file changed.
+    """
     
     def __init__(
         self,
         store_path: Path,
-        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None
+        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None,
+        poll_interval_s: float = 30.0,
     ):
         self.store_path = store_path
         self.on_job = on_job  # Callback to execute job, returns response text
+        self.poll_interval_s = poll_interval_s  # Longest wait before noticing jobs added elsewhere
         self._store: CronStore | None = None
+        self._fingerprint: Any = None  # Fingerprint of the store file self._store was read from
+        self._lock = lock_for(store_path.with_suffix(".lock"))
         self._timer_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None  # Loop the timer runs on
         self._running = False
     
     def _load_store(self) -> CronStore:
-        """Load jobs from disk."""
-        if self._store:
+        """Load jobs from disk, re-reading the file only if it changed since."""
+        stamp = fingerprint(self.store_path)
+        if self._store is not None and stamp == self._fingerprint:
             return self._store
+        self._fingerprint = stamp
         
         if self.store_path.exists():
             try:
@@ -101,7 +118,7 @@ class CronService:
         return self._store
     
     def _save_store(self) -> None:
-        """Save jobs to disk."""
+        """Save jobs to disk (callers hold the store lock)."""
         if not self._store:
             return
         
@@ -142,17 +159,23 @@ class CronService:
             ]
         }
         
-        self.store_path.write_text(json.dumps(data, indent=2))
+        atomic_write(self.store_path, json.dumps(data, indent=2))
+        self._fingerprint = fingerprint(self.store_path)
     
     async def start(self) -> None:
         """Start the cron service."""
         self._running = True
-        self._load_store()
-        self._recompute_next_runs()
-        self._save_store()
+        self._loop = asyncio.get_running_loop()
+        await run_io(self._prepare_store)
         self._arm_timer()
         logger.info(f"Cron service started with {len(self._store.jobs if self._store else [])} jobs")
     
+    def _prepare_store(self) -> None:
+        with self._lock:
+            self._load_store()
+            self._recompute_next_runs()
+            self._save_store()
+    
     def stop(self) -> None:
         """Stop the cron service."""
         self._running = False
@@ -179,15 +202,22 @@ class CronService:
     
     def _arm_timer(self) -> None:
         """Schedule the next timer tick."""
+        if self._loop is not None and running_loop() is not self._loop:
+            # Jobs changed from an I/O thread (e.g. the cron tool): re-arm on the service's loop
+            self._loop.call_soon_threadsafe(self._arm_timer)
+            return
+        
         if self._timer_task:
             self._timer_task.cancel()
         
-        next_wake = self._get_next_wake_ms()
-        if not next_wake or not self._running:
+        if not self._running:
             return
         
-        delay_ms = max(0, next_wake - _now_ms())
-        delay_s = delay_ms / 1000
+        # Wake up at least every poll interval to pick up jobs added by other processes
+        next_wake = self._get_next_wake_ms()
+        delay_s = self.poll_interval_s
+        if next_wake:
+            delay_s = min(delay_s, max(0, next_wake - _now_ms()) / 1000)
         
         async def tick():
             await asyncio.sleep(delay_s)
@@ -198,21 +228,30 @@ class CronService:
     
     async def _on_timer(self) -> None:
         """Handle timer tick - run due jobs."""
-        if not self._store:
-            return
-        
-        now = _now_ms()
-        due_jobs = [
-            j for j in self._store.jobs
-            if j.enabled and j.state.next_run_at_ms and now >= j.state.next_run_at_ms
-        ]
+        due_jobs = await run_io(self._claim_due_jobs)
         
         for job in due_jobs:
             await self._execute_job(job)
         
-        self._save_store()
+        if due_jobs:
+            await run_io(self._record_runs, due_jobs)
         self._arm_timer()
     
+    def _claim_due_jobs(self) -> list[CronJob]:
+        """Get the jobs that are due, claiming them so that another process sharing the store does not run them too."""
+        with self._lock:
+            store = self._load_store()
+            now = _now_ms()
+            due_jobs = [
+                j for j in store.jobs
+                if j.enabled and j.state.next_run_at_ms and now >= j.state.next_run_at_ms
+            ]
+            for job in due_jobs:
+                job.state.next_run_at_ms = None
+            if due_jobs:
+                self._save_store()
+        return due_jobs
+    
     async def _execute_job(self, job: CronJob) -> None:
         """Execute a single job."""
         start_ms = _now_ms()
@@ -237,15 +276,33 @@ class CronService:
         
         # Handle one-shot jobs
         if job.schedule.kind == "at":
-            if job.delete_after_run:
-                self._store.jobs = [j for j in self._store.jobs if j.id != job.id]
-            else:
-                job.enabled = False
-                job.state.next_run_at_ms = None
+            job.enabled = False
+            job.state.next_run_at_ms = None
         else:
             # Compute next run
             job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
     
+    def _record_runs(self, jobs: list[CronJob]) -> None:
+        """Write the outcome of finished runs into the latest version of the store."""
+        with self._lock:
+            store = self._load_store()
+            ran = {j.id: j for j in jobs}
+            kept = []
+            for job in store.jobs:
+                done = ran.get(job.id)
+                if done is not None and job is not done:
+                    # Keep changes made meanwhile (e.g. disabled from the CLI)
+                    job.state = done.state
+                    job.updated_at_ms = done.updated_at_ms
+                    job.enabled = job.enabled and done.enabled
+                    if not job.enabled:
+                        job.state.next_run_at_ms = None
+                if done is not None and done.schedule.kind == "at" and done.delete_after_run:
+                    continue
+                kept.append(job)
+            store.jobs = kept
+            self._save_store()
+    
     # ========== Public API ==========
     
     def list_jobs(self, include_disabled: bool = False) -> list[CronJob]:
@@ -265,7 +322,6 @@ class CronService:
         delete_after_run: bool = False,
     ) -> CronJob:
         """Add a new job."""
-        store = self._load_store()
         now = _now_ms()
         
         job = CronJob(
@@ -286,8 +342,9 @@ class CronService:
             delete_after_run=delete_after_run,
         )
         
-        store.jobs.append(job)
-        self._save_store()
+        with self._lock:
+            self._load_store().jobs.append(job)
+            self._save_store()
         self._arm_timer()
         
         logger.info(f"Cron: added job '{name}' ({job.id})")
@@ -295,13 +352,15 @@ class CronService:
     
     def remove_job(self, job_id: str) -> bool:
         """Remove a job by ID."""
-        store = self._load_store()
-        before = len(store.jobs)
-        store.jobs = [j for j in store.jobs if j.id != job_id]
-        removed = len(store.jobs) < before
+        with self._lock:
+            store = self._load_store()
+            before = len(store.jobs)
+            store.jobs = [j for j in store.jobs if j.id != job_id]
+            removed = len(store.jobs) < before
+            if removed:
+                self._save_store()
         
         if removed:
-            self._save_store()
             self._arm_timer()
             logger.info(f"Cron: removed job {job_id}")
         
@@ -309,32 +368,33 @@ class CronService:
     
     def enable_job(self, job_id: str, enabled: bool = True) -> CronJob | None:
         """Enable or disable a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                job.enabled = enabled
-                job.updated_at_ms = _now_ms()
-                if enabled:
-                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
-                else:
-                    job.state.next_run_at_ms = None
-                self._save_store()
-                self._arm_timer()
-                return job
-        return None
+        with self._lock:
+            job = next((j for j in self._load_store().jobs if j.id == job_id), None)
+            if job is None:
+                return None
+            job.enabled = enabled
+            job.updated_at_ms = _now_ms()
+            if enabled:
+                job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            else:
+                job.state.next_run_at_ms = None
+            self._save_store()
+        self._arm_timer()
+        return job
     
     async def run_job(self, job_id: str, force: bool = False) -> bool:
         """Manually run a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                if not force and not job.enabled:
-                    return False
-                await self._execute_job(job)
-                self._save_store()
-                self._arm_timer()
-                return True
-        return False
+        job = await run_io(self._find_job, job_id)
+        if job is None or (not force and not job.enabled):
+            return False
+        await self._execute_job(job)
+        await run_io(self._record_runs, [job])
+        self._arm_timer()
+        return True
+    
+    def _find_job(self, job_id: str) -> CronJob | None:
+        with self._lock:
+            return next((j for j in self._load_store().jobs if j.id == job_id), None)
     
     def status(self) -> dict:
         """Get service status."""
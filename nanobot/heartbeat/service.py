@@ -6,6 +6,8 @@ from typing import Any, Callable, Coroutine
 
 from loguru import logger
 
+from nanobot.utils.aio import run_io
+
 # Default interval: 30 minutes
 DEFAULT_HEARTBEAT_INTERVAL_S = 30 * 60
 
@@ -101,7 +103,7 @@ class HeartbeatService:
     
     async def _tick(self) -> None:
         """Execute a single heartbeat tick."""
-        content = self._read_heartbeat_file()
+        content = await run_io(self._read_heartbeat_file)
         
         # Skip if HEARTBEAT.md is empty or doesn't exist
         if _is_heartbeat_empty(content):
@@ -0,0 +1,6 @@
+"""Media handling: storage of received media and preprocessing for the LLM."""
+
+from nanobot.media.images import ImageProcessor, max_image_edge
+from nanobot.media.store import MediaStore, MediaTooLargeError, create_media_store
+
+__all__ = ["ImageProcessor", "MediaStore", "MediaTooLargeError", "create_media_store", "max_image_edge"]
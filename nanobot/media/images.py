@@ -0,0 +1,178 @@
+"""Image preprocessing for vision models."""
+
+import base64
+import hashlib
+import io
+import mimetypes
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.utils.filecache import Fingerprint, fingerprint
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:  # Without Pillow images are sent as they are
+    Image = None
+    ImageOps = None
+    PIL_AVAILABLE = False
+
+DEFAULT_MAX_EDGE = 1568
+
+# Longest image edge (px) a model family makes use of; providers downscale anything larger
+_MODEL_MAX_EDGE = (
+    ("claude", 1568),
+    ("anthropic", 1568),
+    ("gemini", 3072),
+    ("gpt-4o", 2048),
+    ("gpt-4.1", 2048),
+    ("gpt-5", 2048),
+    ("o1", 2048),
+    ("o3", 2048),
+    ("o4", 2048),
+)
+
+
+def max_image_edge(model: str) -> int:
+    """Get the longest image edge worth sending to a model."""
+    name = model.lower().rsplit("/", 1)[-1]
+    for prefix, edge in _MODEL_MAX_EDGE:
+        if name.startswith(prefix):
+            return edge
+    return DEFAULT_MAX_EDGE
+
+
+class ImageProcessor:
+    """
+    Turns image files into data URLs for vision models.
+    
+    With Pillow installed, images are downscaled to max_edge, rotated
+    according to their EXIF orientation and re-encoded without metadata
+    (JPEG, or WebP when they have transparency). Without it, files are
+    sent as they are.
+    
+    Data URLs are cached by content hash (LRU, bounded by entries and bytes),
+    so the iterations of a turn and later retries reuse the encoding. A
+    file whose (mtime, size) is unchanged is not even read again.
+    """
+    
+    def __init__(
+        self,
+        max_edge: int = DEFAULT_MAX_EDGE,
+        quality: int = 85,
+        cache_entries: int = 64,
+        cache_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.max_edge = max_edge
+        self.quality = quality
+        self.cache_entries = cache_entries
+        self.cache_bytes = cache_bytes
+        self._urls: OrderedDict[str, str] = OrderedDict()  # content hash -> data URL
+        self._url_bytes = 0
+        self._digests: OrderedDict[str, tuple[Fingerprint, str]] = OrderedDict()  # path -> (fingerprint, content hash)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def data_url(self, path: str | Path) -> str | None:
+        """
+        Get the data URL of an image file.
+        
+        Returns:
+            The data URL, or None if the file is missing or not an image.
+        """
+        p = Path(path)
+        mime, _ = mimetypes.guess_type(str(p))
+        if not mime or not mime.startswith("image/"):
+            return None
+        stamp = fingerprint(p)
+        if stamp is None:
+            return None
+        
+        key = str(p)
+        with self._lock:
+            known = self._digests.get(key)
+            if known is not None and known[0] == stamp and known[1] in self._urls:
+                self._urls.move_to_end(known[1])
+                self.hits += 1
+                return self._urls[known[1]]
+        
+        try:
+            data = p.read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        
+        with self._lock:
+            self._remember_digest(key, stamp, digest)
+            url = self._urls.get(digest)
+            if url is not None:
+                self._urls.move_to_end(digest)
+                self.hits += 1
+                return url
+            self.misses += 1
+        
+        url = self._encode(data, mime, p.name)
+        with self._lock:
+            self._store(digest, url)
+        return url
+    
+    def _encode(self, data: bytes, mime: str, name: str) -> str:
+        """Downscale and re-encode an image, falling back to the original bytes."""
+        if PIL_AVAILABLE:
+            try:
+                data, mime = self._preprocess(data, name)
+            except Exception as e:
+                logger.debug(f"Sending image {name} unprocessed: {e}")
+        return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+    
+    def _preprocess(self, data: bytes, name: str) -> tuple[bytes, str]:
+        with Image.open(io.BytesIO(data)) as img:
+            img = ImageOps.exif_transpose(img)  # Keep the orientation once EXIF is dropped
+            size = img.size
+            if max(size) > self.max_edge:
+                img.thumbnail((self.max_edge, self.max_edge), Image.Resampling.LANCZOS)
+            
+            out = io.BytesIO()
+            if img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info):
+                img.convert("RGBA").save(out, format="WEBP", quality=self.quality, method=4)
+                mime = "image/webp"
+            else:
+                img.convert("RGB").save(out, format="JPEG", quality=self.quality, optimize=True)
+                mime = "image/jpeg"
+        
+        encoded = out.getvalue()
+        logger.debug(
+            f"Image {name}: {len(data) / 1024:.0f} KB {size[0]}x{size[1]} -> "
+            f"{len(encoded) / 1024:.0f} KB {img.size[0]}x{img.size[1]}"
+        )
+        return encoded, mime
+    
+    def _remember_digest(self, key: str, stamp: Fingerprint, digest: str) -> None:
+        self._digests[key] = (stamp, digest)
+        self._digests.move_to_end(key)
+        while len(self._digests) > self.cache_entries * 4:
+            self._digests.popitem(last=False)
+    
+    def _store(self, digest: str, url: str) -> None:
+        if digest in self._urls:
+            return
+        self._urls[digest] = url
+        self._url_bytes += len(url)
+        while self._urls and (len(self._urls) > self.cache_entries or self._url_bytes > self.cache_bytes):
+            _, evicted = self._urls.popitem(last=False)
+            self._url_bytes -= len(evicted)
+    
+    def stats(self) -> dict[str, Any]:
+        """Get cache hits, misses and memory use."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._urls),
+                "bytes": self._url_bytes,
+            }
@@ -0,0 +1,166 @@
+"""Download of media attached to inbound messages."""
+
+import asyncio
+from contextlib import aclosing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage
+from nanobot.media.store import MediaStore, MediaTooLargeError
+from nanobot.utils.aio import run_io
+
+
+@dataclass
+class MediaSource:
+    """An attachment of an inbound message, not downloaded yet."""
+    kind: str  # image, voice, audio, file, attachment
+    name: str  # Name shown in placeholders
+    ext: str  # File extension (e.g. ".jpg")
+    fetch: Callable[[], AsyncIterator[bytes]]  # Streams the content in chunks
+    size: int = 0  # Size announced by the platform (0 = unknown)
+    transcribe: bool = False  # Add a transcription of the audio to the message
+
+
+class MediaIngestor:
+    """
+    Downloads the media of inbound messages without holding up the channels.
+    
+    Channels hand over each message with its attachments and return at once.
+    Attachments are downloaded in the background (at most max_concurrent at
+    a time) into the media store, and voice messages are transcribed; the
+    message is then published with the stored paths added. Attachments
+    announced as larger than the store's per-file limit are not downloaded,
+    and a download is cut off as soon as it passes the limit; either way the
+    message carries a placeholder instead.
+    
+    Messages of one chat are published in the order they arrived, so a text
+    sent after a photo does not overtake it.
+    """
+    
+    def __init__(
+        self,
+        store: MediaStore,
+        max_concurrent: int = 4,
+        transcriber: Callable[[Path], Awaitable[str]] | None = None,
+    ):
+        self.store = store
+        self.max_concurrent = max_concurrent
+        self.transcriber = transcriber
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._tails: dict[str, asyncio.Task] = {}  # Session key -> task publishing its latest message
+        self._tasks: set[asyncio.Task] = set()
+    
+    async def submit(
+        self,
+        msg: InboundMessage,
+        sources: list[MediaSource],
+        publish: Callable[[InboundMessage], Awaitable[None]],
+    ) -> None:
+        """
+        Publish a message once its media is stored.
+        
+        Messages without media to download are published right away, unless
+        an earlier message of the same chat is still waiting for its media.
+        
+        Args:
+            msg: The message; its content and media are completed in place.
+            sources: Attachments to download.
+            publish: Called with the completed message.
+        """
+        key = msg.session_key
+        previous = self._tails.get(key)
+        if previous is None and all(self._too_large(source) for source in sources):
+            _complete(msg, [_placeholder(source, "too large") for source in sources], [])
+            await publish(msg)
+            return
+        
+        task = asyncio.create_task(self._process(msg, sources, publish, previous))
+        self._tails[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda t: self._done(key, t))
+    
+    async def close(self) -> None:
+        """Cancel the messages still waiting for their media."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _process(
+        self,
+        msg: InboundMessage,
+        sources: list[MediaSource],
+        publish: Callable[[InboundMessage], Awaitable[None]],
+        previous: asyncio.Task | None,
+    ) -> None:
+        results = await asyncio.gather(*(self._ingest(source, msg.session_key) for source in sources))
+        if previous is not None:
+            await asyncio.wait([previous])
+        
+        paths = [str(path) for path, _ in results if path is not None]
+        _complete(msg, [line for _, lines in results for line in lines], paths)
+        try:
+            await publish(msg)
+        except Exception as e:
+            logger.error(f"Failed to publish message from {msg.session_key}: {e}")
+    
+    async def _ingest(self, source: MediaSource, ref: str) -> tuple[Path | None, list[str]]:
+        """Download, store and transcribe one attachment."""
+        if self._too_large(source):
+            return None, [_placeholder(source, "too large")]
+        
+        async with self._semaphore:
+            try:
+                data = await self._download(source)
+                path = await run_io(self.store.put, data, source.ext, ref=ref)
+            except MediaTooLargeError as e:
+                logger.warning(f"Not storing {source.kind} {source.name}: {e}")
+                return None, [_placeholder(source, "too large")]
+            except Exception as e:
+                logger.warning(f"Failed to download {source.kind} {source.name}: {e}")
+                return None, [_placeholder(source, "download failed")]
+        logger.debug(f"Downloaded {source.kind} to {path}")
+        
+        if source.transcribe and self.transcriber:
+            try:
+                text = await self.transcriber(path)
+            except Exception as e:
+                logger.warning(f"Failed to transcribe {path}: {e}")
+                text = ""
+            if text:
+                logger.info(f"Transcribed {source.kind}: {text[:50]}...")
+                return path, [f"[transcription: {text}]"]
+        return path, [f"[{source.kind}: {path}]"]
+    
+    def _too_large(self, source: MediaSource) -> bool:
+        """Check the size the platform announced, so huge files are not even requested."""
+        return source.size > self.store.max_file_bytes
+    
+    async def _download(self, source: MediaSource) -> bytes:
+        """Read a stream, giving up once it passes the store's per-file limit."""
+        limit = self.store.max_file_bytes
+        data = bytearray()
+        async with aclosing(source.fetch()) as chunks:
+            async for chunk in chunks:
+                data += chunk
+                if len(data) > limit:
+                    raise MediaTooLargeError(f"more than {limit} bytes")
+        return bytes(data)
+    
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if self._tails.get(key) is task:
+            del self._tails[key]
+
+
+def _placeholder(source: MediaSource, problem: str) -> str:
+    return f"[{source.kind}: {source.name} - {problem}]"
+
+
+def _complete(msg: InboundMessage, lines: list[str], paths: list[str]) -> None:
+    """Add placeholders and stored paths of the media to a message."""
+    msg.content = "\n".join(part for part in [msg.content, *lines] if part) or "[empty message]"
+    msg.media = [*msg.media, *paths]
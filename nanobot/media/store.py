@@ -0,0 +1,239 @@
+"""Content-addressed storage of media received on channels."""
+
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+from loguru import logger
+
+from nanobot.utils.filecache import fingerprint
+from nanobot.utils.filelock import lock_for
+from nanobot.utils.helpers import atomic_write, ensure_dir, get_data_path
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import MediaConfig
+
+_INDEX = "index.json"
+_EXT_RE = re.compile(r"^\.[A-Za-z0-9]{1,10}$")
+
+
+class MediaTooLargeError(ValueError):
+    """A file exceeds the per-file size limit of the media store."""
+
+
+@dataclass
+class MediaEntry:
+    """A stored file."""
+    name: str  # Path relative to the store root
+    size: int
+    last_used: float  # time.time() it was last stored or referenced
+    refs: list[str] = field(default_factory=list)  # Keys of sessions the file was received in
+
+
+class MediaStore:
+    """
+    Stores media files by content hash, so each distinct file is kept once.
+    
+    Files live at <root>/<hash[:2]>/<hash><ext>. An index records their size,
+    when they were last used and which sessions they were received in.
+    Storing a file that would push the store past max_total_bytes first
+    deletes the least recently used files, unreferenced ones first. gc()
+    also deletes unreferenced files unused for ttl_days, and drops
+    references to sessions that no longer exist.
+    
+    The index is shared safely between processes (file lock, atomic writes).
+    """
+    
+    def __init__(
+        self,
+        root: Path,
+        max_file_bytes: int = 20 * 1024 * 1024,
+        max_total_bytes: int = 1024 * 1024 * 1024,
+        ttl_days: float = 30,
+    ):
+        self.root = ensure_dir(root)
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.ttl_days = ttl_days
+        self._index_path = self.root / _INDEX
+        self._lock = lock_for(self.root / ".lock")
+        self._entries: dict[str, MediaEntry] = {}  # content hash -> entry
+        self._fingerprint: Any = None  # Fingerprint of the index file _entries was read from
+        self._loaded = False
+    
+    def put(self, data: bytes, ext: str = "", ref: str | None = None) -> Path:
+        """
+        Store a file, or reuse the stored copy of identical content.
+        
+        Args:
+            data: File content.
+            ext: File extension (e.g. ".jpg"), kept so the type can be guessed.
+            ref: Key of the session the file was received in.
+        
+        Returns:
+            Path of the stored file.
+        
+        Raises:
+            MediaTooLargeError: If data exceeds max_file_bytes.
+        """
+        if len(data) > self.max_file_bytes:
+            raise MediaTooLargeError(
+                f"{len(data) / 1024 / 1024:.1f} MB exceeds the {self.max_file_bytes / 1024 / 1024:.0f} MB limit"
+            )
+        digest = hashlib.sha256(data).hexdigest()
+        ext = ext if _EXT_RE.match(ext or "") else ""
+        
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(digest)
+            if entry is None or not (self.root / entry.name).exists():
+                entry = MediaEntry(name=f"{digest[:2]}/{digest}{ext.lower()}", size=len(data), last_used=0.0)
+                path = self.root / entry.name
+                ensure_dir(path.parent)
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                tmp.write_bytes(data)
+                tmp.replace(path)
+                entries[digest] = entry
+            entry.last_used = time.time()
+            if ref and ref not in entry.refs:
+                entry.refs.append(ref)
+            self._evict(entries, keep=digest)
+            self._save()
+        return self.root / entry.name
+    
+    def gc(self, live_sessions: Iterable[str] | None = None, dry_run: bool = False) -> dict[str, int]:
+        """
+        Apply the retention policy.
+        
+        Files on disk that the index does not know (e.g. downloads from before
+        the store existed) are adopted as unreferenced files.
+        
+        Args:
+            live_sessions: Keys of existing sessions; references to others are dropped.
+            dry_run: Only count what would be deleted.
+        
+        Returns:
+            Numbers of deleted files and freed bytes, and the files and bytes kept.
+        """
+        with self._lock:
+            entries = self._load()
+            if dry_run:
+                entries = {d: replace(e, refs=list(e.refs)) for d, e in entries.items()}
+            self._reconcile(entries)
+            if live_sessions is not None:
+                live = set(live_sessions)
+                for entry in entries.values():
+                    entry.refs = [r for r in entry.refs if r in live]
+            
+            doomed = []
+            if self.ttl_days > 0:
+                cutoff = time.time() - self.ttl_days * 86400
+                doomed = [d for d, e in entries.items() if not e.refs and e.last_used < cutoff]
+            remaining = {d: e for d, e in entries.items() if d not in doomed}
+            doomed += self._over_budget(remaining)
+            
+            freed = sum(entries[d].size for d in doomed)
+            if not dry_run:
+                for digest in doomed:
+                    self._delete(entries, digest)
+                self._save()
+            kept = [e for d, e in entries.items() if d not in doomed]
+        
+        if doomed and not dry_run:
+            logger.info(f"Media store: deleted {len(doomed)} files ({freed / 1024 / 1024:.1f} MB)")
+        return {
+            "deleted": len(doomed),
+            "freed_bytes": freed,
+            "files": len(kept),
+            "bytes": sum(e.size for e in kept),
+        }
+    
+    def stats(self) -> dict[str, Any]:
+        """Get the number and size of stored files."""
+        with self._lock:
+            entries = list(self._load().values())
+        return {
+            "files": len(entries),
+            "bytes": sum(e.size for e in entries),
+            "referenced": sum(1 for e in entries if e.refs),
+            "max_total_bytes": self.max_total_bytes,
+        }
+    
+    def _evict(self, entries: dict[str, MediaEntry], keep: str) -> None:
+        """Delete least recently used files until the store fits max_total_bytes."""
+        for digest in self._over_budget(entries, keep):
+            self._delete(entries, digest)
+    
+    def _over_budget(self, entries: dict[str, MediaEntry], keep: str | None = None) -> list[str]:
+        """Pick the files to delete to fit max_total_bytes: unreferenced first, then least recently used."""
+        excess = sum(e.size for e in entries.values()) - self.max_total_bytes
+        picked = []
+        for digest, entry in sorted(entries.items(), key=lambda item: (bool(item[1].refs), item[1].last_used)):
+            if excess <= 0:
+                break
+            if digest == keep:
+                continue
+            picked.append(digest)
+            excess -= entry.size
+        return picked
+    
+    def _delete(self, entries: dict[str, MediaEntry], digest: str) -> None:
+        entry = entries.pop(digest)
+        try:
+            (self.root / entry.name).unlink()
+        except FileNotFoundError:
+            pass
+    
+    def _reconcile(self, entries: dict[str, MediaEntry]) -> None:
+        """Forget entries whose file is gone and adopt files the index does not list."""
+        for digest in [d for d, e in entries.items() if not (self.root / e.name).exists()]:
+            del entries[digest]
+        known = {e.name for e in entries.values()}
+        for path in self.root.rglob("*"):
+            name = path.relative_to(self.root).as_posix()
+            if name in known or name.startswith(".") or "/." in name or name == _INDEX or not path.is_file():
+                continue
+            st = path.stat()
+            # Legacy files are not named by hash; key them by path so they are not hashed again
+            entries[f"file:{name}"] = MediaEntry(name=name, size=st.st_size, last_used=st.st_mtime)
+    
+    def _load(self) -> dict[str, MediaEntry]:
+        """Get the index, re-reading it if another process changed it."""
+        stamp = fingerprint(self._index_path)
+        if self._loaded and stamp == self._fingerprint:
+            return self._entries
+        entries = {}
+        if stamp is not None:
+            try:
+                data = json.loads(self._index_path.read_text(encoding="utf-8"))
+                entries = {digest: MediaEntry(**e) for digest, e in data.get("files", {}).items()}
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Media index unreadable, rebuilding it: {e}")
+                entries = {}
+                self._reconcile(entries)
+        self._entries = entries
+        self._fingerprint = stamp
+        self._loaded = True
+        return entries
+    
+    def _save(self) -> None:
+        data = {"version": 1, "files": {digest: asdict(e) for digest, e in self._entries.items()}}
+        atomic_write(self._index_path, json.dumps(data, ensure_ascii=False))
+        self._fingerprint = fingerprint(self._index_path)
+
+
+def create_media_store(config: "MediaConfig | None" = None) -> MediaStore:
+    """Open the media store (~/.nanobot/media)."""
+    if config is None:
+        return MediaStore(get_data_path() / "media")
+    return MediaStore(
+        get_data_path() / "media",
+        max_file_bytes=config.max_file_mb * 1024 * 1024,
+        max_total_bytes=config.max_total_mb * 1024 * 1024,
+        ttl_days=config.ttl_days,
+    )
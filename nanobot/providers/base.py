@@ -1,6 +1,7 @@
 """Base LLM provider interface."""
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -27,6 +28,28 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
+@dataclass
+class ToolCallDelta:
+    """A fragment of a tool call received while streaming."""
+    index: int
+    id: str | None = None
+    name: str | None = None
+    arguments: str = ""  # Partial JSON text, concatenated across deltas
+
+
+@dataclass
+class LLMStreamChunk:
+    """One increment of a streamed LLM response."""
+    content: str | None = None
+    tool_calls: list[ToolCallDelta] = field(default_factory=list)
+    response: LLMResponse | None = None  # Set on the final chunk only
+    
+    @property
+    def is_final(self) -> bool:
+        """Check if this chunk carries the assembled response."""
+        return self.response is not None
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -63,6 +86,43 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """
+        Stream a chat completion request.
+        
+        Yields content and tool-call deltas as they arrive, followed by a final
+        chunk whose `response` holds the assembled LLMResponse. Providers without
+        native streaming fall back to a single chat() call.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions.
+            model: Model identifier (provider-specific).
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+        """
+        response = await self.chat(
+            messages=messages,
+            tools=tools,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        if response.content:
+            yield LLMStreamChunk(content=response.content)
+        yield LLMStreamChunk(response=response)
+    
+    def supports_prompt_caching(self, model: str | None = None) -> bool:
+        """Whether the model takes explicit cache_control breakpoints in messages."""
+        return False
+    
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
@@ -1,12 +1,20 @@
 """LiteLLM provider implementation for multi-provider support."""
 
+import json
 import os
+from collections.abc import AsyncIterator
 from typing import Any
 
 import litellm
 from litellm import acompletion
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    LLMStreamChunk,
+    ToolCallDelta,
+    ToolCallRequest,
+)
 
 
 class LiteLLMProvider(LLMProvider):
@@ -86,6 +94,102 @@ class LiteLLMProvider(LLMProvider):
         Returns:
             LLMResponse with content and/or tool calls.
         """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        
+        try:
+            response = await acompletion(**kwargs)
+            return self._parse_response(response)
+        except Exception as e:
+            # Return error as content for graceful handling
+            return LLMResponse(
+                content=f"Error calling LLM: {str(e)}",
+                finish_reason="error",
+            )
+    
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """
+        Stream a chat completion via LiteLLM (stream=True).
+        
+        Yields content and tool-call deltas as they arrive, then a final chunk
+        carrying the assembled LLMResponse.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}  # Token usage on the last chunk
+        
+        content_parts: list[str] = []
+        tool_parts: dict[int, dict[str, Any]] = {}
+        finish_reason = "stop"
+        usage: dict[str, int] = {}
+        
+        try:
+            stream = await acompletion(**kwargs)
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = self._parse_usage(chunk.usage)
+                if not chunk.choices:
+                    continue
+                
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                delta = choice.delta
+                if delta is None:
+                    continue
+                
+                deltas = []
+                for tc in getattr(delta, "tool_calls", None) or []:
+                    index = tc.index if tc.index is not None else len(tool_parts)
+                    fn = tc.function
+                    d = ToolCallDelta(
+                        index=index,
+                        id=tc.id,
+                        name=fn.name if fn else None,
+                        arguments=(fn.arguments or "") if fn else "",
+                    )
+                    part = tool_parts.setdefault(index, {"id": None, "name": None, "arguments": ""})
+                    part["id"] = part["id"] or d.id
+                    part["name"] = part["name"] or d.name
+                    part["arguments"] += d.arguments
+                    deltas.append(d)
+                
+                text = delta.content or None
+                if text:
+                    content_parts.append(text)
+                if text or deltas:
+                    yield LLMStreamChunk(content=text, tool_calls=deltas)
+        except Exception as e:
+            # Surface the error as content for graceful handling
+            error = f"Error calling LLM: {str(e)}"
+            yield LLMStreamChunk(content=error)
+            yield LLMStreamChunk(response=LLMResponse(content=error, finish_reason="error"))
+            return
+        
+        tool_calls = [
+            ToolCallRequest(
+                id=part["id"] or f"call_{index}",
+                name=part["name"] or "",
+                arguments=self._parse_arguments(part["arguments"]),
+            )
+            for index, part in sorted(tool_parts.items())
+        ]
+        
+        yield LLMStreamChunk(response=LLMResponse(
+            content="".join(content_parts) or None,
+            tool_calls=tool_calls,
+            finish_reason=finish_reason,
+            usage=usage,
+        ))
+    
+    def _resolve_model(self, model: str | None) -> str:
+        """Apply provider-specific prefixes LiteLLM needs for routing."""
         model = model or self.default_model
         
         # For OpenRouter, prefix model name if not already prefixed
@@ -116,6 +220,19 @@ class LiteLLMProvider(LLMProvider):
         if self.is_vllm:
             model = f"hosted_vllm/{model}"
         
+        return model
+    
+    def _build_kwargs(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build the acompletion() arguments shared by chat and chat_stream."""
+        model = self._resolve_model(model)
+        
         # kimi-k2.5 only supports temperature=1.0
         if "kimi-k2.5" in model.lower():
             temperature = 1.0
@@ -135,15 +252,7 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
         
-        try:
-            response = await acompletion(**kwargs)
-            return self._parse_response(response)
-        except Exception as e:
-            # Return error as content for graceful handling
-            return LLMResponse(
-                content=f"Error calling LLM: {str(e)}",
-                finish_reason="error",
-            )
+        return kwargs
     
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
@@ -153,28 +262,15 @@ class LiteLLMProvider(LLMProvider):
         tool_calls = []
         if hasattr(message, "tool_calls") and message.tool_calls:
             for tc in message.tool_calls:
-                # Parse arguments from JSON string if needed
-                args = tc.function.arguments
-                if isinstance(args, str):
-                    import json
-                    try:
-                        args = json.loads(args)
-                    except json.JSONDecodeError:
-                        args = {"raw": args}
-                
                 tool_calls.append(ToolCallRequest(
                     id=tc.id,
                     name=tc.function.name,
-                    arguments=args,
+                    arguments=self._parse_arguments(tc.function.arguments),
                 ))
         
         usage = {}
         if hasattr(response, "usage") and response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+            usage = self._parse_usage(response.usage)
         
         return LLMResponse(
             content=message.content,
@@ -183,6 +279,47 @@ class LiteLLMProvider(LLMProvider):
             usage=usage,
         )
     
+    @staticmethod
+    def _parse_arguments(args: Any) -> dict[str, Any]:
+        """Parse tool call arguments from a JSON string if needed."""
+        if isinstance(args, str):
+            if not args.strip():
+                return {}
+            try:
+                args = json.loads(args)
+            except json.JSONDecodeError:
+                args = {"raw": args}
+        return args
+    
+    @staticmethod
+    def _parse_usage(usage: Any) -> dict[str, int]:
+        """Extract token counts, including prompt cache reads/writes, from a LiteLLM usage object."""
+        result = {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+        }
+        
+        # Anthropic reports cache reads/writes directly; OpenAI-style providers
+        # (OpenAI, DeepSeek, ...) report automatic cache hits in prompt_tokens_details
+        cache_read = getattr(usage, "cache_read_input_tokens", None)
+        if cache_read is None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            cache_read = getattr(details, "cached_tokens", None) if details else None
+        if isinstance(cache_read, int):
+            result["cache_read_tokens"] = cache_read
+        
+        cache_creation = getattr(usage, "cache_creation_input_tokens", None)
+        if isinstance(cache_creation, int):
+            result["cache_creation_tokens"] = cache_creation
+        
+        return result
+    
+    def supports_prompt_caching(self, model: str | None = None) -> bool:
+        """Anthropic models (direct, Bedrock or OpenRouter) take cache_control breakpoints."""
+        model = self._resolve_model(model).lower()
+        return not self.is_vllm and ("anthropic" in model or "claude" in model)
+    
     def get_default_model(self) -> str:
         """Get the default model."""
         return self.default_model
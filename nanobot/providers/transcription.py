@@ -7,6 +7,8 @@ from typing import Any
 import httpx
 from loguru import logger
 
+from nanobot.utils.aio import read_bytes
+
 
 class GroqTranscriptionProvider:
     """
@@ -39,27 +41,27 @@ class GroqTranscriptionProvider:
             return ""
         
         try:
+            audio = await read_bytes(path)
             async with httpx.AsyncClient() as client:
-                with open(path, "rb") as f:
-                    files = {
-                        "file": (path.name, f),
-                        "model": (None, "whisper-large-v3"),
-                    }
-                    headers = {
-                        "Authorization": f"Bearer {self.api_key}",
-                    }
-                    
-                    response = await client.post(
-                        self.api_url,
-                        headers=headers,
-                        files=files,
-                        timeout=60.0
-                    )
-                    
-                    response.raise_for_status()
-                    data = response.json()
-                    return data.get("text", "")
-                    
+                files = {
+                    "file": (path.name, audio),
+                    "model": (None, "whisper-large-v3"),
+                }
+                headers = {
+                    "Authorization": f"Bearer {self.api_key}",
+                }
+                
+                response = await client.post(
+                    self.api_url,
+                    headers=headers,
+                    files=files,
+                    timeout=60.0
+                )
+                
+                response.raise_for_status()
+                data = response.json()
+                return data.get("text", "")
+                
         except Exception as e:
             logger.error(f"Groq transcription error: {e}")
             return ""
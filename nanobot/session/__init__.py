@@ -1,5 +1,7 @@
 """Session management module."""
 
 from nanobot.session.manager import SessionManager, Session
+from nanobot.session.search import SessionHit, SessionIndex
+from nanobot.session.store import JsonlSessionStore, SessionStore
 
-__all__ = ["SessionManager", "Session"]
+__all__ = ["SessionManager", "Session", "SessionStore", "JsonlSessionStore", "SessionIndex", "SessionHit"]
@@ -0,0 +1,174 @@
+"""Compressed archive of idle sessions and trimmed history."""
+
+import gzip
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from nanobot.session.store import (
+    SessionStore,
+    _dump,
+    _metadata_record,
+    _parse,
+    _session_from_record,
+)
+from nanobot.session.types import Session
+from nanobot.utils.filelock import lock_for
+from nanobot.utils.helpers import ensure_dir, safe_filename
+
+
+class SessionArchive:
+    """
+    Cold storage for sessions, as gzip-compressed JSONL.
+    
+    Archived sessions leave the session store (and its search index), so the
+    hot store only holds conversations in use. They are restored into the
+    store on their next message. Messages trimmed off long histories are
+    appended to a per-session file under trimmed/ instead of being lost.
+    """
+    
+    def __init__(self, archive_dir: Path):
+        self.archive_dir = ensure_dir(archive_dir)
+        self.trimmed_dir = self.archive_dir / "trimmed"
+        self._lock = lock_for(self.archive_dir / ".lock")
+    
+    def _get_path(self, key: str) -> Path:
+        return self.archive_dir / f"{safe_filename(key.replace(':', '_'))}.jsonl.gz"
+    
+    def contains(self, key: str) -> bool:
+        """Check whether a session is archived."""
+        return self._get_path(key).exists()
+    
+    def archive(self, store: SessionStore, key: str) -> bool:
+        """
+        Move a session from the store into the archive.
+        
+        Returns:
+            False if the store does not have the session.
+        """
+        with self._lock:
+            session = store.load(key, full=True)
+            store.forget(key)
+            if session is None:
+                return False
+            
+            path = self._get_path(key)
+            previous = self._read(path, key)
+            if previous is not None:
+                # Created again without restoring the archived copy: keep both, oldest first
+                session.messages = previous.messages + session.messages
+                summary = session.metadata.get("summary")
+                if summary:
+                    summary["upto"] = summary.get("upto", 0) + len(previous.messages)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            with gzip.open(tmp, "wb") as f:
+                for msg in session.messages:
+                    f.write(_dump(msg))
+                f.write(_dump(_metadata_record(session, len(session.messages), 0)))
+            tmp.replace(path)
+            store.delete(key)
+        return True
+    
+    def restore(self, store: SessionStore, key: str) -> bool:
+        """
+        Move an archived session back into the store.
+        
+        Returns:
+            False if the session is not archived.
+        """
+        with self._lock:
+            path = self._get_path(key)
+            session = self._read(path, key)
+            if session is None:
+                return False
+            store.forget(key)
+            store.save(session)
+            store.forget(key)
+            path.unlink()
+        return True
+    
+    def trim(self, store: SessionStore, key: str, max_messages: int) -> int:
+        """
+        Move all but the newest max_messages messages of a session to trimmed/.
+        
+        The kept history starts with a user message (so it may exceed
+        max_messages by the rest of a turn), and the summary watermark is
+        moved along with the messages.
+        
+        Returns:
+            Number of messages moved.
+        """
+        with self._lock:
+            session = store.load(key, full=True)
+            store.forget(key)
+            if session is None or len(session.messages) <= max_messages:
+                return 0
+            
+            # Keep whole turns: the kept history opens with the user message of its first turn
+            cut = len(session.messages) - max_messages
+            while cut > 0 and session.messages[cut].get("role") != "user":
+                cut -= 1
+            if cut == 0:
+                return 0
+            
+            trimmed = session.messages[:cut]
+            path = ensure_dir(self.trimmed_dir) / self._get_path(key).name
+            # Appending adds a gzip member; readers see one stream of lines
+            with gzip.open(path, "ab") as f:
+                for msg in trimmed:
+                    f.write(_dump(msg))
+            
+            session.messages = session.messages[cut:]
+            summary = session.metadata.get("summary")
+            if summary:
+                summary["upto"] = max(0, summary.get("upto", 0) - cut)
+            store.save(session)
+            store.forget(key)
+        return len(trimmed)
+    
+    def purge(self, older_than_days: float) -> int:
+        """
+        Delete archived sessions that were archived more than older_than_days ago.
+        
+        Returns:
+            Number of sessions deleted.
+        """
+        cutoff = time.time() - older_than_days * 86400
+        deleted = 0
+        with self._lock:
+            for path in self.archive_dir.glob("*.jsonl.gz"):
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    trimmed = self.trimmed_dir / path.name
+                    if trimmed.exists():
+                        trimmed.unlink()
+                    deleted += 1
+        return deleted
+    
+    def stats(self) -> dict[str, Any]:
+        """Get the number and size of archived sessions and trimmed history."""
+        sessions = list(self.archive_dir.glob("*.jsonl.gz"))
+        trimmed = list(self.trimmed_dir.glob("*.jsonl.gz")) if self.trimmed_dir.exists() else []
+        return {
+            "sessions": len(sessions),
+            "bytes": sum(p.stat().st_size for p in sessions),
+            "trimmed_bytes": sum(p.stat().st_size for p in trimmed),
+        }
+    
+    def _read(self, path: Path, key: str) -> Session | None:
+        """Read an archived session, or None if there is none."""
+        if not path.exists():
+            return None
+        messages = []
+        record: dict[str, Any] = {}
+        with gzip.open(path, "rb") as f:
+            for line in f:
+                data = _parse(line)
+                if data is None:
+                    continue
+                if data.get("_type") == "metadata":
+                    record = data
+                else:
+                    messages.append(data)
+        return _session_from_record(key, record, messages)
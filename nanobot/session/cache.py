@@ -0,0 +1,161 @@
+"""Bounded in-memory cache of sessions."""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from nanobot.session.types import Session
+
+# Rough per-message overhead of the dict, its keys and timestamps
+_MESSAGE_OVERHEAD = 300
+
+
+@dataclass
+class _Entry:
+    session: "Session"
+    size: int  # Estimated bytes held by the session
+    messages: list[dict[str, Any]]  # The message list that was sized
+    counted: int  # Messages of that list included in size
+    used_at: float  # time.monotonic() of the last access
+    last: dict[str, Any] | None = None  # The newest message included in size
+
+
+class SessionCache:
+    """
+    LRU cache of sessions bounded by entry count and estimated size.
+    
+    Sessions idle for longer than idle_s are evicted as well. Evicted
+    sessions are handed to on_evict (which flushes anything unsaved) before
+    they are dropped.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        idle_s: float | None = None,
+        on_evict: Callable[["Session"], None] | None = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.idle_s = idle_s
+        self.on_evict = on_evict
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+    
+    def get(self, key: str) -> "Session | None":
+        """Get a cached session, marking it as recently used."""
+        self._expire()
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry.used_at = time.monotonic()
+        self._entries.move_to_end(key)
+        return entry.session
+    
+    def peek(self, key: str) -> "Session | None":
+        """Get a cached session without counting or reordering anything."""
+        entry = self._entries.get(key)
+        return entry.session if entry else None
+    
+    def put(self, session: "Session", messages: list[dict[str, Any]] | None = None) -> None:
+        """
+        Add or refresh a session, then evict down to the limits.
+        
+        Args:
+            session: The session.
+            messages: Copy of its messages to size it by, when it may change in
+                another thread meanwhile.
+        """
+        if messages is None:
+            messages = session.messages
+        entry = self._entries.get(session.key)
+        if entry is None or entry.session is not session:
+            if entry is not None:
+                self._bytes -= entry.size
+            entry = _Entry(session, 0, messages, 0, 0.0)
+            self._entries[session.key] = entry
+        
+        # Size new messages only, unless the message list was replaced (e.g. cleared)
+        if entry.messages is not messages or entry.counted > len(messages):
+            if entry.counted <= len(messages) and entry.counted and messages[entry.counted - 1] is entry.last:
+                entry.messages = messages  # A copy that extends what was sized
+            else:
+                self._bytes -= entry.size
+                entry.size, entry.messages, entry.counted = 0, messages, 0
+        added = sum(_message_size(m) for m in messages[entry.counted:])
+        entry.size += added
+        entry.counted = len(messages)
+        entry.last = messages[-1] if messages else None
+        self._bytes += added
+        
+        entry.used_at = time.monotonic()
+        self._entries.move_to_end(session.key)
+        self._expire()
+        
+        # The entry just added stays, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            self._evict(next(iter(self._entries)))
+    
+    def pop(self, key: str) -> "Session | None":
+        """Remove a session without calling on_evict."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._bytes -= entry.size
+        return entry.session
+    
+    def clear(self) -> None:
+        """Drop every session without calling on_evict."""
+        self._entries.clear()
+        self._bytes = 0
+    
+    def stats(self) -> dict[str, Any]:
+        """Get cache counters and current usage."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+    
+    def _expire(self) -> None:
+        """Evict sessions idle for longer than idle_s (the LRU end holds the idlest)."""
+        if self.idle_s is None:
+            return
+        deadline = time.monotonic() - self.idle_s
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.used_at > deadline:
+                break
+            self._evict(key)
+    
+    def _evict(self, key: str) -> None:
+        session = self.pop(key)
+        self.evictions += 1
+        if session is not None and self.on_evict:
+            self.on_evict(session)
+
+
+def _message_size(message: dict[str, Any]) -> int:
+    content = message.get("content")
+    if isinstance(content, str):
+        return len(content) + _MESSAGE_OVERHEAD
+    return len(json.dumps(content, default=str)) + _MESSAGE_OVERHEAD
@@ -1,79 +1,90 @@
 """Session management for conversation history."""
 
-import json
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.session.cache import SessionCache
+from nanobot.session.store import JsonlSessionStore, SessionStore
+from nanobot.session.types import Session
+from nanobot.utils.helpers import get_data_path
 
+if TYPE_CHECKING:
+    from nanobot.session.archive import SessionArchive
+    from nanobot.session.search import SessionHit, SessionIndex
 
-@dataclass
-class Session:
+BACKENDS = ("jsonl", "sqlite")
+
+
+def create_store(backend: str = "jsonl", load_tokens: int | None = None) -> SessionStore:
     """
-    A conversation session.
+    Create a session store.
     
-    Stores messages in JSONL format for easy reading and persistence.
-    """
+    Args:
+        backend: "jsonl" (one append-only file per session in ~/.nanobot/sessions)
+            or "sqlite" (~/.nanobot/sessions.db).
+        load_tokens: Token budget of the history window loaded per session.
     
-    key: str  # channel:chat_id
-    messages: list[dict[str, Any]] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
-    metadata: dict[str, Any] = field(default_factory=dict)
-    
-    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
-        """Add a message to the session."""
-        msg = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat(),
-            **kwargs
-        }
-        self.messages.append(msg)
-        self.updated_at = datetime.now()
-    
-    def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
-        """
-        Get message history for LLM context.
-        
-        Args:
-            max_messages: Maximum messages to return.
-        
-        Returns:
-            List of messages in LLM format.
-        """
-        # Get recent messages
-        recent = self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
-        
-        # Convert to LLM format (just role and content)
-        return [{"role": m["role"], "content": m["content"]} for m in recent]
-    
-    def clear(self) -> None:
-        """Clear all messages in the session."""
-        self.messages = []
-        self.updated_at = datetime.now()
+    Returns:
+        The store.
+    """
+    if backend == "sqlite":
+        from nanobot.session.sqlite import SqliteSessionStore
+        return SqliteSessionStore(get_data_path() / "sessions.db", load_tokens=load_tokens)
+    if backend != "jsonl":
+        raise ValueError(f"Unknown session backend: {backend} (expected one of {', '.join(BACKENDS)})")
+    return JsonlSessionStore(Path.home() / ".nanobot" / "sessions", load_tokens=load_tokens)
 
 
 class SessionManager:
     """
     Manages conversation sessions.
     
-    Sessions are stored as JSONL files in the sessions directory.
+    Sessions are persisted by a SessionStore (JSONL files or SQLite) and kept
+    in a bounded LRU cache; sessions that fall out of it are flushed first.
+    Cached sessions are refreshed from the store on access, so messages that
+    other processes (e.g. the CLI next to the gateway) added are not lost.
+    Methods are thread-safe, so the agent loop can call them from I/O threads.
     """
     
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        load_tokens: int | None = None,
+        cache_entries: int = 256,
+        cache_bytes: int = 64 * 1024 * 1024,
+        idle_s: float | None = None,
+        backend: str = "jsonl",
+        store: SessionStore | None = None,
+        index: "SessionIndex | None" = None,
+        archive: "SessionArchive | None" = None,
+    ):
+        """
+        Args:
+            workspace: Agent workspace.
+            load_tokens: Token budget of the history window. Loading stops once
+                this many tokens of messages after the summary are read
+                (None loads everything after the summary).
+            cache_entries: Maximum sessions kept in memory.
+            cache_bytes: Maximum estimated size of the sessions kept in memory.
+            idle_s: Evict sessions unused for this long (None to keep them).
+            backend: Storage backend, "jsonl" or "sqlite".
+            store: Use this store instead of creating one for the backend.
+            index: Full-text index kept up to date with every save (enables search()).
+            archive: Cold storage that idle sessions move to and are restored from.
+        """
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "sessions")
-        self._cache: dict[str, Session] = {}
-    
-    def _get_session_path(self, key: str) -> Path:
-        """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
+        self.store = store or create_store(backend, load_tokens)
+        self.index = index
+        self.archive = archive
+        self._synced = False
+        self._lock = threading.RLock()
+        if index is not None:
+            index.attach(self.store)
+        self._cache = SessionCache(cache_entries, cache_bytes, idle_s, on_evict=self._flush)
     
     def get_or_create(self, key: str) -> Session:
         """
@@ -85,73 +96,63 @@ class SessionManager:
         Returns:
             The session.
         """
-        # Check cache
-        if key in self._cache:
-            return self._cache[key]
-        
-        # Try to load from disk
-        session = self._load(key)
-        if session is None:
-            session = Session(key=key)
-        
-        self._cache[key] = session
-        return session
-    
-    def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
-        path = self._get_session_path(key)
-        
-        if not path.exists():
-            return None
-        
-        try:
-            messages = []
-            metadata = {}
-            created_at = None
+        with self._lock:
+            # Check cache, picking up anything other processes stored meanwhile
+            session = self._cache.get(key)
+            if session is not None:
+                if self.store.refresh(session):
+                    self._cache.put(session)
+                return session
             
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    data = json.loads(line)
-                    
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                    else:
-                        messages.append(data)
-            
-            return Session(
-                key=key,
-                messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata
-            )
-        except Exception as e:
-            logger.warning(f"Failed to load session {key}: {e}")
-            return None
-    
-    def save(self, session: Session) -> None:
-        """Save a session to disk."""
-        path = self._get_session_path(session.key)
-        
-        with open(path, "w") as f:
-            # Write metadata first
-            metadata_line = {
-                "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata
-            }
-            f.write(json.dumps(metadata_line) + "\n")
+            # Try to load from disk, then from the archive
+            session = self.store.load(key)
+            if session is None and self.archive is not None and self.archive.restore(self.store, key):
+                logger.info(f"Restored session {key} from the archive")
+                session = self.store.load(key)
+            if session is None:
+                session = Session(key=key)
             
-            # Write messages
-            for msg in session.messages:
-                f.write(json.dumps(msg) + "\n")
+            self._cache.put(session)
+            return session
+    
+    def save(self, session: Session, snapshot: Session | None = None) -> None:
+        """
+        Save a session, writing only what changed since the last save.
         
-        self._cache[session.key] = session
+        Args:
+            session: The session.
+            snapshot: Copy of the session (Session.snapshot()) to store instead,
+                when the session may change in another thread meanwhile. Messages
+                merged in from other processes end up in the copy.
+        """
+        with self._lock:
+            cached = self._cache.peek(session.key)
+            if cached is not None and cached is not session:
+                # Evicted while in use and loaded again since: the cached copy is newer
+                logger.warning(f"Not saving stale copy of session {session.key}")
+                return
+            if snapshot is None:
+                self.store.save(session)
+                self._cache.put(session)
+            else:
+                self.store.save(snapshot)
+                self._cache.put(session, snapshot.messages)
+    
+    def compact(self, session: Session) -> None:
+        """Rewrite a session's storage without superseded data."""
+        with self._lock:
+            self.store.compact(session)
+    
+    def cache_stats(self) -> dict[str, Any]:
+        """Get session cache hits, misses, evictions and memory use."""
+        with self._lock:
+            return self._cache.stats()
+    
+    def _flush(self, session: Session) -> None:
+        """Store an evicted session if it has unsaved messages, then forget it."""
+        if not self.store.is_saved(session):
+            self.store.save(session)
+        self.store.forget(session.key)
     
     def delete(self, key: str) -> bool:
         """
@@ -163,40 +164,135 @@ class SessionManager:
         Returns:
             True if deleted, False if not found.
         """
-        # Remove from cache
-        self._cache.pop(key, None)
-        
-        # Remove file
-        path = self._get_session_path(key)
-        if path.exists():
-            path.unlink()
-            return True
-        return False
+        with self._lock:
+            # Remove from cache
+            self._cache.pop(key)
+            return self.store.delete(key)
     
     def list_sessions(self) -> list[dict[str, Any]]:
         """
         List all sessions.
         
         Returns:
-            List of session info dicts.
+            List of session info dicts, most recently updated first.
         """
-        sessions = []
+        return self.store.list_sessions()
+    
+    def archive_idle(self, idle_days: float, dry_run: bool = False) -> list[str]:
+        """
+        Move sessions not updated for idle_days to the archive.
+        
+        Args:
+            idle_days: Minimum days since the last update.
+            dry_run: Only report which sessions would be archived.
+        
+        Returns:
+            Keys of the archived sessions.
+        """
+        if self.archive is None:
+            raise RuntimeError("No session archive configured")
+        cutoff = datetime.now() - timedelta(days=idle_days)
+        archived = []
+        for info in self.store.list_sessions():
+            if not info.get("updated_at") or datetime.fromisoformat(info["updated_at"]) >= cutoff:
+                continue
+            key = info["key"]
+            if not dry_run:
+                with self._lock:
+                    self._release(key)
+                    if not self.archive.archive(self.store, key):
+                        continue
+            archived.append(key)
+        return archived
+    
+    def trim_history(self, max_messages: int) -> int:
+        """
+        Move the oldest messages of sessions longer than max_messages to the archive.
         
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path) as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            sessions.append({
-                                "key": path.stem.replace("_", ":"),
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
-            except Exception:
+        Sessions held in memory may be in use and are left for a later run.
+        
+        Returns:
+            Number of messages moved.
+        """
+        if self.archive is None:
+            raise RuntimeError("No session archive configured")
+        moved = 0
+        for info in self.store.list_sessions():
+            count = info.get("messages")
+            if count is not None and count <= max_messages:
                 continue
+            with self._lock:
+                if info["key"] not in self._cache:
+                    moved += self.archive.trim(self.store, info["key"], max_messages)
+        return moved
+    
+    def _release(self, key: str) -> None:
+        """Flush a session and drop it from memory, so it can be rewritten underneath."""
+        session = self._cache.pop(key)
+        if session is not None:
+            self._flush(session)
+    
+    def search(self, query: str, limit: int = 10, key: str | None = None) -> "list[SessionHit]":
+        """
+        Search the messages of all sessions.
         
-        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+        The first search of a process indexes history that was stored without
+        the index (e.g. before it existed); later ones only query the index.
+        
+        Args:
+            query: Keywords to look for.
+            limit: Maximum hits.
+            key: Only search this session.
+        
+        Returns:
+            Matching messages, most relevant first.
+        """
+        if self.index is None:
+            raise RuntimeError("Session search is disabled (sessions.search in config)")
+        with self._lock:
+            if not self._synced:
+                self.index.sync(self.store)
+                self._synced = True
+        return self.index.search(query, limit, session_key=key)
+
+
+def create_archive() -> "SessionArchive":
+    """Open the session archive (~/.nanobot/sessions/archive)."""
+    from nanobot.session.archive import SessionArchive
+    return SessionArchive(get_data_path() / "sessions" / "archive")
+
+
+def create_index() -> "SessionIndex":
+    """Open the full-text index of sessions (~/.nanobot/session_index.db)."""
+    from nanobot.session.search import SessionIndex
+    return SessionIndex(get_data_path() / "session_index.db")
+
+
+def migrate_sessions(source: SessionStore, target: SessionStore, overwrite: bool = False) -> tuple[int, int]:
+    """
+    Copy every session from one store to another.
+    
+    Args:
+        source: Store to read from.
+        target: Store to write to.
+        overwrite: Replace sessions that already exist in the target.
+    
+    Returns:
+        (copied, skipped) session counts.
+    """
+    copied = skipped = 0
+    for info in source.list_sessions():
+        key = info["key"]
+        if not overwrite and target.load(key) is not None:
+            skipped += 1
+            continue
+        session = source.load(key, full=True)
+        if session is None:
+            skipped += 1
+            continue
+        target.forget(key)  # Write the session in full
+        target.save(session)
+        source.forget(key)
+        target.forget(key)
+        copied += 1
+    return copied, skipped
@@ -0,0 +1,109 @@
+"""Background retention of session history."""
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from nanobot.session.manager import SessionManager
+
+if TYPE_CHECKING:
+    from nanobot.media.store import MediaStore
+
+
+class SessionRetention:
+    """
+    Periodically applies the session retention policy.
+    
+    - Sessions idle for archive_after_days move to the compressed archive
+      (and come back on their next message).
+    - Messages beyond max_messages per session move to the archive.
+    - Archived sessions older than delete_archived_after_days are deleted.
+    - Media no longer referenced by a session is garbage collected.
+    A zero disables the corresponding step.
+    """
+    
+    def __init__(
+        self,
+        sessions: SessionManager,
+        archive_after_days: float = 30,
+        delete_archived_after_days: float = 0,
+        max_messages: int = 0,
+        interval_s: float = 24 * 3600,
+        media: "MediaStore | None" = None,
+    ):
+        self.sessions = sessions
+        self.media = media
+        self.archive_after_days = archive_after_days
+        self.delete_archived_after_days = delete_archived_after_days
+        self.max_messages = max_messages
+        self.interval_s = interval_s
+        self._running = False
+        self._task: asyncio.Task | None = None
+    
+    @property
+    def enabled(self) -> bool:
+        return self.media is not None or (self.sessions.archive is not None and bool(
+            self.archive_after_days or self.delete_archived_after_days or self.max_messages
+        ))
+    
+    async def start(self) -> None:
+        """Start the retention service."""
+        if not self.enabled:
+            logger.info("Session retention disabled")
+            return
+        
+        self._running = True
+        self._task = asyncio.create_task(self._run_loop())
+        logger.info(f"Session retention started (every {self.interval_s / 3600:g}h)")
+    
+    def stop(self) -> None:
+        """Stop the retention service."""
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+    
+    async def _run_loop(self) -> None:
+        """Main retention loop; the first run waits a few minutes so startup stays fast."""
+        delay = min(300.0, self.interval_s)
+        while self._running:
+            try:
+                await asyncio.sleep(delay)
+                delay = self.interval_s
+                if self._running:
+                    self.run_once()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Session retention error: {e}")
+    
+    def run_once(self) -> dict[str, int]:
+        """
+        Apply the retention policy once.
+        
+        Returns:
+            Counts of archived sessions, trimmed messages, deleted archives and
+            deleted media files.
+        """
+        stats = {"archived": 0, "trimmed": 0, "purged": 0}
+        archive = self.sessions.archive
+        if archive is not None:
+            if self.archive_after_days:
+                stats["archived"] = len(self.sessions.archive_idle(self.archive_after_days))
+            if self.max_messages:
+                stats["trimmed"] = self.sessions.trim_history(self.max_messages)
+            if self.delete_archived_after_days:
+                stats["purged"] = archive.purge(self.delete_archived_after_days)
+        
+            if any(stats.values()):
+                logger.info(
+                    f"Session retention: {stats['archived']} sessions archived, "
+                    f"{stats['trimmed']} messages trimmed, {stats['purged']} archives deleted"
+                )
+        
+        if self.media is not None:
+            # After archiving, so media of archived sessions loses its references
+            live = [info["key"] for info in self.sessions.list_sessions()]
+            stats["media"] = self.media.gc(live)["deleted"]
+        return stats
@@ -0,0 +1,213 @@
+"""Full-text search over session histories."""
+
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.session.store import SessionStore
+from nanobot.session.types import Session
+from nanobot.utils.helpers import ensure_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    session_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    timestamp TEXT,
+    content TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS entries_session ON entries (session_key, seq);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    content, content='entries', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+
+CREATE TABLE IF NOT EXISTS indexed (
+    session_key TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    updated_at TEXT
+);
+"""
+
+# Only the conversation itself is indexed; tool calls and results are noise
+_ROLES = ("user", "assistant")
+
+
+@dataclass
+class SessionHit:
+    """A message matching a search."""
+    session_key: str
+    seq: int  # Index of the message in its session
+    role: str
+    timestamp: str | None
+    snippet: str  # Matching excerpt, with matched terms in **bold**
+    score: float  # BM25 relevance, higher is better
+
+
+class SessionIndex:
+    """
+    Inverted (SQLite FTS5) index over the messages of every session.
+    
+    Stores report what they write (see SessionStore.on_write), so the index
+    grows with each save instead of being rebuilt. sync() catches up with
+    history written without it, e.g. before the index existed. Queries are
+    index lookups, so their cost does not grow with the size of the history.
+    """
+    
+    def __init__(self, path: Path):
+        ensure_dir(path.parent)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+    
+    def attach(self, store: SessionStore) -> None:
+        """Index everything the store writes from now on."""
+        store.on_write = self.update
+        store.on_delete = self.remove
+    
+    def update(self, session: Session, first: int) -> None:
+        """Index a save that wrote the session's messages from index first on."""
+        self._index(
+            session.key,
+            first,
+            session.messages[first - session.offset:],
+            session.updated_at.isoformat(),
+        )
+    
+    def remove(self, key: str) -> None:
+        """Drop a deleted session from the index."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute("DELETE FROM entries WHERE session_key = ?", (key,))
+            self._db.execute("DELETE FROM indexed WHERE session_key = ?", (key,))
+            self._db.execute("COMMIT")
+    
+    def sync(self, store: SessionStore) -> int:
+        """
+        Index whatever the store holds that the index has not seen.
+        
+        Sessions whose message count and update time match the index are
+        skipped; grown sessions only have their new messages read.
+        
+        Returns:
+            Number of messages read from the store.
+        """
+        with self._lock:
+            known = {
+                key: (count, updated_at)
+                for key, count, updated_at in self._db.execute("SELECT session_key, count, updated_at FROM indexed")
+            }
+        
+        read = 0
+        for info in store.list_sessions():
+            key = info["key"]
+            count, updated_at = info.get("messages"), info.get("updated_at")
+            have = known.pop(key, None)
+            if have is not None and have[1] == updated_at and count in (None, have[0]):
+                continue
+            # Grown since it was indexed, or changed in a way that needs a full pass
+            start = have[0] if have is not None and count is not None and count > have[0] else 0
+            try:
+                messages = store.read_messages(key, start)
+            except Exception as e:
+                logger.warning(f"Failed to index session {key}: {e}")
+                continue
+            self._index(key, start, messages, updated_at)
+            read += len(messages)
+        
+        for key in known:
+            self.remove(key)
+        return read
+    
+    def search(self, query: str, limit: int = 10, session_key: str | None = None) -> list[SessionHit]:
+        """
+        Find the messages that best match a query.
+        
+        Args:
+            query: Keywords; messages matching more (and rarer) ones rank higher.
+            limit: Maximum hits.
+            session_key: Only search this session.
+        
+        Returns:
+            Hits, most relevant first.
+        """
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return []
+        match = " OR ".join(f'"{t}"' for t in dict.fromkeys(terms))
+        
+        sql = (
+            "SELECT e.session_key, e.seq, e.role, e.timestamp, "
+            "snippet(entries_fts, 0, '**', '**', ' ... ', 24), bm25(entries_fts) "
+            "FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid "
+            "WHERE entries_fts MATCH ?"
+        )
+        params: list[Any] = [match]
+        if session_key is not None:
+            sql += " AND e.session_key = ?"
+            params.append(session_key)
+        sql += " ORDER BY bm25(entries_fts) LIMIT ?"
+        params.append(limit)
+        
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            SessionHit(key, seq, role, timestamp, snippet, -score)
+            for key, seq, role, timestamp, snippet, score in rows
+        ]
+    
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+    
+    def _index(self, key: str, first: int, messages: list[dict[str, Any]], updated_at: str | None) -> None:
+        """Replace the indexed messages of a session from index first on."""
+        rows = []
+        for seq, msg in enumerate(messages, start=first):
+            text = _text(msg)
+            if msg.get("role") in _ROLES and text:
+                rows.append((key, seq, msg["role"], msg.get("timestamp"), text))
+        
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("DELETE FROM entries WHERE session_key = ? AND seq >= ?", (key, first))
+                self._db.executemany(
+                    "INSERT INTO entries (session_key, seq, role, timestamp, content) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._db.execute(
+                    "INSERT INTO indexed (session_key, count, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (session_key) DO UPDATE SET "
+                    "count = excluded.count, updated_at = excluded.updated_at",
+                    (key, first + len(messages), updated_at),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+
+def _text(message: dict[str, Any]) -> str:
+    """Get the searchable text of a message."""
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(p.get("text", "") for p in content if isinstance(p, dict))
+    return ""
@@ -0,0 +1,254 @@
+"""SQLite session storage."""
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from nanobot.session.store import SessionStore, _continues, _with_tokens
+from nanobot.session.types import Session
+from nanobot.utils.helpers import ensure_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+
+CREATE TABLE IF NOT EXISTS messages (
+    session_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT,
+    timestamp TEXT,
+    tokens INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_key, seq)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class _RowState:
+    count: int  # Messages stored
+    last: dict[str, Any] | None  # The newest stored message, as held by the session
+    updated_at: str  # updated_at of the stored row
+    version: int  # PRAGMA data_version when the row was last read or written
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Stores sessions in a SQLite database in WAL mode.
+    
+    Each save is one transaction that inserts the new messages and updates
+    the session row. Messages are keyed by (session, sequence number), so
+    loading the newest ones and listing sessions by update time are index
+    lookups.
+    
+    Other processes may use the same database. PRAGMA data_version tells
+    whether any of them committed since a session was last synced, so
+    refreshing an unchanged session costs no query on the session itself.
+    """
+    
+    def __init__(self, path: Path, load_tokens: int | None = None):
+        super().__init__(load_tokens)
+        ensure_dir(path.parent)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+    
+    def load(self, key: str, full: bool = False) -> Session | None:
+        with self._lock:
+            return self._load(key, full)
+    
+    def _load(self, key: str, full: bool = False) -> Session | None:
+        # Read before the data, so a commit in between is noticed by the next refresh
+        version = self._data_version()
+        row = self._db.execute(
+            "SELECT created_at, updated_at, metadata, message_count FROM sessions WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        created_at, updated_at, metadata_json, count = row
+        metadata = json.loads(metadata_json)
+        
+        start = 0 if full else metadata.get("summary", {}).get("upto", 0)
+        cursor = self._db.execute(
+            "SELECT data FROM messages WHERE session_key = ? AND seq >= ? ORDER BY seq DESC",
+            (key, start),
+        )
+        if full:
+            messages = [_with_tokens(json.loads(data)) for (data,) in cursor]
+            messages.reverse()
+        else:
+            messages = self._window((_with_tokens(json.loads(data)) for (data,) in cursor), count, start)
+        cursor.close()
+        
+        self._states[key] = _RowState(count, messages[-1] if messages else None, updated_at, version)
+        return Session(
+            key=key,
+            messages=messages,
+            created_at=datetime.fromisoformat(created_at),
+            updated_at=datetime.fromisoformat(updated_at),
+            metadata=metadata,
+            offset=count - len(messages),
+        )
+    
+    def read_messages(self, key: str, start: int = 0) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM messages WHERE session_key = ? AND seq >= ? ORDER BY seq", (key, start)
+            ).fetchall()
+        return [_with_tokens(json.loads(data)) for (data,) in rows]
+    
+    def refresh(self, session: Session) -> bool:
+        state = self._states.get(session.key)
+        if state is None or not _continues(session, state):
+            return False
+        with self._lock:
+            return self._catch_up(session, state, self._data_version(), keep_metadata=False)
+    
+    def _catch_up(self, session: Session, state: _RowState, version: int, keep_metadata: bool) -> bool:
+        """Merge what other connections stored for the session since it was last synced."""
+        if version == state.version:
+            return False  # Nobody else committed anything
+        state.version = version
+        row = self._db.execute(
+            "SELECT updated_at, metadata, message_count FROM sessions WHERE key = ?", (session.key,)
+        ).fetchone()
+        if row is None:
+            return False
+        updated_at, metadata_json, count = row
+        if count == state.count and updated_at == state.updated_at:
+            return False
+        
+        # Appended to, if the newest message we know of is still in place
+        last = None
+        if state.count:
+            last = self._db.execute(
+                "SELECT data FROM messages WHERE session_key = ? AND seq = ?", (session.key, state.count - 1)
+            ).fetchone()
+        if count >= state.count and (not state.count or (last and _with_tokens(json.loads(last[0])) == state.last)):
+            stored = [
+                _with_tokens(json.loads(data)) for (data,) in self._db.execute(
+                    "SELECT data FROM messages WHERE session_key = ? AND seq >= ? ORDER BY seq",
+                    (session.key, state.count),
+                )
+            ]
+            self._merge(session, state, stored, None if keep_metadata else json.loads(metadata_json), updated_at)
+            state.updated_at = updated_at
+            return True
+        
+        # Rewritten (e.g. cleared) elsewhere: load it again
+        unsaved = session.messages[state.count - session.offset:]
+        fresh = self._load(session.key)
+        if fresh is None:
+            return False
+        self._replace(session, fresh, unsaved, keep_metadata)
+        return True
+    
+    def save(self, session: Session) -> None:
+        with self._lock:
+            # Take the write lock up front, so the merge below sees the final state
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                version = self._data_version()
+                state = self._states.get(session.key)
+                if state is not None and _continues(session, state):
+                    # Keep messages that other processes added meanwhile
+                    self._catch_up(session, state, version, keep_metadata=True)
+                    state = self._states[session.key]
+                total = session.offset + len(session.messages)
+                # Append after what is stored, or replace everything from the loaded window on
+                first = state.count if state is not None and _continues(session, state) else session.offset
+                rows = [
+                    _message_row(session.key, seq, msg)
+                    for seq, msg in enumerate(session.messages[first - session.offset:], start=first)
+                ]
+                
+                if state is None or first != state.count:
+                    self._db.execute(
+                        "DELETE FROM messages WHERE session_key = ? AND seq >= ?", (session.key, first)
+                    )
+                self._db.executemany(
+                    "INSERT INTO messages (session_key, seq, role, content, timestamp, tokens, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._db.execute(
+                    "INSERT INTO sessions (key, created_at, updated_at, metadata, message_count) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                    "updated_at = excluded.updated_at, metadata = excluded.metadata, "
+                    "message_count = excluded.message_count",
+                    (
+                        session.key,
+                        session.created_at.isoformat(),
+                        session.updated_at.isoformat(),
+                        json.dumps(session.metadata),
+                        total,
+                    ),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        
+        self._states[session.key] = _RowState(
+            total, session.messages[-1] if session.messages else None, session.updated_at.isoformat(), version
+        )
+        self._written(session, first)
+    
+    def delete(self, key: str) -> bool:
+        self._states.pop(key, None)
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.execute("DELETE FROM messages WHERE session_key = ?", (key,))
+            deleted = self._db.execute("DELETE FROM sessions WHERE key = ?", (key,)).rowcount
+            self._db.execute("COMMIT")
+        if deleted:
+            self._deleted(key)
+        return deleted > 0
+    
+    def list_sessions(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, created_at, updated_at, message_count FROM sessions ORDER BY updated_at DESC"
+            ).fetchall()
+        return [
+            {"key": key, "created_at": created_at, "updated_at": updated_at, "messages": count, "path": str(self.path)}
+            for key, created_at, updated_at, count in rows
+        ]
+    
+    def compact_all(self) -> None:
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._db.execute("VACUUM")
+    
+    def disk_usage(self) -> int:
+        paths = [self.path, self.path.with_name(self.path.name + "-wal")]
+        return sum(p.stat().st_size for p in paths if p.exists())
+    
+    def _data_version(self) -> int:
+        return self._db.execute("PRAGMA data_version").fetchone()[0]
+    
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _message_row(key: str, seq: int, msg: dict[str, Any]) -> tuple[Any, ...]:
+    content = msg.get("content")
+    if content is not None and not isinstance(content, str):
+        content = json.dumps(content)
+    return (key, seq, msg.get("role", ""), content, msg.get("timestamp"), msg.get("tokens", 0), json.dumps(msg))
@@ -0,0 +1,579 @@
+"""Session storage backends."""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
+
+from loguru import logger
+
+from nanobot.session.types import Session
+from nanobot.utils.filelock import lock_for
+from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.utils.tokens import content_tokens
+
+
+class SessionStore(ABC):
+    """
+    Abstract base class for session storage.
+    
+    A store remembers how many messages of each session it holds, so saving
+    only writes what was added since; a session that no longer extends what
+    was stored (e.g. it was cleared) is rewritten.
+    
+    Several processes may share a store. Saving first merges messages that
+    others stored meanwhile, and refresh() picks up their changes without
+    reloading sessions that did not change.
+    """
+    
+    def __init__(self, load_tokens: int | None = None):
+        """
+        Args:
+            load_tokens: Token budget of the history window. Loading stops once
+                this many tokens of messages after the summary are read
+                (None loads everything after the summary).
+        """
+        self.load_tokens = load_tokens
+        self._states: dict[str, Any] = {}  # key -> state with .count and .last
+        # Told about every write: (session, index of the first message written)
+        self.on_write: Callable[[Session, int], None] | None = None
+        self.on_delete: Callable[[str], None] | None = None
+    
+    @abstractmethod
+    def load(self, key: str, full: bool = False) -> Session | None:
+        """
+        Load a session.
+        
+        Args:
+            key: Session key.
+            full: Load every message, ignoring the summary and load_tokens.
+        
+        Returns:
+            The session, or None if it does not exist.
+        """
+        pass
+    
+    @abstractmethod
+    def save(self, session: Session) -> None:
+        """Persist a session's new messages and metadata."""
+        pass
+    
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete a session; returns False if it did not exist."""
+        pass
+    
+    @abstractmethod
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """List sessions (key, created_at, updated_at, ...), most recently updated first."""
+        pass
+    
+    def read_messages(self, key: str, start: int = 0) -> list[dict[str, Any]]:
+        """Read the messages of a session from index start on, leaving loaded sessions alone."""
+        state = self._states.get(key)
+        session = self.load(key, full=True)
+        if state is not None:
+            self._states[key] = state
+        else:
+            self._states.pop(key, None)
+        return session.messages[start:] if session else []
+    
+    def refresh(self, session: Session) -> bool:
+        """
+        Pick up changes that other processes stored for a loaded session.
+        
+        Their messages are inserted before any unsaved ones and their metadata
+        replaces the session's. A session that no longer extends what was
+        stored (e.g. it was cleared) is left alone; saving it overwrites theirs.
+        
+        Returns:
+            True if the session changed.
+        """
+        return False
+    
+    def compact(self, session: Session) -> None:
+        """Reclaim space taken by superseded data of a session."""
+        self.save(session)
+    
+    def compact_all(self) -> None:
+        """Reclaim space taken by superseded data of every session."""
+        for info in self.list_sessions():
+            session = self.load(info["key"])
+            if session is not None:
+                self.compact(session)
+            self.forget(info["key"])
+    
+    def disk_usage(self) -> int:
+        """Get the bytes the store takes on disk."""
+        return 0
+    
+    def close(self) -> None:
+        """Release any resources held by the store."""
+        pass
+    
+    def is_saved(self, session: Session) -> bool:
+        """Check whether everything in the session has been stored."""
+        state = self._states.get(session.key)
+        if state is None:
+            return not session.messages
+        return state.count == session.offset + len(session.messages) and _continues(session, state)
+    
+    def forget(self, key: str) -> None:
+        """Drop what the store remembers about a session that left memory."""
+        self._states.pop(key, None)
+    
+    def _window(self, newest_first: Iterable[dict[str, Any]], count: int, start: int) -> list[dict[str, Any]]:
+        """
+        Collect the messages a session needs in memory.
+        
+        Args:
+            newest_first: The session's messages, newest first.
+            count: Total messages in the session.
+            start: Index of the first message after the summary.
+        
+        Returns:
+            The messages to load, oldest first.
+        """
+        messages: list[dict[str, Any]] = []
+        tokens = 0
+        for data in newest_first:
+            if count - len(messages) <= start:
+                break
+            # Enough for the history window, which must open with a user message
+            if (
+                self.load_tokens is not None and tokens >= self.load_tokens
+                and messages and messages[-1]["role"] == "user"
+            ):
+                break
+            messages.append(data)
+            tokens += data.get("tokens", 0)
+        messages.reverse()
+        return messages
+    
+    def _written(self, session: Session, first: int) -> None:
+        """Tell the write listener which messages were stored."""
+        if self.on_write:
+            try:
+                self.on_write(session, first)
+            except Exception as e:
+                logger.warning(f"Session write listener failed for {session.key}: {e}")
+    
+    def _deleted(self, key: str) -> None:
+        if self.on_delete:
+            try:
+                self.on_delete(key)
+            except Exception as e:
+                logger.warning(f"Session delete listener failed for {key}: {e}")
+    
+    def _merge(
+        self,
+        session: Session,
+        state: Any,
+        stored: list[dict[str, Any]],
+        metadata: dict[str, Any] | None,
+        updated_at: str | None,
+    ) -> None:
+        """Insert messages stored elsewhere after the stored ones, before the unsaved ones."""
+        at = state.count - session.offset
+        session.messages = session.messages[:at] + stored + session.messages[at:]
+        state.count += len(stored)
+        if stored:
+            state.last = stored[-1]
+        if metadata is not None:
+            session.metadata = metadata
+            if updated_at:
+                session.updated_at = datetime.fromisoformat(updated_at)
+    
+    def _replace(
+        self, session: Session, fresh: Session, unsaved: list[dict[str, Any]], keep_metadata: bool
+    ) -> None:
+        """Swap in a freshly loaded copy of the session, followed by its unsaved messages."""
+        session.messages = fresh.messages + unsaved
+        session.offset = fresh.offset
+        if not keep_metadata:
+            session.metadata = fresh.metadata
+            session.updated_at = fresh.updated_at
+
+
+@dataclass
+class _LogState:
+    """What the store knows about a session file it has read or written."""
+    count: int  # Messages in the file
+    last: dict[str, Any] | None  # The newest message in the file, as held by the session
+    size: int  # File size in bytes
+    footer: int  # Size of the newest metadata record
+    dead: int  # Bytes taken by superseded metadata records
+    inode: int  # Identifies the file; compaction elsewhere replaces it
+    rewrite: bool = False  # The file must be rewritten before it can be appended to
+
+
+class JsonlSessionStore(SessionStore):
+    """
+    Stores each session as an append-only JSONL log.
+    
+    Saving appends the new messages plus a metadata record, so its cost does
+    not depend on the length of the conversation. The newest metadata record
+    is always the last line, which lets loading read the file backwards and
+    stop once it has enough history. Superseded metadata records are dropped
+    by compaction once they outweigh the rest of the file.
+    
+    Writes hold a lock on the sessions directory. A file that grew since this
+    process last touched it had messages appended elsewhere; only those bytes
+    are read to catch up. A file that was replaced is loaded again.
+    """
+    
+    # Compact once superseded records take more space than this and the live data
+    COMPACT_MIN_BYTES = 64 * 1024
+    
+    def __init__(self, sessions_dir: Path, load_tokens: int | None = None):
+        super().__init__(load_tokens)
+        self.sessions_dir = ensure_dir(sessions_dir)
+        self._lock = lock_for(self.sessions_dir / ".lock")
+    
+    def _get_session_path(self, key: str) -> Path:
+        """Get the file path for a session."""
+        safe_key = safe_filename(key.replace(":", "_"))
+        return self.sessions_dir / f"{safe_key}.jsonl"
+    
+    def load(self, key: str, full: bool = False) -> Session | None:
+        """Load a session from disk, reading only the tail when the file allows it."""
+        path = self._get_session_path(key)
+        
+        if not path.exists():
+            return None
+        
+        try:
+            with open(path, "rb") as f:
+                lines = _reverse_lines(f)
+                footer = next(lines, b"")
+                record = _parse(footer)
+                if full or record is None or record.get("_type") != "metadata" or "messages" not in record:
+                    # Old format (metadata first) or a torn write: read everything
+                    return self._load_full(key, path)
+                
+                count = record["messages"]
+                start = record.get("metadata", {}).get("summary", {}).get("upto", 0)
+                messages = self._window(_records(lines), count, start)
+                size = f.seek(0, os.SEEK_END)
+                inode = os.fstat(f.fileno()).st_ino
+        except Exception as e:
+            logger.warning(f"Failed to load session {key}: {e}")
+            return None
+        
+        self._states[key] = _LogState(
+            count=count,
+            last=messages[-1] if messages else None,
+            size=size,
+            footer=len(footer) + 1,
+            dead=record.get("dead", 0),
+            inode=inode,
+        )
+        return _session_from_record(key, record, messages, offset=count - len(messages))
+    
+    def _load_full(self, key: str, path: Path) -> Session | None:
+        """Parse a whole session file, tolerating a torn last line."""
+        messages = []
+        record: dict[str, Any] = {}
+        clean = True
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                data = _parse(line)
+                if data is None:
+                    clean = False
+                elif data.get("_type") == "metadata":
+                    record = data
+                else:
+                    messages.append(data)
+            size = f.tell()
+            inode = os.fstat(f.fileno()).st_ino
+        
+        self._states[key] = _LogState(
+            count=len(messages),
+            last=messages[-1] if messages else None,
+            size=size,
+            footer=0,
+            dead=0,
+            inode=inode,
+            rewrite=not clean,
+        )
+        return _session_from_record(key, record, messages)
+    
+    def read_messages(self, key: str, start: int = 0) -> list[dict[str, Any]]:
+        path = self._get_session_path(key)
+        if not path.exists():
+            return []
+        with open(path, "rb") as f:
+            lines = _reverse_lines(f)
+            record = _parse(next(lines, b""))
+            if record is None or record.get("_type") != "metadata" or "messages" not in record:
+                return super().read_messages(key, start)
+            wanted = record["messages"] - start
+            messages = [m for _, m in zip(range(wanted), _records(lines))] if wanted > 0 else []
+        messages.reverse()
+        return messages
+    
+    def refresh(self, session: Session) -> bool:
+        state = self._states.get(session.key)
+        if state is None or not _continues(session, state):
+            return False
+        return self._catch_up(session, state, keep_metadata=False)
+    
+    def _catch_up(self, session: Session, state: _LogState, keep_metadata: bool) -> bool:
+        """Merge what other processes stored in the session file since it was last read."""
+        path = self._get_session_path(session.key)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if st.st_ino == state.inode and st.st_size == state.size:
+            return False
+        
+        if st.st_ino == state.inode and st.st_size > state.size and not state.rewrite:
+            with open(path, "rb") as f:
+                f.seek(state.size)
+                appended = f.read(st.st_size - state.size)
+            messages, record, used, footer = _appended(appended)
+            if record is None:
+                return False  # A save in progress; its metadata record is not written yet
+            if record.get("messages") == state.count + len(messages):
+                self._merge(
+                    session, state, messages,
+                    None if keep_metadata else record.get("metadata", {}), record.get("updated_at"),
+                )
+                state.size += used
+                state.dead = record.get("dead", 0)
+                state.footer = footer
+                return True
+        
+        # Replaced (e.g. compacted or cleared) elsewhere: load it again
+        unsaved = session.messages[state.count - session.offset:]
+        fresh = self.load(session.key)
+        if fresh is None:
+            return False
+        self._replace(session, fresh, unsaved, keep_metadata)
+        return True
+    
+    def save(self, session: Session) -> None:
+        """Save a session to disk, appending to its log when possible."""
+        with self._lock:
+            self._save(session)
+    
+    def _save(self, session: Session) -> None:
+        path = self._get_session_path(session.key)
+        state = self._states.get(session.key)
+        if state is not None and _continues(session, state):
+            # Keep messages that other processes added meanwhile
+            self._catch_up(session, state, keep_metadata=True)
+            state = self._states[session.key]
+        total = session.offset + len(session.messages)
+        
+        if state is None or state.rewrite or not path.exists() or not _continues(session, state):
+            self._rewrite(session, path)
+            self._written(session, session.offset)
+            return
+        
+        first = state.count
+        new = session.messages[state.count - session.offset:]
+        data = b"".join(_dump(m) for m in new)
+        footer = _dump(_metadata_record(session, total, state.dead + state.footer))
+        with open(path, "ab") as f:
+            f.write(data + footer)
+        state.count = total
+        state.last = session.messages[-1] if session.messages else None
+        state.size += len(data) + len(footer)
+        state.dead += state.footer
+        state.footer = len(footer)
+        if state.dead > max(self.COMPACT_MIN_BYTES, state.size - state.dead):
+            self._rewrite(session, path)
+        self._written(session, first)
+    
+    def compact(self, session: Session) -> None:
+        """Rewrite a session file without superseded records."""
+        with self._lock:
+            state = self._states.get(session.key)
+            if state is not None and _continues(session, state):
+                self._catch_up(session, state, keep_metadata=True)
+            self._rewrite(session, self._get_session_path(session.key))
+    
+    def _rewrite(self, session: Session, path: Path) -> None:
+        """Write a fresh log; messages that were not loaded are copied from the old file."""
+        total = session.offset + len(session.messages)
+        footer = _dump(_metadata_record(session, total, 0))
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as out:
+            if session.offset:
+                copied = 0
+                with open(path, "rb") as f:
+                    for line in f:
+                        if copied == session.offset:
+                            break
+                        data = _parse(line)
+                        if data is None or data.get("_type") == "metadata":
+                            continue
+                        out.write(line if line.endswith(b"\n") else line + b"\n")
+                        copied += 1
+            for msg in session.messages:
+                out.write(_dump(msg))
+            out.write(footer)
+            size = out.tell()
+            inode = os.fstat(out.fileno()).st_ino
+        tmp.replace(path)
+        
+        self._states[session.key] = _LogState(
+            count=total,
+            last=session.messages[-1] if session.messages else None,
+            size=size,
+            footer=len(footer),
+            dead=0,
+            inode=inode,
+        )
+    
+    def delete(self, key: str) -> bool:
+        self._states.pop(key, None)
+        path = self._get_session_path(key)
+        with self._lock:
+            if not path.exists():
+                return False
+            path.unlink()
+        self._deleted(key)
+        return True
+    
+    def disk_usage(self) -> int:
+        return sum(p.stat().st_size for p in self.sessions_dir.glob("*.jsonl"))
+    
+    def list_sessions(self) -> list[dict[str, Any]]:
+        sessions = []
+        
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                # Read just the metadata record: the last line, or the first in old files
+                with open(path, "rb") as f:
+                    data = _parse(next(_reverse_lines(f), b""))
+                    if data is None or data.get("_type") != "metadata":
+                        f.seek(0)
+                        data = _parse(f.readline())
+                if data and data.get("_type") == "metadata":
+                    sessions.append({
+                        # Old files lack the key; channel names have no "_", chat IDs might
+                        "key": data.get("key") or path.stem.replace("_", ":", 1),
+                        "created_at": data.get("created_at"),
+                        "updated_at": data.get("updated_at"),
+                        "messages": data.get("messages"),
+                        "path": str(path)
+                    })
+            except Exception:
+                continue
+        
+        return sorted(sessions, key=lambda x: x.get("updated_at") or "", reverse=True)
+
+
+def _continues(session: Session, state: Any) -> bool:
+    """Check that the session still extends what was stored (e.g. was not cleared)."""
+    index = state.count - session.offset - 1
+    if index < 0:
+        return state.count == 0 and session.offset == 0
+    return index < len(session.messages) and session.messages[index] is state.last
+
+
+def _metadata_record(session: Session, count: int, dead: int) -> dict[str, Any]:
+    return {
+        "_type": "metadata",
+        "key": session.key,
+        "created_at": session.created_at.isoformat(),
+        "updated_at": session.updated_at.isoformat(),
+        "metadata": session.metadata,
+        "messages": count,
+        "dead": dead,
+    }
+
+
+def _session_from_record(
+    key: str, record: dict[str, Any], messages: list[dict[str, Any]], offset: int = 0
+) -> Session:
+    created_at = record.get("created_at")
+    updated_at = record.get("updated_at")
+    return Session(
+        key=key,
+        messages=messages,
+        created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+        updated_at=datetime.fromisoformat(updated_at) if updated_at else datetime.now(),
+        metadata=record.get("metadata", {}),
+        offset=offset,
+    )
+
+
+def _dump(data: dict[str, Any]) -> bytes:
+    return (json.dumps(data) + "\n").encode("utf-8")
+
+
+def _parse(line: bytes) -> dict[str, Any] | None:
+    """Parse one JSONL record, or return None if it is blank or malformed."""
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    return data if data.get("_type") == "metadata" else _with_tokens(data)
+
+
+def _with_tokens(message: dict[str, Any]) -> dict[str, Any]:
+    """Fill in the token count of a message saved before counts were stored."""
+    if "tokens" not in message:
+        message["tokens"] = content_tokens(message.get("content"))
+    return message
+
+
+def _appended(data: bytes) -> tuple[list[dict[str, Any]], dict[str, Any] | None, int, int]:
+    """
+    Parse records appended to a session log, up to the last metadata record.
+    
+    Returns:
+        (messages, metadata record or None, bytes consumed, size of the metadata record)
+    """
+    messages: list[dict[str, Any]] = []
+    pending: list[dict[str, Any]] = []
+    record = None
+    used = footer = pos = 0
+    while (end := data.find(b"\n", pos)) >= 0:
+        line, pos = data[pos:end], end + 1
+        parsed = _parse(line)
+        if parsed is None:
+            continue
+        if parsed.get("_type") == "metadata":
+            messages += pending
+            pending = []
+            record, used, footer = parsed, pos, len(line) + 1
+        else:
+            pending.append(parsed)
+    return messages, record, used, footer
+
+
+def _records(lines: Iterable[bytes]) -> Iterator[dict[str, Any]]:
+    """Parse message records, skipping metadata and malformed lines."""
+    for line in lines:
+        data = _parse(line)
+        if data is not None and data.get("_type") != "metadata":
+            yield data
+
+
+def _reverse_lines(f: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield the non-empty lines of a binary file from last to first."""
+    pos = f.seek(0, os.SEEK_END)
+    rest = b""
+    while pos > 0:
+        step = min(chunk_size, pos)
+        pos -= step
+        f.seek(pos)
+        parts = (f.read(step) + rest).split(b"\n")
+        rest = parts.pop(0)
+        for line in reversed(parts):
+            if line.strip():
+                yield line
+    if rest.strip():
+        yield rest
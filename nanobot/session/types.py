@@ -0,0 +1,124 @@
+"""Session types."""
+
+import copy
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from nanobot.utils.tokens import content_tokens, count_tokens, fit_newest
+
+
+@dataclass
+class Session:
+    """
+    A conversation session.
+    
+    Stores messages in JSONL format for easy reading and persistence. A session
+    loaded from disk may hold only the newest messages; `offset` counts the
+    older ones left on disk, and message indexes such as `summarized_upto`
+    count from the start of the whole conversation.
+    """
+    
+    key: str  # channel:chat_id
+    messages: list[dict[str, Any]] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    metadata: dict[str, Any] = field(default_factory=dict)
+    offset: int = 0  # Messages before messages[0] that were not loaded
+    
+    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
+        """Add a message to the session, storing its token count with it."""
+        msg = {
+            "role": role,
+            "content": content,
+            "timestamp": datetime.now().isoformat(),
+            "tokens": count_tokens(content),
+            **kwargs
+        }
+        self.messages.append(msg)
+        self.updated_at = datetime.now()
+    
+    @property
+    def summary(self) -> str | None:
+        """Rolling summary of the messages before summarized_upto."""
+        return self.metadata.get("summary", {}).get("text")
+    
+    @property
+    def summarized_upto(self) -> int:
+        """Number of leading messages covered by the summary."""
+        return self.metadata.get("summary", {}).get("upto", 0)
+    
+    def get_history(
+        self,
+        max_messages: int | None = 50,
+        max_tokens: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get message history for LLM context.
+        
+        Messages already covered by the session summary are left out.
+        
+        Args:
+            max_messages: Maximum messages to return (None for no limit).
+            max_tokens: Maximum total tokens; the newest messages that fit are kept.
+        
+        Returns:
+            List of messages in LLM format, each with its stored token count
+            under "tokens".
+        """
+        # Get recent messages
+        recent = self.messages[max(0, self.summarized_upto - self.offset):]
+        if max_messages is not None and len(recent) > max_messages:
+            recent = recent[-max_messages:]
+        
+        if max_tokens is not None:
+            recent = fit_newest(recent, max_tokens)
+        
+        # Convert to LLM format (role and content, plus the token count)
+        return [
+            {
+                "role": m["role"],
+                "content": m["content"],
+                "tokens": m["tokens"] if "tokens" in m else content_tokens(m["content"]),
+            }
+            for m in recent
+        ]
+    
+    def snapshot(self) -> "Session":
+        """
+        Copy the session, so another thread can save it while this one changes.
+        
+        Messages are not modified once added, so the copy shares them.
+        """
+        return Session(
+            key=self.key,
+            messages=list(self.messages),
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            metadata=copy.deepcopy(self.metadata),
+            offset=self.offset,
+        )
+    
+    def merge_saved(self, saved: "Session", copied: list[dict[str, Any]], offset: int) -> None:
+        """
+        Take over messages that saving a snapshot merged in from other processes.
+        
+        Args:
+            saved: The snapshot after it was saved.
+            copied: Its messages as they were copied from this session.
+            offset: Its offset as copied from this session.
+        """
+        if saved.messages is copied and saved.offset == offset:
+            return  # Nothing was merged
+        n = len(copied)
+        if self.offset != offset or len(self.messages) < n or (n and self.messages[n - 1] is not copied[-1]):
+            return  # Replaced meanwhile (e.g. cleared); its next save overwrites what is stored
+        self.messages = saved.messages + self.messages[n:]
+        self.offset = saved.offset
+    
+    def clear(self) -> None:
+        """Clear all messages in the session."""
+        self.messages = []
+        self.offset = 0
+        self.metadata.pop("summary", None)
+        self.updated_at = datetime.now()
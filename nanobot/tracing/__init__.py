@@ -0,0 +1,23 @@
+"""Per-turn tracing: span trees from inbound message to outbound dispatch."""
+
+from nanobot.tracing.loopmon import LoopMonitor
+from nanobot.tracing.tracer import (
+    Span,
+    Tracer,
+    current_trace_id,
+    get_tracer,
+    new_trace_id,
+    set_tracer,
+    span,
+)
+
+__all__ = [
+    "LoopMonitor",
+    "Span",
+    "Tracer",
+    "current_trace_id",
+    "get_tracer",
+    "new_trace_id",
+    "set_tracer",
+    "span",
+]
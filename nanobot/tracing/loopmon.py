@@ -0,0 +1,228 @@
+"""Event loop lag sampling and capture of what blocks the loop."""
+
+import asyncio
+import bisect
+import json
+import math
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.utils.aio import run_io
+from nanobot.utils.helpers import atomic_write
+
+# Upper bounds (ms) of the lag histogram buckets; one more bucket holds the rest
+LAG_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+@dataclass
+class Stall:
+    """A period in which the event loop was blocked beyond the threshold."""
+    ts: str  # When the stack was taken
+    blocked_ms: float  # How long the loop had been blocked at that point
+    task: str | None  # Task running on the loop, if the block is inside a coroutine
+    stack: str  # Innermost frames of the loop thread
+
+
+class LagHistogram:
+    """Counts of lag samples in fixed buckets."""
+    
+    def __init__(self, bounds: tuple[float, ...] = LAG_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def add(self, lag_ms: float) -> None:
+        """Record one sample."""
+        self.counts[bisect.bisect_left(self.bounds, lag_ms)] += 1
+        self.count += 1
+        self.total_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+    
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (0..1), capped at the maximum."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = self.bounds[i] if i < len(self.bounds) else self.max_ms
+                return min(float(bound), self.max_ms)
+        return self.max_ms
+    
+    def to_dict(self) -> dict[str, Any]:
+        buckets = {f"<={b}ms": c for b, c in zip(self.bounds, self.counts)}
+        buckets[f">{self.bounds[-1]}ms"] = self.counts[-1]
+        return {
+            "samples": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5), 2),
+            "p99_ms": round(self.percentile(0.99), 2),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": buckets,
+        }
+
+
+class LoopMonitor:
+    """
+    Samples event loop lag and reports what blocks the loop.
+    
+    A probe task sleeps interval_s at a time and records how much later than
+    asked it wakes up. A watchdog thread checks that the probe keeps waking
+    up; once the loop has been unresponsive for stall_ms, it takes the stack
+    of the loop thread, which shows the callback or coroutine hogging it.
+    Stats are logged and, with a status_path, written there periodically.
+    """
+    
+    def __init__(
+        self,
+        interval_s: float = 0.1,
+        stall_ms: float = 250,
+        status_path: Path | None = None,
+        report_interval_s: float = 60,
+        max_stalls: int = 20,
+        enabled: bool = True,
+    ):
+        self.interval_s = interval_s
+        self.stall_ms = stall_ms
+        self.status_path = status_path
+        self.report_interval_s = report_interval_s
+        self.enabled = enabled
+        self.histogram = LagHistogram()
+        self.stalls: deque[Stall] = deque(maxlen=max_stalls)  # Most recent stalls
+        self.stall_count = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._beat = 0.0  # time.monotonic() of the probe's last wake-up
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+    
+    async def start(self) -> None:
+        """Start sampling the running event loop."""
+        if not self.enabled:
+            logger.info("Event loop monitor disabled")
+            return
+        
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._run_loop())
+        self._watchdog = threading.Thread(target=self._watch, name="nanobot-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (stall threshold {self.stall_ms:g} ms)")
+    
+    def stop(self) -> None:
+        """Stop sampling and write the final stats."""
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+            if self.status_path:
+                self._write_status()
+    
+    async def _run_loop(self) -> None:
+        """Probe loop: measure how late each sleep wakes up."""
+        loop = asyncio.get_running_loop()
+        next_report = time.monotonic() + self.report_interval_s
+        while not self._stop.is_set():
+            try:
+                start = loop.time()
+                await asyncio.sleep(self.interval_s)
+                lag_ms = max(0.0, (loop.time() - start - self.interval_s) * 1000)
+                self._beat = time.monotonic()
+                with self._lock:
+                    self.histogram.add(lag_ms)
+                if lag_ms >= self.stall_ms:
+                    logger.warning(f"Event loop was blocked for {lag_ms:.0f} ms")
+                
+                if time.monotonic() >= next_report:
+                    next_report = time.monotonic() + self.report_interval_s
+                    self._log_summary()
+                    if self.status_path:
+                        await run_io(self._write_status)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Event loop monitor error: {e}")
+    
+    def _watch(self) -> None:
+        """Watchdog thread: take the loop thread's stack once per stall."""
+        stalled = False
+        period = min(self.interval_s, self.stall_ms / 4000)
+        while not self._stop.wait(period):
+            blocked_ms = (time.monotonic() - self._beat - self.interval_s) * 1000
+            if blocked_ms < self.stall_ms:
+                stalled = False
+            elif not stalled:
+                stalled = True
+                self._capture(blocked_ms)
+    
+    def _capture(self, blocked_ms: float) -> None:
+        """Record and log what the loop thread is doing right now."""
+        frame = sys._current_frames().get(self._loop_thread)
+        stack = "".join(traceback.format_stack(frame, limit=20)) if frame is not None else ""
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        name = None
+        if task is not None:
+            coro = task.get_coro()
+            name = f"{task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+        
+        stall = Stall(
+            ts=datetime.now().isoformat(timespec="seconds"),
+            blocked_ms=round(blocked_ms, 1),
+            task=name,
+            stack=stack,
+        )
+        with self._lock:
+            self.stalls.append(stall)
+            self.stall_count += 1
+        logger.warning(f"Event loop blocked for {blocked_ms:.0f} ms" + (f" in task {name}" if name else "") + f":\n{stack}")
+    
+    def _log_summary(self) -> None:
+        lag = self.stats()["lag"]
+        logger.debug(
+            f"Event loop lag: p50 {lag['p50_ms']:g} ms, p99 {lag['p99_ms']:g} ms, "
+            f"max {lag['max_ms']:g} ms, {self.stall_count} stalls"
+        )
+    
+    def stats(self) -> dict[str, Any]:
+        """Get the lag histogram and the most recent stalls."""
+        with self._lock:
+            return {
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+                "interval_ms": self.interval_s * 1000,
+                "stall_ms": self.stall_ms,
+                "lag": self.histogram.to_dict(),
+                "stalls": self.stall_count,
+                "recent_stalls": [asdict(s) for s in self.stalls],
+            }
+    
+    def _write_status(self) -> None:
+        try:
+            self.status_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.status_path, json.dumps(self.stats(), indent=2))
+        except OSError as e:
+            logger.warning(f"Failed to write loop status: {e}")
+
+
+def load_status(path: Path) -> dict[str, Any] | None:
+    """Read the stats a LoopMonitor wrote to status_path, or None if there are none."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
@@ -0,0 +1,149 @@
+"""Summaries of recorded traces for the `nanobot trace` command."""
+
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from nanobot.tracing.tracer import rotated_path
+
+
+@dataclass
+class PhaseStats:
+    """Latency statistics of one span name across traces."""
+    name: str
+    count: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+def load_traces(path: Path, backups: int = 3) -> list[dict[str, Any]]:
+    """
+    Load finished traces from a trace file and its rotated backups.
+    
+    Standalone span records (e.g. outbound dispatch) are merged into the
+    trace sharing their trace_id.
+    
+    Returns:
+        Traces in file order (oldest first).
+    """
+    files = [rotated_path(path, i) for i in range(backups, 0, -1)] + [path]
+    traces: dict[str, dict[str, Any]] = {}
+    orphans: list[dict[str, Any]] = []
+    
+    for file in files:
+        if not file.exists():
+            continue
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("type") == "trace":
+                    traces[record["trace_id"]] = record
+                elif record.get("type") == "span":
+                    orphans.append(record)
+    
+    for record in orphans:
+        trace = traces.get(record.get("trace_id", ""))
+        if trace is not None:
+            trace.setdefault("spans", []).append({
+                "id": None,
+                "parent": None,
+                "name": record["name"],
+                "duration_ms": record.get("duration_ms", 0.0),
+                "attrs": record.get("attrs", {}),
+                **({"error": record["error"]} if record.get("error") else {}),
+            })
+    
+    return list(traces.values())
+
+
+def slowest(traces: list[dict[str, Any]], limit: int = 10) -> list[dict[str, Any]]:
+    """Get the slowest traces by end-to-end duration."""
+    return sorted(traces, key=lambda t: t.get("duration_ms", 0.0), reverse=True)[:limit]
+
+
+def phase_totals(trace: dict[str, Any]) -> dict[str, float]:
+    """Sum span durations of one trace by span name."""
+    totals: dict[str, float] = {}
+    for span in trace.get("spans", []):
+        totals[span["name"]] = totals.get(span["name"], 0.0) + span.get("duration_ms", 0.0)
+    return totals
+
+
+def phase_breakdown(traces: list[dict[str, Any]]) -> list[PhaseStats]:
+    """
+    Compute per-phase latency statistics across traces.
+    
+    Returns:
+        One entry per span name, sorted by total time spent (descending).
+    """
+    durations: dict[str, list[float]] = {}
+    for trace in traces:
+        for span in trace.get("spans", []):
+            durations.setdefault(span["name"], []).append(span.get("duration_ms", 0.0))
+    
+    stats = [
+        PhaseStats(
+            name=name,
+            count=len(values),
+            total_ms=sum(values),
+            p50_ms=_percentile(values, 50),
+            p95_ms=_percentile(values, 95),
+            max_ms=max(values),
+        )
+        for name, values in durations.items()
+    ]
+    return sorted(stats, key=lambda s: s.total_ms, reverse=True)
+
+
+def cache_summary(traces: list[dict[str, Any]]) -> dict[str, int]:
+    """Total prompt tokens and prompt cache reads/writes over all LLM calls."""
+    totals = {"prompt_tokens": 0, "cache_read_tokens": 0, "cache_creation_tokens": 0}
+    for trace in traces:
+        for span in trace.get("spans", []):
+            if span["name"] != "llm.chat":
+                continue
+            attrs = span.get("attrs", {})
+            for key in totals:
+                totals[key] += attrs.get(key) or 0
+    return totals
+
+
+def find(traces: list[dict[str, Any]], trace_id: str) -> dict[str, Any] | None:
+    """Find a trace by ID or unique ID prefix."""
+    matches = [t for t in traces if t["trace_id"].startswith(trace_id)]
+    return matches[0] if len(matches) == 1 else None
+
+
+def span_tree(trace: dict[str, Any]) -> list[tuple[int, dict[str, Any]]]:
+    """Flatten a trace's spans into (depth, span) pairs in tree order."""
+    spans = trace.get("spans", [])
+    ids = {s["id"] for s in spans if s.get("id")}
+    children: dict[str | None, list[dict[str, Any]]] = {}
+    for span in spans:
+        parent = span.get("parent") if span.get("parent") in ids else None
+        children.setdefault(parent, []).append(span)
+    
+    result: list[tuple[int, dict[str, Any]]] = []
+    
+    def walk(parent: str | None, depth: int) -> None:
+        for span in sorted(children.get(parent, []), key=lambda s: s.get("start_ms", float("inf"))):
+            result.append((depth, span))
+            if span.get("id"):
+                walk(span["id"], depth + 1)
+    
+    walk(None, 0)
+    return result
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
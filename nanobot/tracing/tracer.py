@@ -0,0 +1,263 @@
+"""Per-turn span tracing written to a rotating JSONL file."""
+
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from loguru import logger
+
+from nanobot.utils.aio import running_loop, submit_io
+
+
+@dataclass
+class Span:
+    """A timed phase of a turn."""
+    
+    name: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    parent_id: str | None = None
+    start: float = field(default_factory=time.time)  # Wall-clock start (epoch seconds)
+    duration_ms: float = 0.0
+    attrs: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes (token counts, sizes, ...) to the span."""
+        self.attrs.update(attrs)
+    
+    def to_dict(self, origin: float) -> dict[str, Any]:
+        """Serialize the span with its start as an offset from origin."""
+        data: dict[str, Any] = {
+            "id": self.span_id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 2),
+            "duration_ms": round(self.duration_ms, 2),
+        }
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+@dataclass
+class _Trace:
+    """Spans collected for one trace until its root span finishes."""
+    root: Span
+    spans: list[Span] = field(default_factory=list)
+
+
+# The innermost open span of the current task, and the trace it belongs to
+_current: ContextVar[tuple[_Trace, Span] | None] = ContextVar("nanobot_trace_span", default=None)
+
+
+class Tracer:
+    """
+    Records a span tree per turn and appends finished traces to a JSONL file.
+    
+    Spans are tracked through a ContextVar, so tasks spawned inside a span
+    (e.g. concurrent tool calls) nest under it automatically. With no path
+    configured, spans are still timed but nothing is written. Records made
+    on the event loop are buffered and appended by the I/O pool in batches.
+    """
+    
+    def __init__(self, path: Path | None = None, max_bytes: int = 10 * 1024 * 1024, backups: int = 3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()  # Held while writing the file
+        self._pending: list[str] = []
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+    
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+    
+    @contextmanager
+    def trace(self, name: str, trace_id: str | None = None, start: float | None = None,
+              **attrs: Any) -> Iterator[Span]:
+        """
+        Open the root span of a new trace; the trace is written when it closes.
+        
+        Args:
+            name: Root span name (e.g. "turn").
+            trace_id: Correlation ID shared by every span of the trace.
+            start: Optional earlier wall-clock start (epoch seconds).
+            **attrs: Attributes for the root span.
+        """
+        root = Span(name=name, trace_id=trace_id or new_trace_id(), attrs=dict(attrs))
+        if start is not None:
+            root.start = start
+        trace = _Trace(root=root)
+        token = _current.set((trace, root))
+        try:
+            yield root
+        except BaseException as e:
+            root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.reset(token)
+            root.duration_ms = (time.time() - root.start) * 1000
+            self._write_trace(trace)
+    
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Span]:
+        """Time a child of the current span. Outside a trace the span is discarded."""
+        current = _current.get()
+        if current is None:
+            yield Span(name=name, trace_id="", attrs=dict(attrs))
+            return
+        
+        trace, parent = current
+        span = Span(name=name, trace_id=trace.root.trace_id, parent_id=parent.span_id, attrs=dict(attrs))
+        trace.spans.append(span)
+        token = _current.set((trace, span))
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - started) * 1000
+            _current.reset(token)
+    
+    def add_span(self, name: str, start: float, duration_ms: float, **attrs: Any) -> None:
+        """Attach an already-measured span (e.g. queue wait) to the current span."""
+        current = _current.get()
+        if current is None:
+            return
+        trace, parent = current
+        trace.spans.append(Span(
+            name=name,
+            trace_id=trace.root.trace_id,
+            parent_id=parent.span_id,
+            start=start,
+            duration_ms=duration_ms,
+            attrs=dict(attrs),
+        ))
+    
+    def record(self, trace_id: str, name: str, start: float, duration_ms: float,
+               error: str | None = None, **attrs: Any) -> None:
+        """Write a standalone span belonging to an already-finished trace."""
+        record: dict[str, Any] = {
+            "type": "span",
+            "trace_id": trace_id,
+            "name": name,
+            "ts": _iso(start),
+            "duration_ms": round(duration_ms, 2),
+            "attrs": attrs,
+        }
+        if error:
+            record["error"] = error
+        self._write(record)
+    
+    def _write_trace(self, trace: _Trace) -> None:
+        root = trace.root
+        record: dict[str, Any] = {
+            "type": "trace",
+            "trace_id": root.trace_id,
+            "span_id": root.span_id,
+            "name": root.name,
+            "ts": _iso(root.start),
+            "duration_ms": round(root.duration_ms, 2),
+            "attrs": root.attrs,
+            "spans": [s.to_dict(root.start) for s in trace.spans],
+        }
+        if root.error:
+            record["error"] = root.error
+        self._write(record)
+    
+    def _write(self, record: dict[str, Any]) -> None:
+        if self.path is None:
+            return
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._pending_lock:
+            self._pending.append(line)
+            if self._flush_scheduled:
+                return  # Goes out with the flush already queued
+            on_loop = self._flush_scheduled = running_loop() is not None
+        if on_loop:
+            submit_io(self.flush)
+        else:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Append buffered records to the trace file."""
+        with self._lock:
+            with self._pending_lock:
+                lines, self._pending = self._pending, []
+                self._flush_scheduled = False
+            if not lines or self.path is None:
+                return
+            data = "".join(lines)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._rotate(len(data))
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(data)
+            except OSError as e:
+                logger.warning(f"Failed to write trace: {e}")
+    
+    def _rotate(self, incoming: int) -> None:
+        """Shift traces.jsonl -> traces.1.jsonl -> ... once the file is full."""
+        if self.max_bytes <= 0 or not self.path.exists():
+            return
+        if self.path.stat().st_size + incoming <= self.max_bytes:
+            return
+        for i in range(self.backups, 0, -1):
+            src = self.path if i == 1 else rotated_path(self.path, i - 1)
+            dst = rotated_path(self.path, i)
+            if src.exists():
+                src.replace(dst)
+        if self.path.exists():
+            self.path.unlink()
+
+
+def rotated_path(path: Path, index: int) -> Path:
+    """Get the path of the index-th rotated backup of a trace file."""
+    return path.with_name(f"{path.stem}.{index}{path.suffix}")
+
+
+def new_trace_id() -> str:
+    """Generate a correlation ID for a new trace."""
+    return uuid.uuid4().hex[:16]
+
+
+def current_trace_id() -> str | None:
+    """Get the trace ID of the current task, if it is inside a trace."""
+    current = _current.get()
+    return current[0].root.trace_id if current else None
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts).isoformat(timespec="milliseconds")
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer."""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    """Replace the process-wide tracer (e.g. to enable file output)."""
+    global _tracer
+    _tracer = tracer
+
+
+def span(name: str, **attrs: Any):
+    """Time a child span of the current trace on the process-wide tracer."""
+    return _tracer.span(name, **attrs)
@@ -0,0 +1,88 @@
+"""Blocking I/O off the event loop."""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+# Enough to overlap slow disks without flooding them
+DEFAULT_IO_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_io_workers = DEFAULT_IO_WORKERS
+
+
+def set_io_workers(workers: int) -> None:
+    """Set the size of the I/O thread pool (takes effect when it is next created)."""
+    global _io_workers
+    _io_workers = max(1, workers)
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get the bounded thread pool shared by all file I/O."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_io_workers, thread_name_prefix="nanobot-io")
+        return _executor
+
+
+def running_loop() -> asyncio.AbstractEventLoop | None:
+    """Get the event loop running in this thread, or None (e.g. in an I/O thread)."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def submit_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+    """Run a blocking call in the I/O pool without waiting for it (e.g. from sync code)."""
+    ctx = contextvars.copy_context()
+    return get_io_executor().submit(ctx.run, functools.partial(func, *args, **kwargs))
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking call (file access, directory scans, ...) in the I/O pool.
+
+    The call sees the caller's context variables, so tracing spans opened
+    inside it nest under the caller's span.
+    """
+    ctx = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), ctx.run, functools.partial(func, *args, **kwargs))
+
+
+async def run_io_batch(calls: Iterable[Callable[[], T]]) -> list[T]:
+    """
+    Run several small blocking calls in one trip to the I/O pool.
+
+    Cheaper than one run_io() per call when each call is short (e.g. reading
+    a handful of small files), since the loop hands off work only once.
+    """
+    calls = list(calls)
+    if not calls:
+        return []
+    return await run_io(lambda: [call() for call in calls])
+
+
+async def read_text(path: Path, encoding: str = "utf-8") -> str:
+    """Read a text file in the I/O pool."""
+    return await run_io(path.read_text, encoding=encoding)
+
+
+async def read_bytes(path: Path) -> bytes:
+    """Read a binary file in the I/O pool."""
+    return await run_io(path.read_bytes)
+
+
+async def write_text(path: Path, content: str, encoding: str = "utf-8") -> None:
+    """Write a text file in the I/O pool."""
+    await run_io(path.write_text, content, encoding=encoding)
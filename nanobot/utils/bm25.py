@@ -0,0 +1,97 @@
+"""Incremental BM25 index for local lexical retrieval."""
+
+import math
+import re
+from collections import Counter
+from typing import Hashable
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Very common English words that carry no retrieval signal
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from has have how i if in into is it its me my "
+    "no not of on or our so than that the their them then there these they this to too us was "
+    "we what when where which who why will with you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase terms, dropping stopwords and single ASCII characters."""
+    return [
+        t for t in _TOKEN_RE.findall(text.lower())
+        if t not in _STOPWORDS and (len(t) > 1 or not t.isascii())
+    ]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an in-memory inverted index.
+    
+    Documents can be added, replaced and removed one at a time, so the index
+    can follow a changing corpus without being rebuilt.
+    """
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[Hashable, int]] = {}
+        self._lengths: dict[Hashable, int] = {}
+        self._doc_terms: dict[Hashable, list[str]] = {}
+        self._total_length = 0
+    
+    def __len__(self) -> int:
+        return len(self._lengths)
+    
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._lengths
+    
+    def add(self, doc_id: Hashable, text: str) -> None:
+        """Index a document, replacing any previous version with the same ID."""
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+        length = sum(terms.values())
+        self._lengths[doc_id] = length
+        self._doc_terms[doc_id] = list(terms)
+        self._total_length += length
+    
+    def remove(self, doc_id: Hashable) -> None:
+        """Remove a document from the index (no-op if absent)."""
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._doc_terms.pop(doc_id):
+            docs = self._postings[term]
+            del docs[doc_id]
+            if not docs:
+                del self._postings[term]
+    
+    def search(self, query: str, k: int = 10) -> list[tuple[Hashable, float]]:
+        """
+        Rank documents against a query.
+        
+        Args:
+            query: Free-text query.
+            k: Maximum results.
+        
+        Returns:
+            (doc_id, score) pairs with a positive score, best first.
+        """
+        n = len(self._lengths)
+        if n == 0:
+            return []
+        avg_length = self._total_length / n or 1.0
+        
+        scores: dict[Hashable, float] = {}
+        for term, qtf in Counter(tokenize(query)).items():
+            docs = self._postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, tf in docs.items():
+                norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + qtf * idf * tf * (self.k1 + 1) / norm
+        
+        return sorted(scores.items(), key=lambda item: (-item[1], str(item[0])))[:k]
@@ -0,0 +1,79 @@
+"""Memoization of file contents and values derived from files."""
+
+import os
+from pathlib import Path
+from typing import Any, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+# (mtime_ns, size) of a file, or None if it does not exist
+Fingerprint = tuple[int, int] | None
+
+
+def fingerprint(path: Path) -> Fingerprint:
+    """Get the cache fingerprint of a file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class FileCache:
+    """
+    Caches file reads and values derived from files.
+    
+    An entry is reused for as long as the (mtime, size) fingerprints of its
+    source files are unchanged, so a cache hit costs one stat() per source.
+    """
+    
+    def __init__(self):
+        self._values: dict[Hashable, tuple[Any, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def read_text(self, path: Path) -> str | None:
+        """Read a UTF-8 text file, or return None if it does not exist."""
+        return self.derive(("read", str(path)), [path], lambda: _read_text(path))
+    
+    def derive(self, key: Hashable, sources: list[Path], build: Callable[[], T]) -> T:
+        """
+        Get a value computed from files, rebuilding it only when they change.
+        
+        Args:
+            key: Cache key identifying the value.
+            sources: Files the value depends on (missing files are allowed).
+            build: Computes the value.
+        
+        Returns:
+            The cached or freshly built value.
+        """
+        stamp = tuple(fingerprint(p) for p in sources)
+        cached = self._values.get(key)
+        if cached is not None and cached[0] == stamp:
+            self.hits += 1
+            return cached[1]
+        
+        self.misses += 1
+        value = build()
+        self._values[key] = (stamp, value)
+        return value
+    
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._values.clear()
+    
+    def stats(self) -> dict[str, int]:
+        """Get hit/miss counters and the number of cached entries."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._values),
+        }
+
+
+def _read_text(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8")
+    except (FileNotFoundError, IsADirectoryError):
+        return None
@@ -0,0 +1,92 @@
+"""Advisory file locks for state shared between nanobot processes."""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of this process are serialized
+    fcntl = None
+
+
+class FileLock:
+    """
+    Exclusive advisory lock held on a lock file.
+    
+    Serializes writers across processes (flock) and across the threads of
+    this process. The lock is re-entrant within a thread, so a locked section
+    may call code that takes the same lock again. Locked sections are meant
+    to be short (read, merge, write): they block the calling thread.
+    
+    Get instances through lock_for(), so that every user of a path in this
+    process shares one lock; two flocks on the same file from one process
+    would otherwise wait for each other.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: int | None = None
+    
+    def acquire(self) -> None:
+        """Take the lock, waiting for other holders."""
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+    
+    def release(self) -> None:
+        """Release the lock."""
+        self._depth -= 1
+        try:
+            if self._depth == 0 and self._fd is not None:
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(self._fd, fcntl.LOCK_UN)
+                finally:
+                    os.close(self._fd)
+                    self._fd = None
+        finally:
+            self._thread_lock.release()
+    
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+
+_locks: dict[str, FileLock] = {}
+_locks_guard = threading.Lock()
+
+
+def lock_for(path: Path) -> FileLock:
+    """
+    Get this process's lock for a lock file.
+
+    Args:
+        path: The lock file; it is created on first use and never removed.
+
+    Returns:
+        The lock shared by every caller passing the same path.
+    """
+    key = os.path.abspath(path)
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = FileLock(Path(key))
+        return lock
@@ -1,5 +1,6 @@
 """Utility functions for nanobot."""
 
+import os
 from pathlib import Path
 from datetime import datetime
 
@@ -10,6 +11,14 @@ def ensure_dir(path: Path) -> Path:
     return path
 
 
+def atomic_write(path: Path, content: str) -> None:
+    """Replace a text file so that readers see either the old or the new content."""
+    # Unique per process, so concurrent writers never share a temp file
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(content, encoding="utf-8")
+    tmp.replace(path)
+
+
 def get_data_path() -> Path:
     """Get the nanobot data directory (~/.nanobot)."""
     return ensure_dir(Path.home() / ".nanobot")
@@ -0,0 +1,114 @@
+"""Token counting and budgeting for context assembly."""
+
+from functools import lru_cache
+from typing import Any
+
+# Fixed cost of a message's role/framing tokens in chat formats
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Rough cost of one attached image (a ~1024px image at high detail)
+IMAGE_TOKENS = 1000
+
+# Used when the model's context window is unknown
+DEFAULT_CONTEXT_WINDOW = 32_768
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Any:
+    """Load the cl100k_base tokenizer, or None if it is unavailable."""
+    try:
+        # LiteLLM bundles the cl100k_base vocabulary, so this needs no download
+        from litellm.litellm_core_utils.default_encoding import encoding
+        return encoding
+    except Exception:
+        pass
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a text.
+    
+    Uses the cl100k_base tokenizer when available. Otherwise estimates about
+    4 ASCII characters per token and one token per other character, which
+    tracks cl100k_base closely for English and CJK text.
+    """
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def content_tokens(content: str | list[dict[str, Any]] | None) -> int:
+    """Count the tokens of message content (plain text or multimodal parts)."""
+    if content is None:
+        return 0
+    if isinstance(content, str):
+        return count_tokens(content)
+    total = 0
+    for part in content:
+        if part.get("type") == "text":
+            total += count_tokens(part.get("text", ""))
+        elif part.get("type") == "image_url":
+            total += IMAGE_TOKENS
+    return total
+
+
+def message_tokens(message: dict[str, Any]) -> int:
+    """
+    Get the token cost of a chat message.
+    
+    Uses the count stored on the message under "tokens" when present.
+    """
+    tokens = message.get("tokens")
+    if tokens is None:
+        tokens = content_tokens(message.get("content"))
+    return tokens + MESSAGE_OVERHEAD_TOKENS
+
+
+def fit_newest(messages: list[dict[str, Any]], budget: int) -> list[dict[str, Any]]:
+    """
+    Select the newest messages whose total cost fits the token budget.
+    
+    The window never starts with an orphaned assistant reply, so the kept
+    history always opens with a user message.
+    
+    Args:
+        messages: Messages, oldest first.
+        budget: Maximum total tokens.
+    
+    Returns:
+        A suffix of messages, oldest first.
+    """
+    used = 0
+    start = len(messages)
+    for i in range(len(messages) - 1, -1, -1):
+        used += message_tokens(messages[i])
+        if used > budget:
+            break
+        start = i
+    
+    while start < len(messages) and messages[start].get("role") != "user":
+        start += 1
+    return messages[start:]
+
+
+@lru_cache(maxsize=32)
+def get_context_window(model: str) -> int:
+    """Get a model's input token limit from LiteLLM's model map."""
+    try:
+        import litellm
+        info = litellm.get_model_info(model)
+        window = info.get("max_input_tokens") or info.get("max_tokens")
+        if window:
+            return int(window)
+    except Exception:
+        pass
+    return DEFAULT_CONTEXT_WINDOW
@@ -11,11 +11,11 @@ from aiohttp import web
 from loguru import logger
 
 from nanobot.agent.loop import AgentLoop
-from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.config.loader import load_config
 from nanobot.providers.litellm_provider import LiteLLMProvider
-from nanobot.session.manager import SessionManager
+from nanobot.tracing import LoopMonitor
+from nanobot.utils.aio import set_io_workers
 
 
 class WebUIServer:
@@ -26,8 +26,10 @@ class WebUIServer:
         self.port = port
         self.app = web.Application()
         self.bus = MessageBus()
-        self.sessions: dict[str, SessionManager] = {}
+        self.sessions: set[str] = set()
         self.agent_tasks: dict[str, asyncio.Task] = {}
+        self._agent: AgentLoop | None = None
+        self.monitor: LoopMonitor | None = None
         
         # Setup routes
         self._setup_routes()
@@ -121,6 +123,42 @@ class WebUIServer:
             logger.error(f"Error updating config: {e}")
             return web.json_response({"error": str(e)}, status=500)
 
+    def _get_agent(self) -> AgentLoop:
+        """Get the shared agent loop, creating it from config on first use"""
+        if self._agent is None:
+            config = load_config()
+            set_io_workers(config.agents.defaults.io_workers)
+            provider = LiteLLMProvider(
+                api_key=config.get_api_key(),
+                api_base=config.get_api_base(),
+                default_model=config.agents.defaults.model
+            )
+            self._agent = AgentLoop(
+                bus=self.bus,
+                provider=provider,
+                workspace=config.workspace_path,
+                model=config.agents.defaults.model,
+                max_iterations=config.agents.defaults.max_tool_iterations,
+                brave_api_key=config.tools.web.search.api_key or None,
+                exec_config=config.tools.exec,
+                max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+                max_tokens=config.agents.defaults.max_tokens,
+                context_window=config.agents.defaults.context_window or None,
+                artifacts_config=config.tools.artifacts,
+                skills_top_k=config.agents.defaults.skills_top_k,
+                memory_max_chars=config.agents.defaults.memory_max_chars,
+                image_max_edge=config.agents.defaults.image_max_edge,
+                summary_model=config.agents.defaults.summary_model or None,
+                summarize_after_tokens=config.agents.defaults.summarize_after_tokens,
+                sessions_config=config.sessions,
+            )
+        return self._agent
+
+    @staticmethod
+    def _session_key(session_id: str) -> str:
+        """Map a browser session id onto an agent session key"""
+        return session_id if session_id.startswith("web:") else f"web:{session_id}"
+
     async def chat(self, request: web.Request) -> web.Response:
         """Handle chat messages"""
         try:
@@ -131,31 +169,14 @@ class WebUIServer:
             if not message:
                 return web.json_response({"error": "Message is required"}, status=400)
             
-            # Create or get session
-            if session_id not in self.sessions:
-                self.sessions[session_id] = SessionManager()
-            
-            # Send message to agent
-            inbound = InboundMessage(
+            self.sessions.add(session_id)
+            response = await self._get_agent().process_direct(
+                message,
+                session_key=self._session_key(session_id),
                 channel="web",
                 chat_id=session_id,
-                user_id="web-user",
-                text=message,
-                timestamp=0
-            )
-            
-            # Process with agent
-            config = load_config()
-            provider = LiteLLMProvider(config=config)
-            agent = AgentLoop(
-                provider=provider,
-                session_manager=self.sessions[session_id],
-                config=config,
-                bus=self.bus
             )
             
-            response = await agent._process_message(inbound)
-            
             return web.json_response({
                 "response": response,
                 "session_id": session_id
@@ -169,52 +190,58 @@ class WebUIServer:
         """Get server status"""
         try:
             config = load_config()
-            return web.json_response({
+            status = {
                 "status": "running",
                 "model": config.agents.defaults.model,
                 "sessions": len(self.sessions)
-            })
+            }
+            if self.monitor and self.monitor.enabled:
+                status["loop"] = self.monitor.stats()
+            return web.json_response(status)
         except Exception as e:
             return web.json_response({"error": str(e)}, status=500)
 
     async def websocket_handler(self, request: web.Request) -> web.WebSocketResponse:
-        """WebSocket handler for real-time chat"""
+        """
+        WebSocket handler for real-time chat.
+        
+        Partial reply text is pushed as {"type": "delta", "content": ...} frames,
+        followed by {"type": "done", "response": ...} with the complete reply.
+        """
         ws = web.WebSocketResponse()
         await ws.prepare(request)
         
         session_id = f"web:{id(ws)}"
-        self.sessions[session_id] = SessionManager()
+        self.sessions.add(session_id)
+        
+        async def on_delta(delta: str) -> None:
+            if not ws.closed:
+                await ws.send_json({"type": "delta", "content": delta})
         
         try:
             async for msg in ws:
                 if msg.type == web.WSMsgType.TEXT:
                     data = json.loads(msg.data)
                     message = data.get("message", "")
+                    if not message:
+                        continue
+                    chat_id = data.get("session_id") or session_id
                     
-                    # Process message
-                    config = load_config()
-                    provider = LiteLLMProvider(config=config)
-                    agent = AgentLoop(
-                        provider=provider,
-                        session_manager=self.sessions[session_id],
-                        config=config,
-                        bus=self.bus
-                    )
-                    
-                    inbound = InboundMessage(
-                        channel="web",
-                        chat_id=session_id,
-                        user_id="web-user",
-                        text=message,
-                        timestamp=0
-                    )
-                    
-                    response = await agent._process_message(inbound)
-                    await ws.send_json({"response": response})
+                    try:
+                        response = await self._get_agent().process_direct(
+                            message,
+                            session_key=self._session_key(chat_id),
+                            channel="web",
+                            chat_id=chat_id,
+                            on_delta=on_delta,
+                        )
+                        await ws.send_json({"type": "done", "response": response})
+                    except Exception as e:
+                        logger.error(f"Error in websocket chat: {e}")
+                        await ws.send_json({"type": "error", "error": str(e)})
                     
         finally:
-            if session_id in self.sessions:
-                del self.sessions[session_id]
+            self.sessions.discard(session_id)
         
         return ws
 
@@ -237,6 +264,10 @@ class WebUIServer:
 
     async def start(self):
         """Start the web server"""
+        config = load_config()
+        self.monitor = LoopMonitor(stall_ms=config.tracing.loop_stall_ms, enabled=config.tracing.loop_monitor)
+        await self.monitor.start()
+        
         runner = web.AppRunner(self.app)
         await runner.setup()
         site = web.TCPSite(runner, self.host, self.port)
@@ -249,6 +280,7 @@ class WebUIServer:
         except KeyboardInterrupt:
             logger.info("Shutting down web UI...")
         finally:
+            self.monitor.stop()
             await runner.cleanup()
     
     async def get_settings(self, request: web.Request) -> web.Response:
@@ -0,0 +1,164 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.tools.message import MessageTool
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk
+
+
+def _user_text(messages: list[dict[str, Any]]) -> str:
+    """Get the current user message without its leading runtime context."""
+    return messages[-1]["content"].split("\n\n", 1)[-1]
+
+
+class SlowProvider(LLMProvider):
+    """Echoes the last user message after a delay, recording call order."""
+
+    def __init__(self, delay: float = 0.05):
+        super().__init__()
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.calls: list[str] = []
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        content = _user_text(messages)
+        self.calls.append(content)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return LLMResponse(content=f"echo: {content}")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    ws = tmp_path / "workspace"
+    ws.mkdir()
+    return ws
+
+
+async def _collect_outbound(bus: MessageBus, count: int) -> list[str]:
+    return [(await asyncio.wait_for(bus.consume_outbound(), 2.0)).content for _ in range(count)]
+
+
+async def test_sessions_run_concurrently(workspace) -> None:
+    bus = MessageBus()
+    provider = SlowProvider()
+    agent = AgentLoop(bus=bus, provider=provider, workspace=workspace, max_concurrent_turns=4)
+
+    for chat_id in ("a", "b", "c"):
+        agent._submit(InboundMessage(channel="test", sender_id="u", chat_id=chat_id, content=chat_id))
+
+    replies = await _collect_outbound(bus, 3)
+    assert sorted(replies) == ["echo: a", "echo: b", "echo: c"]
+    assert provider.max_active == 3
+
+
+async def test_turns_within_session_stay_ordered(workspace) -> None:
+    bus = MessageBus()
+    provider = SlowProvider(delay=0.01)
+    agent = AgentLoop(bus=bus, provider=provider, workspace=workspace)
+
+    for i in range(5):
+        agent._submit(InboundMessage(channel="test", sender_id="u", chat_id="a", content=str(i)))
+
+    replies = await _collect_outbound(bus, 5)
+    assert replies == [f"echo: {i}" for i in range(5)]
+    assert provider.max_active == 1
+
+
+async def test_global_concurrency_limit(workspace) -> None:
+    bus = MessageBus()
+    provider = SlowProvider()
+    agent = AgentLoop(bus=bus, provider=provider, workspace=workspace, max_concurrent_turns=2)
+
+    for i in range(4):
+        agent._submit(InboundMessage(channel="test", sender_id="u", chat_id=str(i), content=str(i)))
+
+    await _collect_outbound(bus, 4)
+    assert provider.max_active == 2
+
+
+async def test_tool_context_is_per_turn(workspace) -> None:
+    agent = AgentLoop(bus=MessageBus(), provider=SlowProvider(), workspace=workspace)
+    tool = agent.tools.get("message")
+    assert isinstance(tool, MessageTool)
+    sent: list[str] = []
+
+    async def capture(msg):
+        sent.append(f"{msg.channel}:{msg.chat_id}")
+
+    tool.set_send_callback(capture)
+
+    async def turn(chat_id: str) -> None:
+        agent._set_tool_context("test", chat_id)
+        await asyncio.sleep(0.01)
+        await tool.execute(content="hi")
+
+    await asyncio.gather(asyncio.create_task(turn("a")), asyncio.create_task(turn("b")))
+    assert sorted(sent) == ["test:a", "test:b"]
+
+
+class StreamingProvider(SlowProvider):
+    """Streams the echo reply word by word."""
+
+    async def chat_stream(self, messages: list[dict[str, Any]], **kwargs: Any):
+        text = f"echo: {_user_text(messages)}"
+        for word in text.split(" "):
+            yield LLMStreamChunk(content=word + " ")
+        yield LLMStreamChunk(response=LLMResponse(content=text))
+
+
+async def test_process_direct_streams_deltas(workspace) -> None:
+    agent = AgentLoop(bus=MessageBus(), provider=StreamingProvider(), workspace=workspace)
+    deltas: list[str] = []
+
+    async def on_delta(delta: str) -> None:
+        deltas.append(delta)
+
+    response = await agent.process_direct("hello world", on_delta=on_delta)
+    assert response == "echo: hello world"
+    assert deltas == ["echo: ", "hello ", "world "]
+
+
+async def test_streaming_falls_back_to_chat(workspace) -> None:
+    agent = AgentLoop(bus=MessageBus(), provider=SlowProvider(delay=0), workspace=workspace)
+    deltas: list[str] = []
+
+    async def on_delta(delta: str) -> None:
+        deltas.append(delta)
+
+    response = await agent.process_direct("hi", on_delta=on_delta)
+    assert response == "echo: hi"
+    assert deltas == ["echo: hi"]
+
+
+async def test_stop_cancels_running_and_queued_turns(workspace) -> None:
+    bus = MessageBus()
+    provider = SlowProvider(delay=10)
+    agent = AgentLoop(bus=bus, provider=provider, workspace=workspace)
+
+    direct = asyncio.create_task(agent.process_direct("first", session_key="cli:a"))
+    queued = asyncio.create_task(agent.process_direct("second", session_key="cli:a"))
+    agent._submit(InboundMessage(channel="test", sender_id="u", chat_id="b", content="other"))
+    await asyncio.sleep(0.05)
+    assert provider.active == 2
+
+    await asyncio.wait_for(agent.stop(), 1.0)
+
+    assert provider.active == 0
+    assert agent._session_workers == {}
+    for task in (direct, queued):
+        with pytest.raises(asyncio.CancelledError):
+            await task
@@ -0,0 +1,94 @@
+import asyncio
+import builtins
+import contextvars
+import io
+import threading
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.tracing import Tracer, get_tracer, set_tracer
+from nanobot.utils.aio import run_io, run_io_batch
+
+_request = contextvars.ContextVar("request", default=None)
+
+
+async def test_run_io_uses_worker_thread_and_context() -> None:
+    _request.set("r1")
+    ident, value = await run_io(lambda: (threading.get_ident(), _request.get()))
+    assert ident != threading.get_ident()
+    assert value == "r1"
+    
+    assert await run_io_batch([lambda: 1, lambda: 2]) == [1, 2]
+    assert await run_io_batch([]) == []
+
+
+class ReadThenReplyProvider(LLMProvider):
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.calls = 0
+    
+    async def chat(self, messages, **kwargs) -> LLMResponse:
+        self.calls += 1
+        if self.calls == 1:
+            return LLMResponse(
+                content=None,
+                tool_calls=[ToolCallRequest(id="1", name="read_file", arguments={"path": self.path})],
+            )
+        return LLMResponse(content="done")
+    
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    previous = get_tracer()
+    tracer = Tracer(path=tmp_path / "traces.jsonl")
+    set_tracer(tracer)
+    yield tracer
+    set_tracer(previous)
+
+
+async def test_turn_does_no_file_io_on_loop_thread(tracer, tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    workspace = tmp_path / "workspace"
+    (workspace / "memory").mkdir(parents=True)
+    (workspace / "memory" / "MEMORY.md").write_text("# Facts\n\n- The user likes tea\n")
+    (workspace / "AGENTS.md").write_text("Be brief.")
+    notes = workspace / "notes.txt"
+    notes.write_text("hello")
+    image = tmp_path / "photo.png"
+    image.write_bytes(b"\x89PNG\r\n\x1a\n")
+    
+    bus = MessageBus()
+    agent = AgentLoop(bus=bus, provider=ReadThenReplyProvider(str(notes)), workspace=workspace)
+    
+    loop_thread = threading.get_ident()
+    on_loop = []
+    real_open = io.open
+    
+    def recording_open(file, *args, **kwargs):
+        if threading.get_ident() == loop_thread:
+            on_loop.append(str(file))
+        return real_open(file, *args, **kwargs)
+    
+    monkeypatch.setattr(io, "open", recording_open)
+    monkeypatch.setattr(builtins, "open", recording_open)
+    
+    agent._submit(InboundMessage(channel="test", sender_id="u", chat_id="c", content="hi", media=[str(image)]))
+    out = await asyncio.wait_for(bus.consume_outbound(), 2.0)
+    await asyncio.sleep(0.05)  # Let the queued trace flush finish
+    
+    assert out.content == "done"
+    assert on_loop == []
+    
+    monkeypatch.undo()
+    session = agent.sessions.store.load("test:c")
+    assert [m["content"] for m in session.messages] == ["hi", "done"]
+    tracer.flush()
+    assert tracer.path.exists()
@@ -0,0 +1,79 @@
+import re
+from typing import Any
+
+from nanobot.agent.artifacts import ArtifactStore
+from nanobot.agent.tools.artifacts import ReadArtifactTool
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.shell import ExecTool
+
+
+class DumpTool(Tool):
+    concurrency = "read_only"
+    
+    def __init__(self, output: str):
+        self.output = output
+    
+    @property
+    def name(self) -> str:
+        return "dump"
+    
+    @property
+    def description(self) -> str:
+        return "dump"
+    
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+    
+    async def execute(self, **kwargs: Any) -> str:
+        return self.output
+
+
+def _registry(tmp_path, output: str) -> ToolRegistry:
+    store = ArtifactStore(tmp_path / "artifacts")
+    registry = ToolRegistry(artifacts=store, spill_chars=1000, preview_chars=400)
+    registry.register(DumpTool(output))
+    registry.register(ReadArtifactTool(store, max_chars=1000))
+    return registry
+
+
+async def test_small_results_stay_inline(tmp_path) -> None:
+    registry = _registry(tmp_path, "x" * 1000)
+    assert await registry.execute("dump", {}) == "x" * 1000
+
+
+async def test_large_result_is_spilled_and_paged_back(tmp_path) -> None:
+    output = "".join(f"line {i}\n" for i in range(2000))
+    registry = _registry(tmp_path, output)
+    
+    preview = await registry.execute("dump", {})
+    assert len(preview) < 700
+    assert preview.startswith(output[:300])
+    assert preview.endswith(output[-100:])
+    artifact_id, offset = re.search(r'read_artifact\(id="(\w+)", offset=(\d+)\)', preview).groups()
+    
+    # Page through the rest; pages are never spilled again
+    pages = [output[:int(offset)]]
+    offset = int(offset)
+    while True:
+        page = await registry.execute("read_artifact", {"id": artifact_id, "offset": offset})
+        body, _, footer = page.rpartition("\n\n[")
+        pages.append(body)
+        if "End of artifact" in footer:
+            break
+        offset = int(re.search(r"offset=(\d+)", footer).group(1))
+    assert "".join(pages) == output
+
+
+async def test_identical_outputs_share_an_artifact(tmp_path) -> None:
+    store = ArtifactStore(tmp_path / "artifacts")
+    assert store.put("same") == store.put("same")
+    assert len(list((tmp_path / "artifacts").glob("*.txt"))) == 1
+    assert store.get("../../etc/passwd") is None
+
+
+async def test_exec_output_is_not_cut_at_10k(tmp_path) -> None:
+    tool = ExecTool(working_dir=str(tmp_path))
+    result = await tool.execute(command="python -c \"print('a' * 50000)\"")
+    assert len(result.strip()) == 50000
@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+
+
+class FakeChannel(BaseChannel):
+    name = "fake"
+    draft_interval_s = 0.05
+
+    def __init__(self):
+        super().__init__(SimpleNamespace(allow_from=[]), MessageBus())
+        self.calls: list[tuple[str, str]] = []
+
+    @property
+    def supports_drafts(self) -> bool:
+        return True
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, msg: OutboundMessage) -> None:
+        if msg.draft:
+            self._update_draft(msg)
+            return
+        if await self._finish_draft(msg):
+            return
+        self.calls.append(("send", msg.content))
+
+    async def _post_draft(self, chat_id: str, text: str) -> str | None:
+        await asyncio.sleep(0.01)
+        self.calls.append(("post", text))
+        return "m1"
+
+    async def _edit_draft(self, chat_id: str, message_id: str, text: str, final: bool = False) -> None:
+        await asyncio.sleep(0.01)
+        self.calls.append(("final" if final else "edit", text))
+
+
+def _draft(text: str) -> OutboundMessage:
+    return OutboundMessage(channel="fake", chat_id="c", content=text, stream_id="s1", draft=True)
+
+
+async def test_draft_edits_are_coalesced() -> None:
+    channel = FakeChannel()
+
+    await channel.send(_draft("a"))
+    await asyncio.sleep(0.02)  # first post lands
+    for text in ["ab", "abc", "abcd"]:
+        await channel.send(_draft(text))
+        await asyncio.sleep(0.005)
+    await asyncio.sleep(0.2)
+    await channel.send(OutboundMessage(channel="fake", chat_id="c", content="final", stream_id="s1"))
+
+    assert channel.calls[0] == ("post", "a")
+    # Intermediate revisions are skipped; only the newest text is edited in
+    assert ("edit", "abcd") in channel.calls
+    assert ("edit", "ab") not in channel.calls
+    assert channel.calls[-1] == ("final", "final")
+    assert not any(kind == "send" for kind, _ in channel.calls)
+
+
+async def test_final_waits_for_in_flight_post() -> None:
+    channel = FakeChannel()
+
+    await channel.send(_draft("partial"))
+    await asyncio.sleep(0.005)  # post is in flight
+    await channel.send(OutboundMessage(channel="fake", chat_id="c", content="done", stream_id="s1"))
+
+    assert channel.calls == [("post", "partial"), ("final", "done")]
+
+
+async def test_reply_without_draft_is_sent_normally() -> None:
+    channel = FakeChannel()
+    await channel.send(OutboundMessage(channel="fake", chat_id="c", content="hi", stream_id="s2"))
+    assert channel.calls == [("send", "hi")]
+
+
+async def test_abandoned_drafts_expire() -> None:
+    channel = FakeChannel()
+    channel.draft_ttl_s = 0.1
+
+    await channel.send(_draft("partial"))
+    await asyncio.sleep(0.15)
+    # The turn ended without a final reply; the next stream drops its draft
+    await channel.send(OutboundMessage(channel="fake", chat_id="c", content="next", stream_id="s2", draft=True))
+
+    assert list(channel._drafts) == ["s2"]
+    await asyncio.sleep(0.05)
+    assert channel.calls == [("post", "partial"), ("post", "next")]
@@ -0,0 +1,88 @@
+import os
+import shutil
+
+import pytest
+
+from nanobot.agent.context import ContextBuilder
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+
+def _workspace(tmp_path):
+    (tmp_path / "AGENTS.md").write_text("be nice")
+    (tmp_path / "memory").mkdir()
+    (tmp_path / "memory" / "MEMORY.md").write_text("likes tea")
+    skill = tmp_path / "skills" / "weather"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text(
+        '---\nname: weather\ndescription: Get the weather\n'
+        'metadata: {"nanobot": {"requires": {"bins": ["curl"]}}}\n---\n\nUse curl.'
+    )
+    return tmp_path
+
+
+def test_unchanged_prompt_is_served_from_cache(tmp_path, monkeypatch) -> None:
+    calls = []
+    real_which = shutil.which
+    monkeypatch.setattr(shutil, "which", lambda b: calls.append(b) or real_which(b))
+    builder = ContextBuilder(_workspace(tmp_path))
+    
+    first = builder.build_system_prompt()
+    misses = builder.cache.misses
+    which_calls = len(calls)
+    second = builder.build_system_prompt()
+    
+    assert first == second
+    assert builder.cache.misses == misses
+    assert builder.cache.hits > 0
+    assert len(calls) == which_calls  # Binary lookups are reused too
+
+
+def test_changed_files_are_picked_up(tmp_path) -> None:
+    workspace = _workspace(tmp_path)
+    builder = ContextBuilder(workspace)
+    builder.skills.check_interval_s = 0  # Check skill files on every call
+    builder.build_system_prompt()
+    
+    agents = workspace / "AGENTS.md"
+    agents.write_text("be very nice")
+    skill = workspace / "skills" / "weather" / "SKILL.md"
+    skill.write_text(skill.read_text().replace("Get the weather", "Forecasts"))
+    # Guard against coarse filesystem timestamps
+    for path in (agents, skill):
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    
+    prompt = builder.build_system_prompt()
+    assert "be very nice" in prompt
+    assert "Forecasts" in prompt
+
+
+def test_memory_writes_invalidate_cache(tmp_path) -> None:
+    builder = ContextBuilder(_workspace(tmp_path))
+    assert "likes tea" in builder.build_system_prompt()
+    
+    builder.memory.write_long_term("likes coffee and cake")
+    assert "likes coffee and cake" in builder.build_system_prompt()
+
+
+def test_older_notes_check_is_memoized(tmp_path, monkeypatch) -> None:
+    builder = ContextBuilder(_workspace(tmp_path))
+    memory = builder.memory
+    globs = []
+    real_list = memory.list_memory_files
+    monkeypatch.setattr(memory, "list_memory_files", lambda: globs.append(1) or real_list())
+    
+    assert "memory_search" not in memory.get_memory_context()
+    memory.get_memory_context()
+    assert len(globs) == 1
+    
+    memory_dir = tmp_path / "memory"
+    (memory_dir / "2020-01-01.md").write_text("old note")
+    st = memory_dir.stat()  # Guard against coarse filesystem timestamps
+    os.utime(memory_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert "memory_search" in memory.get_memory_context()
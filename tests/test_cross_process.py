@@ -0,0 +1,142 @@
+import multiprocessing
+
+import pytest
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.cron.service import CronService
+from nanobot.cron.types import CronSchedule
+from nanobot.session.manager import SessionManager
+from nanobot.session.sqlite import SqliteSessionStore
+from nanobot.session.store import JsonlSessionStore
+
+
+@pytest.fixture(params=["jsonl", "sqlite"])
+def make_manager(request, tmp_path):
+    """Each manager has its own store, as a separate process would."""
+    def make():
+        if request.param == "sqlite":
+            store = SqliteSessionStore(tmp_path / "sessions.db")
+        else:
+            store = JsonlSessionStore(tmp_path / "sessions")
+        return SessionManager(tmp_path, store=store)
+    return make
+
+
+def _contents(session) -> list[str]:
+    return [m["content"] for m in session.messages]
+
+
+def test_concurrent_saves_keep_both_sides(make_manager) -> None:
+    gateway, cli = make_manager(), make_manager()
+    session = gateway.get_or_create("cli:direct")
+    session.add_message("user", "hello")
+    gateway.save(session)
+
+    other = cli.get_or_create("cli:direct")
+    other.add_message("user", "from cli")
+    session.add_message("user", "from gateway")
+    cli.save(other)
+    gateway.save(session)
+
+    # The gateway's unsaved message went after the one the CLI stored first
+    assert _contents(session) == ["hello", "from cli", "from gateway"]
+    assert _contents(make_manager().get_or_create("cli:direct")) == ["hello", "from cli", "from gateway"]
+
+    # The CLI picks up the gateway's message when it next uses the session
+    assert cli.get_or_create("cli:direct") is other
+    assert _contents(other) == ["hello", "from cli", "from gateway"]
+
+
+def test_refresh_skips_unchanged_sessions(make_manager) -> None:
+    gateway, cli = make_manager(), make_manager()
+    session = gateway.get_or_create("test:a")
+    session.add_message("user", "one")
+    gateway.save(session)
+
+    assert gateway.store.refresh(session) is False
+    other = cli.get_or_create("test:a")
+    other.metadata["topic"] = "tea"
+    other.add_message("assistant", "two")
+    cli.save(other)
+
+    assert gateway.store.refresh(session) is True
+    assert _contents(session) == ["one", "two"] and session.metadata["topic"] == "tea"
+    assert gateway.store.refresh(session) is False
+
+
+def test_rewrite_elsewhere_reloads(make_manager) -> None:
+    gateway, cli = make_manager(), make_manager()
+    session = gateway.get_or_create("test:a")
+    for i in range(4):
+        session.add_message("user", f"m{i}")
+    gateway.save(session)
+
+    other = cli.get_or_create("test:a")
+    other.clear()
+    other.add_message("user", "fresh start")
+    cli.save(other)
+
+    session.add_message("user", "unsaved")
+    assert gateway.store.refresh(session) is True
+    assert _contents(session) == ["fresh start", "unsaved"]
+    gateway.save(session)
+    assert _contents(make_manager().get_or_create("test:a")) == ["fresh start", "unsaved"]
+
+
+def test_cron_services_share_the_store(tmp_path) -> None:
+    path = tmp_path / "cron" / "jobs.json"
+    gateway, cli = CronService(path), CronService(path)
+    assert gateway.list_jobs() == []
+
+    cli.add_job("a", CronSchedule(kind="every", every_ms=60_000), "ping")
+    gateway.add_job("b", CronSchedule(kind="every", every_ms=60_000), "pong")
+
+    assert sorted(j.name for j in cli.list_jobs()) == ["a", "b"]
+    job = next(j for j in gateway.list_jobs() if j.name == "a")
+    gateway.enable_job(job.id, enabled=False)
+    assert [j.name for j in cli.list_jobs()] == ["b"]
+
+
+async def test_cron_run_keeps_changes_made_meanwhile(tmp_path) -> None:
+    path = tmp_path / "cron" / "jobs.json"
+    cli = CronService(path)
+
+    async def on_job(job):
+        # A job added from the CLI while this one runs
+        cli.add_job("added", CronSchedule(kind="every", every_ms=60_000), "hi")
+        return "ok"
+
+    gateway = CronService(path, on_job=on_job)
+    job = gateway.add_job("once", CronSchedule(kind="at", at_ms=1), "run", delete_after_run=True)
+    assert await gateway.run_job(job.id)
+
+    assert [j.name for j in CronService(path).list_jobs(include_disabled=True)] == ["added"]
+
+
+def _add_jobs(path, prefix: str, count: int) -> None:
+    service = CronService(path)
+    for i in range(count):
+        service.add_job(f"{prefix}{i}", CronSchedule(kind="every", every_ms=60_000), "ping")
+
+
+def test_cron_adds_from_several_processes(tmp_path) -> None:
+    path = tmp_path / "cron" / "jobs.json"
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_add_jobs, args=(path, p, 15)) for p in "ab"]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+
+    assert len(CronService(path).list_jobs()) == 30
+
+
+def test_memory_appends_are_not_lost(tmp_path) -> None:
+    first, second = MemoryStore(tmp_path), MemoryStore(tmp_path)
+    first.append_today("note from gateway")
+    assert "note from gateway" in second.read_today()
+    second.append_today("note from cli")
+
+    notes = first.read_today()
+    assert "note from gateway" in notes and "note from cli" in notes
@@ -0,0 +1,74 @@
+import base64
+import io
+
+import pytest
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.media import images
+from nanobot.media.images import ImageProcessor, max_image_edge
+
+
+def _decode(url: str) -> tuple[str, bytes]:
+    header, b64 = url.split(",", 1)
+    return header[len("data:"):-len(";base64")], base64.b64decode(b64)
+
+
+def test_max_edge_by_model() -> None:
+    assert max_image_edge("anthropic/claude-opus-4-5") == 1568
+    assert max_image_edge("openrouter/google/gemini-2.5-pro") == 3072
+    assert max_image_edge("openai/gpt-4o") == 2048
+    assert max_image_edge("some/unknown-model") == images.DEFAULT_MAX_EDGE
+
+
+def test_without_pillow_images_are_sent_as_is(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(images, "PIL_AVAILABLE", False)
+    path = tmp_path / "photo.png"
+    path.write_bytes(b"\x89PNG\r\n\x1a\nnot really")
+    processor = ImageProcessor()
+    
+    assert _decode(processor.data_url(path)) == ("image/png", path.read_bytes())
+    assert processor.data_url(tmp_path / "missing.png") is None
+    assert processor.data_url(tmp_path) is None
+
+
+def test_large_photo_is_downscaled_and_cached(tmp_path) -> None:
+    pil_image = pytest.importorskip("PIL.Image")
+    exif = pil_image.Exif()
+    exif[0x010F] = "PhoneMaker"
+    path = tmp_path / "photo.jpg"
+    pil_image.new("RGB", (4000, 3000), (200, 30, 30)).save(path, quality=95, exif=exif)
+    
+    processor = ImageProcessor(max_edge=1568)
+    mime, data = _decode(processor.data_url(path))
+    assert mime == "image/jpeg"
+    with pil_image.open(io.BytesIO(data)) as img:
+        assert img.size == (1568, 1176)
+        assert not img.getexif()
+    
+    # Same file, and the same content under another name, reuse the encoding
+    copy = tmp_path / "copy.jpg"
+    copy.write_bytes(path.read_bytes())
+    assert processor.data_url(path) == processor.data_url(copy)
+    assert processor.stats()["misses"] == 1 and processor.stats()["hits"] == 2
+
+
+def test_transparent_image_keeps_alpha(tmp_path) -> None:
+    pil_image = pytest.importorskip("PIL.Image")
+    path = tmp_path / "logo.png"
+    pil_image.new("RGBA", (64, 64), (0, 0, 0, 0)).save(path)
+    
+    mime, data = _decode(ImageProcessor().data_url(path))
+    assert mime == "image/webp"
+    with pil_image.open(io.BytesIO(data)) as img:
+        assert img.mode == "RGBA"
+
+
+def test_context_attaches_processed_images(tmp_path) -> None:
+    path = tmp_path / "photo.gif"
+    path.write_bytes(b"GIF89a")
+    builder = ContextBuilder(tmp_path)
+    
+    messages = builder.build_messages([], "what is this?", media=[str(path), str(tmp_path / "notes.txt")])
+    parts = messages[-1]["content"]
+    assert [p["type"] for p in parts] == ["image_url", "text"]
+    assert parts[0]["image_url"]["url"].startswith("data:image/")
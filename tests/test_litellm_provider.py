@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+from nanobot.providers import litellm_provider
+from nanobot.providers.litellm_provider import LiteLLMProvider
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+    return SimpleNamespace(choices=[choice], usage=usage)
+
+
+def _tool_delta(index, id=None, name=None, arguments=""):
+    return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+async def test_chat_stream_assembles_content_and_tool_calls(monkeypatch) -> None:
+    chunks = [
+        _chunk(content="Let me "),
+        _chunk(content="check."),
+        _chunk(tool_calls=[_tool_delta(0, id="call_1", name="read_file", arguments='{"pa')]),
+        _chunk(tool_calls=[_tool_delta(0, arguments='th": "a.txt"}')]),
+        _chunk(tool_calls=[_tool_delta(1, id="call_2", name="list_dir", arguments='{"path": "."}')]),
+        _chunk(finish_reason="tool_calls"),
+        SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)),
+    ]
+    captured = {}
+
+    async def fake_acompletion(**kwargs):
+        captured.update(kwargs)
+
+        async def stream():
+            for c in chunks:
+                yield c
+        return stream()
+
+    monkeypatch.setattr(litellm_provider, "acompletion", fake_acompletion)
+    provider = LiteLLMProvider(default_model="openai/gpt-4o")
+
+    received = [c async for c in provider.chat_stream(messages=[{"role": "user", "content": "hi"}])]
+
+    assert captured["stream"] is True
+    assert "".join(c.content or "" for c in received) == "Let me check."
+    final = received[-1].response
+    assert final is not None
+    assert final.content == "Let me check."
+    assert final.finish_reason == "tool_calls"
+    assert [(tc.id, tc.name, tc.arguments) for tc in final.tool_calls] == [
+        ("call_1", "read_file", {"path": "a.txt"}),
+        ("call_2", "list_dir", {"path": "."}),
+    ]
+    assert final.usage["total_tokens"] == 15
+
+
+async def test_chat_stream_reports_errors_as_content(monkeypatch) -> None:
+    async def failing_acompletion(**kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(litellm_provider, "acompletion", failing_acompletion)
+    provider = LiteLLMProvider(default_model="openai/gpt-4o")
+
+    received = [c async for c in provider.chat_stream(messages=[{"role": "user", "content": "hi"}])]
+
+    assert received[-1].response.finish_reason == "error"
+    assert "boom" in received[0].content
@@ -0,0 +1,55 @@
+import asyncio
+import json
+import time
+
+from nanobot.tracing.loopmon import LagHistogram, LoopMonitor, load_status
+
+
+def test_histogram_percentiles() -> None:
+    histogram = LagHistogram()
+    for _ in range(98):
+        histogram.add(0.5)
+    histogram.add(30.0)
+    histogram.add(700.0)
+    
+    assert histogram.percentile(0.5) == 1.0
+    assert histogram.percentile(0.99) == 50.0
+    assert histogram.percentile(1.0) == 700.0
+    stats = histogram.to_dict()
+    assert stats["samples"] == 100 and stats["max_ms"] == 700.0
+    assert stats["buckets"]["<=1ms"] == 98 and stats["buckets"]["<=1000ms"] == 1
+
+
+def _hog_the_loop() -> None:
+    time.sleep(0.3)
+
+
+async def test_monitor_captures_blocking_call(tmp_path) -> None:
+    monitor = LoopMonitor(interval_s=0.01, stall_ms=100, status_path=tmp_path / "loop.json")
+    await monitor.start()
+    await asyncio.sleep(0.05)
+    
+    async def handle_message() -> None:
+        _hog_the_loop()
+    
+    await asyncio.create_task(handle_message(), name="turn")
+    await asyncio.sleep(0.05)
+    monitor.stop()
+    
+    assert monitor.stall_count == 1
+    (stall,) = monitor.stalls
+    assert "_hog_the_loop" in stall.stack
+    assert stall.task.startswith("turn (") and "handle_message" in stall.task
+    assert monitor.histogram.max_ms >= 200
+    
+    status = load_status(tmp_path / "loop.json")
+    assert status["stalls"] == 1
+    assert status["lag"]["samples"] == monitor.histogram.count
+    assert json.dumps(status)  # Round-trips as JSON
+
+
+async def test_disabled_monitor_does_nothing() -> None:
+    monitor = LoopMonitor(enabled=False)
+    await monitor.start()
+    monitor.stop()
+    assert monitor.histogram.count == 0
@@ -0,0 +1,133 @@
+import asyncio
+
+from nanobot.bus.events import InboundMessage
+from nanobot.media.ingest import MediaIngestor, MediaSource
+from nanobot.media.store import MediaStore
+
+
+def _msg(chat_id: str, content: str = "") -> InboundMessage:
+    return InboundMessage(channel="test", sender_id="u", chat_id=chat_id, content=content)
+
+
+def _source(data: bytes = b"data", delay: float = 0.0, **kwargs) -> MediaSource:
+    async def fetch():
+        await asyncio.sleep(delay)
+        yield data
+
+    kwargs.setdefault("kind", "image")
+    kwargs.setdefault("name", "photo.jpg")
+    kwargs.setdefault("ext", ".jpg")
+    return MediaSource(fetch=fetch, **kwargs)
+
+
+class Published:
+    def __init__(self):
+        self.messages: list[InboundMessage] = []
+        self.event = asyncio.Event()
+    
+    async def __call__(self, msg: InboundMessage) -> None:
+        self.messages.append(msg)
+        self.event.set()
+    
+    async def wait_for(self, count: int) -> None:
+        while len(self.messages) < count:
+            self.event.clear()
+            await asyncio.wait_for(self.event.wait(), 2.0)
+
+
+async def test_messages_of_a_chat_keep_their_order(tmp_path) -> None:
+    ingest = MediaIngestor(MediaStore(tmp_path / "media"))
+    published = Published()
+
+    await ingest.submit(_msg("a", "look"), [_source(delay=0.1)], published)
+    await ingest.submit(_msg("a", "what is it?"), [], published)
+    await ingest.submit(_msg("b", "hi"), [], published)
+
+    # The other chat is not held up by the download
+    assert [m.content for m in published.messages] == ["hi"]
+
+    await published.wait_for(3)
+    first = published.messages[1]
+    assert first.content.startswith("look\n[image: ")
+    assert first.media and first.media[0].endswith(".jpg")
+    assert published.messages[2].content == "what is it?"
+
+
+async def test_downloads_are_bounded(tmp_path) -> None:
+    ingest = MediaIngestor(MediaStore(tmp_path / "media"), max_concurrent=2)
+    published = Published()
+    active = peak = 0
+
+    def counting(i: int) -> MediaSource:
+        async def fetch():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            yield f"file {i}".encode()
+
+        return MediaSource(kind="file", name=f"{i}.txt", ext=".txt", fetch=fetch)
+
+    await ingest.submit(_msg("a"), [counting(i) for i in range(6)], published)
+    await published.wait_for(1)
+
+    assert peak == 2
+    assert len(published.messages[0].media) == 6
+
+
+async def test_size_limit_applies_while_streaming(tmp_path) -> None:
+    ingest = MediaIngestor(MediaStore(tmp_path / "media", max_file_bytes=10))
+    published = Published()
+    chunks_read = 0
+
+    async def endless():
+        nonlocal chunks_read
+        while True:
+            chunks_read += 1
+            yield b"12345"
+
+    await ingest.submit(_msg("a"), [MediaSource(kind="file", name="big.bin", ext=".bin", fetch=endless)], published)
+    await published.wait_for(1)
+
+    assert published.messages[0].content == "[file: big.bin - too large]"
+    assert published.messages[0].media == []
+    assert chunks_read == 3
+
+
+async def test_announced_huge_media_is_not_downloaded(tmp_path) -> None:
+    ingest = MediaIngestor(MediaStore(tmp_path / "media", max_file_bytes=10))
+    published = Published()
+
+    async def fail():
+        raise AssertionError("should not be downloaded")
+        yield b""
+
+    source = MediaSource(kind="file", name="movie.mp4", ext=".mp4", fetch=fail, size=200 * 1024 * 1024)
+    await ingest.submit(_msg("a", "watch this"), [source], published)
+
+    # Published right away, without a background task
+    assert [m.content for m in published.messages] == ["watch this\n[file: movie.mp4 - too large]"]
+
+
+async def test_voice_is_transcribed_and_failures_leave_a_placeholder(tmp_path) -> None:
+    async def transcribe(path) -> str:
+        return "hello there"
+
+    async def broken():
+        raise OSError("connection reset")
+        yield b""
+
+    ingest = MediaIngestor(MediaStore(tmp_path / "media"), transcriber=transcribe)
+    published = Published()
+
+    sources = [
+        _source(b"ogg", kind="voice", name="voice.ogg", ext=".ogg", transcribe=True),
+        MediaSource(kind="file", name="doc.pdf", ext=".pdf", fetch=broken),
+    ]
+    await ingest.submit(_msg("a"), sources, published)
+    await published.wait_for(1)
+
+    msg = published.messages[0]
+    assert msg.content == "[transcription: hello there]\n[file: doc.pdf - download failed]"
+    assert len(msg.media) == 1
@@ -0,0 +1,83 @@
+import os
+import time
+
+import pytest
+
+from nanobot.media.store import MediaStore, MediaTooLargeError
+
+
+def test_identical_content_is_stored_once(tmp_path) -> None:
+    store = MediaStore(tmp_path / "media")
+
+    first = store.put(b"photo", ".JPG", ref="telegram:1")
+    second = store.put(b"photo", ".jpg", ref="discord:2")
+
+    assert first == second
+    assert first.suffix == ".jpg"
+    assert first.read_bytes() == b"photo"
+    assert store.stats()["files"] == 1
+    assert store.stats()["referenced"] == 1
+
+    # Another process sees the same index
+    assert MediaStore(tmp_path / "media").stats()["bytes"] == 5
+
+
+def test_per_file_limit(tmp_path) -> None:
+    store = MediaStore(tmp_path / "media", max_file_bytes=4)
+
+    with pytest.raises(MediaTooLargeError):
+        store.put(b"12345", ".bin")
+    assert store.stats()["files"] == 0
+
+
+def test_total_limit_evicts_unreferenced_then_least_recently_used(tmp_path) -> None:
+    store = MediaStore(tmp_path / "media", max_total_bytes=10)
+
+    old = store.put(b"aaaa", ".bin", ref="telegram:1")
+    loose = store.put(b"bbbb", ".bin")
+    newer = store.put(b"cccc", ".bin", ref="telegram:1")
+
+    assert not loose.exists()
+    assert old.exists() and newer.exists()
+
+    store.put(b"dddd", ".bin", ref="telegram:1")
+    assert not old.exists()
+    assert newer.exists()
+    assert store.stats()["bytes"] == 8
+
+
+def test_gc_drops_dead_references_and_expired_files(tmp_path) -> None:
+    store = MediaStore(tmp_path / "media", ttl_days=1)
+    kept = store.put(b"kept", ".png", ref="telegram:1")
+    orphan = store.put(b"orphan", ".png", ref="telegram:gone")
+    fresh = store.put(b"fresh", ".png")
+    for entry in store._entries.values():
+        if entry.name != fresh.relative_to(store.root).as_posix():
+            entry.last_used = time.time() - 2 * 86400
+    store._save()
+
+    preview = store.gc(["telegram:1"], dry_run=True)
+    assert preview["deleted"] == 1
+    assert orphan.exists()
+    assert store.stats()["referenced"] == 2
+
+    result = store.gc(["telegram:1"])
+    assert result == {"deleted": 1, "freed_bytes": 6, "files": 2, "bytes": 9}
+    assert not orphan.exists()
+    assert kept.exists() and fresh.exists()
+
+
+def test_gc_adopts_files_from_before_the_store(tmp_path) -> None:
+    root = tmp_path / "media"
+    root.mkdir()
+    legacy = root / "photo_123.jpg"
+    legacy.write_bytes(b"legacy")
+    stale = time.time() - 40 * 86400
+    os.utime(legacy, (stale, stale))
+
+    store = MediaStore(root)
+    assert store.gc(dry_run=True)["files"] == 0
+    assert legacy.exists()
+
+    assert store.gc()["deleted"] == 1
+    assert not legacy.exists()
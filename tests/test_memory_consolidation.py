@@ -0,0 +1,161 @@
+from datetime import date
+from typing import Any
+
+import pytest
+
+from nanobot.agent.consolidation import MemoryConsolidator, dedupe_lines
+from nanobot.agent.memory import MemoryStore
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+TODAY = date(2024, 3, 20)  # A Wednesday
+
+
+class SummaryProvider(LLMProvider):
+    """Returns canned summaries and records each request."""
+    
+    def __init__(self, memory_reply: str = "- Likes tea\n- Likes tea\n- Flew to Tokyo", on_call=None):
+        super().__init__()
+        self.memory_reply = memory_reply
+        self.on_call = on_call
+        self.requests: list[str] = []
+    
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        content = messages[-1]["content"]
+        self.requests.append(content)
+        if self.on_call:
+            self.on_call()
+        if "MEMORY.md" in messages[0]["content"]:
+            return LLMResponse(content=self.memory_reply)
+        return LLMResponse(content=f"- summary of {content.count('---') + 1} notes")
+    
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def _notes(tmp_path, *days: str) -> MemoryStore:
+    store = MemoryStore(tmp_path)
+    store.write_long_term("- Likes tea\n")
+    for day in days:
+        (store.memory_dir / f"{day}.md").write_text(f"# {day}\n\nSomething happened on {day}.")
+    return store
+
+
+async def test_old_notes_become_weekly_digests(tmp_path) -> None:
+    store = _notes(tmp_path, "2024-03-04", "2024-03-06", "2024-03-11", "2024-03-15", "2024-03-18")
+    consolidator = MemoryConsolidator(tmp_path, SummaryProvider())
+    
+    stats = await consolidator.run_once(today=TODAY)
+    
+    # Week 10 ended more than 7 days ago; weeks 11 and 12 are too recent
+    assert stats == {"weekly": 1, "monthly": 0, "long_term": 1}
+    digest = store.memory_dir / "digests" / "2024-W10.md"
+    assert digest.read_text() == "# Week 2024-W10\n\n- summary of 2 notes\n"
+    assert sorted(p.name for p in (store.memory_dir / "archive").iterdir()) == ["2024-03-04.md", "2024-03-06.md"]
+    assert (store.memory_dir / "2024-03-11.md").exists()
+    assert store.read_long_term() == "- Likes tea\n- Flew to Tokyo\n"
+    
+    # Archived notes remain searchable
+    hits = store.search("happened 2024")
+    assert {chunk.path.parent.name for chunk, _ in hits} >= {"archive", "memory"}
+
+
+async def test_old_weekly_digests_become_monthly(tmp_path) -> None:
+    store = _notes(tmp_path)
+    digests = store.memory_dir / "digests"
+    digests.mkdir()
+    for week in ("2023-W52", "2024-W01", "2024-W04", "2024-W09"):
+        (digests / f"{week}.md").write_text(f"# Week {week}\n\n- stuff")
+    consolidator = MemoryConsolidator(tmp_path, SummaryProvider(), monthly_after_days=30)
+    
+    stats = await consolidator.run_once(today=TODAY)
+    
+    # 2023-W52 belongs to December, W01 and W04 to January; W09 (February) is too recent
+    assert stats["monthly"] == 2
+    assert sorted(p.name for p in digests.iterdir()) == ["2023-12.md", "2024-01.md", "2024-W09.md"]
+    assert (digests / "2024-01.md").read_text().startswith("# Month 2024-01\n\n- summary of 2 notes")
+
+
+async def test_concurrent_memory_edit_is_kept(tmp_path) -> None:
+    store = _notes(tmp_path, "2024-03-04")
+    
+    def agent_writes() -> None:
+        store.write_long_term("- Likes coffee now\n" + "x" * 50)
+    
+    consolidator = MemoryConsolidator(tmp_path, SummaryProvider(on_call=agent_writes))
+    stats = await consolidator.run_once(today=TODAY)
+    
+    assert stats["long_term"] == 0
+    assert store.read_long_term().startswith("- Likes coffee now")
+
+
+async def test_skipped_merge_is_retried_next_run(tmp_path) -> None:
+    store = _notes(tmp_path, "2024-03-04")
+    calls = []
+    
+    def agent_writes_during_merge() -> None:
+        calls.append(1)
+        if len(calls) == 2:  # The first request is the weekly digest
+            store.write_long_term("- Likes coffee now\n")
+    
+    provider = SummaryProvider(memory_reply="- Likes coffee now\n- Flew to Tokyo", on_call=agent_writes_during_merge)
+    consolidator = MemoryConsolidator(tmp_path, provider)
+    assert (await consolidator.run_once(today=TODAY))["long_term"] == 0
+    assert consolidator.pending_path.exists()
+    
+    # The notes are archived by now; the digest is merged from the pending list
+    stats = await consolidator.run_once(today=TODAY)
+    
+    assert stats == {"weekly": 0, "monthly": 0, "long_term": 1}
+    assert "- summary of 1 notes" in provider.requests[-1]
+    assert store.read_long_term() == "- Likes coffee now\n- Flew to Tokyo\n"
+    assert not consolidator.pending_path.exists()
+
+
+async def test_failed_summary_keeps_notes(tmp_path) -> None:
+    store = _notes(tmp_path, "2024-03-04")
+    
+    class FailingProvider(SummaryProvider):
+        async def chat(self, messages, **kwargs):
+            return LLMResponse(content="Error calling LLM: boom", finish_reason="error")
+    
+    with pytest.raises(RuntimeError):
+        await MemoryConsolidator(tmp_path, FailingProvider()).run_once(today=TODAY)
+    assert (store.memory_dir / "2024-03-04.md").exists()
+    assert not (store.memory_dir / "archive").exists()
+
+
+async def test_nothing_to_do_makes_no_requests(tmp_path) -> None:
+    _notes(tmp_path, "2024-03-18")
+    provider = SummaryProvider()
+    stats = await MemoryConsolidator(tmp_path, provider).run_once(today=TODAY)
+    assert stats == {"weekly": 0, "monthly": 0, "long_term": 0}
+    assert provider.requests == []
+
+
+def test_dedupe_lines() -> None:
+    text = "# Prefs\n\n- Likes tea\n* likes  TEA\n\n# Other\n\n- Likes tea\n- Has a cat\n"
+    assert dedupe_lines(text) == "# Prefs\n\n- Likes tea\n\n# Other\n\n- Has a cat\n"
+
+
+def test_dedupe_lines_keeps_code_tables_and_rules() -> None:
+    text = (
+        "- Likes tea\n\n---\n\n"
+        "```\n- Likes tea\nend\n```\n\n"
+        "| a | b |\n|---|---|\n| 1 | 2 |\n\n"
+        "| c | d |\n|---|---|\n| 1 | 2 |\n\n"
+        "---\n\n```sh\nend\n```\n"
+    )
+    assert dedupe_lines(text) == text
+    assert dedupe_lines("1. Likes tea\n2. likes tea\n- Has a cat\n") == "1. Likes tea\n- Has a cat\n"
+
+
+async def test_memory_is_left_alone_without_new_digests(tmp_path) -> None:
+    store = _notes(tmp_path, "2024-03-18")
+    store.write_long_term("- Likes tea\n- Likes tea\n" + "x" * 5000)
+    provider = SummaryProvider()
+    
+    stats = await MemoryConsolidator(tmp_path, provider, max_long_term_chars=100).run_once(today=TODAY)
+    
+    assert stats["long_term"] == 0
+    assert store.read_long_term().startswith("- Likes tea\n- Likes tea\n")
+    assert provider.requests == []
@@ -0,0 +1,79 @@
+import os
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.tools.memory import MemorySearchTool
+
+
+def _store(tmp_path, **kwargs) -> MemoryStore:
+    store = MemoryStore(tmp_path, **kwargs)
+    (store.memory_dir / "MEMORY.md").write_text("# Preferences\n\nLikes green tea.\n\n# Family\n\nSister Anna lives in Lyon.")
+    (store.memory_dir / "2024-03-01.md").write_text("# 2024-03-01\n\nBooked flights to Tokyo for the conference.")
+    (store.memory_dir / "2024-03-02.md").write_text("# 2024-03-02\n\nDentist appointment moved to Friday.")
+    return store
+
+
+def test_search_returns_dated_chunks(tmp_path) -> None:
+    store = _store(tmp_path)
+    
+    chunk, _ = store.search("when is the flight to Tokyo")[0]
+    assert chunk.date == "2024-03-01"
+    assert "Tokyo" in chunk.text
+    
+    chunk, _ = store.search("where does Anna live")[0]
+    assert chunk.date is None
+    assert chunk.heading == "Family"
+
+
+def test_index_follows_file_changes(tmp_path) -> None:
+    store = _store(tmp_path)
+    assert store.search("dentist")
+    
+    note = store.memory_dir / "2024-03-02.md"
+    note.write_text("# 2024-03-02\n\nCalled the plumber about the leak.")
+    st = note.stat()
+    os.utime(note, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert not store.search("dentist")
+    assert store.search("plumber")[0][0].date == "2024-03-02"
+    
+    (store.memory_dir / "2024-03-01.md").unlink()
+    assert not store.search("Tokyo")
+
+
+def test_large_files_are_chunked(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    paragraphs = [f"Fact number {i} about topic{i}." for i in range(200)]
+    (store.memory_dir / "MEMORY.md").write_text("\n\n".join(paragraphs))
+    
+    chunk, _ = store.search("topic150")[0]
+    assert "topic150" in chunk.text
+    assert len(chunk.text) <= store.index.chunk_chars
+    assert len(store.index) > 1
+
+
+def test_memory_context_is_bounded(tmp_path) -> None:
+    store = MemoryStore(tmp_path, max_context_chars=1000)
+    store.write_long_term("\n".join(f"long-term fact {i}" for i in range(500)))
+    for i in range(300):
+        store.append_today(f"note {i}")
+    
+    context = store.get_memory_context()
+    assert len(context) < 1300
+    assert "long-term fact 0" in context  # Long-term memory keeps its beginning
+    assert "note 299" in context  # Today's notes keep their end
+    assert "memory_search" in context
+
+
+def test_small_memory_is_shown_in_full(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_long_term("Likes green tea.")
+    context = store.get_memory_context()
+    assert "Likes green tea." in context
+    assert "memory_search" not in context
+
+
+async def test_memory_search_tool(tmp_path) -> None:
+    tool = MemorySearchTool(_store(tmp_path))
+    result = await tool.execute(query="tea")
+    assert "[long-term - Preferences] (memory/MEMORY.md)" in result
+    assert "Likes green tea." in result
+    assert "No memories match" in await tool.execute(query="kangaroo")
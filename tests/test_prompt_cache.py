@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.providers.litellm_provider import LiteLLMProvider
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+
+def test_system_prompt_is_stable_across_turns_and_chats(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+    a = builder.build_messages(history=[], current_message="hi", channel="telegram", chat_id="1")
+    b = builder.build_messages(history=[], current_message="yo", channel="discord", chat_id="2")
+    
+    assert a[0] == b[0]
+    assert "Current Time" not in a[0]["content"]
+    assert a[-1]["content"].startswith("[Runtime Context]")
+    assert "Chat ID: 1" in a[-1]["content"]
+    assert a[-1]["content"].endswith("\n\nhi")
+
+
+def test_cache_breakpoints_on_system_and_history(tmp_path) -> None:
+    (tmp_path / "memory").mkdir()
+    (tmp_path / "memory" / "MEMORY.md").write_text("likes tea")
+    builder = ContextBuilder(tmp_path)
+    history = [
+        {"role": "user", "content": "q1"},
+        {"role": "assistant", "content": "a1"},
+    ]
+    
+    messages = builder.build_messages(history=history, current_message="q2", cache_control=True)
+    
+    system_blocks = messages[0]["content"]
+    assert len(system_blocks) == 2
+    assert all(b["cache_control"] == {"type": "ephemeral"} for b in system_blocks)
+    assert "likes tea" in system_blocks[-1]["text"]
+    assert messages[1]["content"] == "q1"
+    assert messages[2]["content"] == [{"type": "text", "text": "a1", "cache_control": {"type": "ephemeral"}}]
+    assert isinstance(messages[-1]["content"], str)
+    assert history[1]["content"] == "a1"  # Session history is not modified
+
+
+def test_parse_usage_reports_cache_tokens() -> None:
+    anthropic = SimpleNamespace(
+        prompt_tokens=1200, completion_tokens=10, total_tokens=1210,
+        cache_read_input_tokens=1000, cache_creation_input_tokens=150,
+    )
+    openai = SimpleNamespace(
+        prompt_tokens=2000, completion_tokens=5, total_tokens=2005,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1536),
+    )
+    
+    usage = LiteLLMProvider._parse_usage(anthropic)
+    assert usage["cache_read_tokens"] == 1000
+    assert usage["cache_creation_tokens"] == 150
+    assert LiteLLMProvider._parse_usage(openai)["cache_read_tokens"] == 1536
+
+
+def test_supports_prompt_caching() -> None:
+    assert LiteLLMProvider(default_model="anthropic/claude-sonnet-4").supports_prompt_caching()
+    assert not LiteLLMProvider(default_model="openai/gpt-4o").supports_prompt_caching()
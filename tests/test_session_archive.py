@@ -0,0 +1,114 @@
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from nanobot.session.archive import SessionArchive
+from nanobot.session.manager import SessionManager
+from nanobot.session.retention import SessionRetention
+from nanobot.session.sqlite import SqliteSessionStore
+from nanobot.session.store import JsonlSessionStore
+
+
+@pytest.fixture(params=["jsonl", "sqlite"])
+def make_manager(request, tmp_path):
+    def make():
+        if request.param == "sqlite":
+            store = SqliteSessionStore(tmp_path / "sessions.db")
+        else:
+            store = JsonlSessionStore(tmp_path / "sessions")
+        return SessionManager(tmp_path, store=store, archive=SessionArchive(tmp_path / "archive"))
+    return make
+
+
+def _chat(session, start: int, count: int) -> None:
+    for i in range(start, start + count):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"message {i}")
+
+
+def _save_aged(manager: SessionManager, key: str, days: float, messages: int = 4):
+    session = manager.get_or_create(key)
+    _chat(session, 0, messages)
+    session.updated_at = datetime.now() - timedelta(days=days)
+    manager.save(session)
+    return session
+
+
+def test_idle_sessions_are_archived_and_restored(make_manager) -> None:
+    manager = make_manager()
+    old = _save_aged(manager, "telegram:old", days=40)
+    old.metadata["summary"] = {"text": "earlier", "upto": 2}
+    manager.save(old)
+    _save_aged(manager, "telegram:new", days=1)
+
+    assert manager.archive_idle(30, dry_run=True) == ["telegram:old"]
+    assert manager.archive.contains("telegram:old") is False
+    assert manager.archive_idle(30) == ["telegram:old"]
+    assert manager.archive.contains("telegram:old")
+    assert [s["key"] for s in manager.list_sessions()] == ["telegram:new"]
+
+    # Another process picks the session up again on its next message
+    restored = make_manager().get_or_create("telegram:old")
+    assert [m["content"] for m in restored.messages] == ["message 2", "message 3"]
+    assert restored.offset == 2 and restored.summary == "earlier"
+    assert manager.archive.contains("telegram:old") is False
+    assert len(manager.list_sessions()) == 2
+
+
+def test_trim_history_archives_old_messages(make_manager, tmp_path) -> None:
+    manager = make_manager()
+    session = manager.get_or_create("cli:direct")
+    _chat(session, 0, 10)
+    session.metadata["summary"] = {"text": "s", "upto": 6}
+    manager.save(session)
+
+    # Sessions in use are left alone
+    assert manager.trim_history(3) == 0
+
+    other = make_manager()
+    assert other.trim_history(3) == 6  # The kept history opens with a user message
+    reloaded = make_manager().store.load("cli:direct", full=True)
+    assert [m["content"] for m in reloaded.messages] == ["message 6", "message 7", "message 8", "message 9"]
+    assert reloaded.summarized_upto == 0
+
+    with gzip.open(tmp_path / "archive" / "trimmed" / "cli_direct.jsonl.gz", "rb") as f:
+        assert [json.loads(line)["content"] for line in f] == [f"message {i}" for i in range(6)]
+
+
+def test_purge_deletes_expired_archives(make_manager) -> None:
+    manager = make_manager()
+    _save_aged(manager, "a:1", days=40)
+    _save_aged(manager, "a:2", days=40)
+    manager.archive_idle(30)
+
+    path = manager.archive._get_path("a:1")
+    stale = time.time() - 100 * 86400
+    os.utime(path, (stale, stale))
+    assert manager.archive.purge(90) == 1
+    assert manager.archive.stats()["sessions"] == 1
+
+
+def test_retention_run_once(make_manager) -> None:
+    manager = make_manager()
+    _save_aged(manager, "a:idle", days=40)
+    retention = SessionRetention(manager, archive_after_days=30)
+    assert retention.enabled
+    assert retention.run_once() == {"archived": 1, "trimmed": 0, "purged": 0}
+    assert retention.run_once()["archived"] == 0
+
+
+def test_compact_all_reclaims_space(tmp_path) -> None:
+    store = JsonlSessionStore(tmp_path / "sessions")
+    manager = SessionManager(tmp_path, store=store)
+    session = manager.get_or_create("test:a")
+    for i in range(20):
+        session.add_message("user", f"m{i}")
+        manager.save(session)
+    before = store.disk_usage()
+
+    store.compact_all()
+    assert store.disk_usage() < before
+    assert len(store.load("test:a").messages) == 20
@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+from nanobot.session.cache import SessionCache
+from nanobot.session.manager import Session, SessionManager
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+
+def _session(key: str, size: int = 0) -> Session:
+    session = Session(key=key)
+    if size:
+        session.add_message("user", "x" * size)
+    return session
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    evicted = []
+    cache = SessionCache(max_entries=2, on_evict=lambda s: evicted.append(s.key))
+    for key in ("a", "b"):
+        cache.put(_session(key))
+    
+    assert cache.get("a") is not None  # "b" is now the least recently used
+    cache.put(_session("c"))
+    
+    assert evicted == ["b"]
+    assert cache.get("b") is None
+    assert cache.stats() == {"entries": 2, "bytes": cache.stats()["bytes"], "hits": 1, "misses": 1, "evictions": 1}
+
+
+def test_byte_budget_and_growth() -> None:
+    cache = SessionCache(max_bytes=10_000)
+    big = _session("big", 4000)
+    cache.put(big)
+    cache.put(_session("small", 100))
+    assert len(cache) == 2
+    
+    # Growing a session is accounted for when it is put back
+    big.add_message("assistant", "y" * 6000)
+    cache.put(big)
+    assert "small" not in cache
+    assert "big" in cache  # The newest entry stays even when over budget on its own
+    
+    big.clear()
+    cache.put(big)
+    assert cache.stats()["bytes"] == 0
+
+
+def test_idle_sessions_expire(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = SessionCache(idle_s=60)
+    cache.put(_session("a"))
+    now[0] += 30
+    cache.put(_session("b"))
+    now[0] += 45
+    
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.evictions == 1
+
+
+def test_evicted_sessions_are_flushed_and_reloaded(home) -> None:
+    manager = SessionManager(home, cache_entries=1)
+    a = manager.get_or_create("test:a")
+    a.add_message("user", "unsaved")
+    manager.get_or_create("test:b")  # Evicts "a" before it was saved
+    
+    assert manager.cache_stats()["evictions"] == 1
+    reloaded = manager.get_or_create("test:a")
+    assert reloaded is not a
+    assert [m["content"] for m in reloaded.messages] == ["unsaved"]
+    assert not manager.store._get_session_path("test:b").exists()  # Empty sessions are not written
+    
+    # A stale copy must not overwrite the reloaded session
+    reloaded.add_message("user", "newer")
+    manager.save(reloaded)
+    manager.save(a)
+    assert [m["content"] for m in manager.get_or_create("test:a").messages] == ["unsaved", "newer"]
@@ -0,0 +1,141 @@
+import json
+
+import pytest
+
+from nanobot.session.manager import SessionManager
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch) -> SessionManager:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return SessionManager(tmp_path)
+
+
+def _records(manager: SessionManager, key: str) -> list[dict]:
+    return [json.loads(line) for line in manager.store._get_session_path(key).read_text().splitlines()]
+
+
+def _chat(session, start: int, count: int) -> None:
+    for i in range(start, start + count):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"message {i}")
+
+
+def test_save_appends_new_messages(manager) -> None:
+    session = manager.get_or_create("test:a")
+    _chat(session, 0, 4)
+    manager.save(session)
+    path = manager.store._get_session_path("test:a")
+    before = path.read_bytes()
+    
+    _chat(session, 4, 2)
+    manager.save(session)
+    after = path.read_bytes()
+    
+    assert after.startswith(before)  # Nothing already written was touched
+    records = _records(manager, "test:a")
+    assert records[-1]["_type"] == "metadata"
+    assert records[-1]["messages"] == 6
+    assert [r["content"] for r in records if "_type" not in r] == [f"message {i}" for i in range(6)]
+
+
+def test_tail_loading_reads_only_the_window(tmp_path, manager) -> None:
+    session = manager.get_or_create("test:b")
+    _chat(session, 0, 200)
+    manager.save(session)
+    
+    tail = SessionManager(tmp_path, load_tokens=30).get_or_create("test:b")
+    assert 0 < len(tail.messages) < 20
+    assert tail.offset + len(tail.messages) == 200
+    assert tail.messages[0]["role"] == "user"
+    assert tail.get_history(max_messages=None)[-1]["content"] == "message 199"
+    
+    # Appending to a partially loaded session keeps the whole conversation
+    tail_manager = SessionManager(tmp_path, load_tokens=30)
+    tail = tail_manager.get_or_create("test:b")
+    _chat(tail, 200, 2)
+    tail_manager.save(tail)
+    tail.clear()  # Forces a rewrite
+    _chat(tail, 0, 2)
+    tail_manager.save(tail)
+    
+    full = SessionManager(tmp_path).get_or_create("test:b")
+    assert [m["content"] for m in full.messages] == ["message 0", "message 1"]
+
+
+def test_loading_stops_at_the_summary(tmp_path, manager) -> None:
+    session = manager.get_or_create("test:c")
+    _chat(session, 0, 50)
+    session.metadata["summary"] = {"text": "earlier stuff", "upto": 40}
+    manager.save(session)
+    
+    loaded = SessionManager(tmp_path).get_or_create("test:c")
+    assert loaded.offset == 40
+    assert loaded.summary == "earlier stuff"
+    assert [m["content"] for m in loaded.get_history(max_messages=None)] == [f"message {i}" for i in range(40, 50)]
+
+
+def test_compaction_drops_superseded_metadata(tmp_path, manager) -> None:
+    manager.store.COMPACT_MIN_BYTES = 1000
+    session = manager.get_or_create("test:d")
+    session.metadata["summary"] = {"text": "x" * 500, "upto": 0}
+    for i in range(0, 20, 2):
+        _chat(session, i, 2)
+        manager.save(session)
+    
+    records = _records(manager, "test:d")
+    assert sum(r.get("_type") == "metadata" for r in records) < 5
+    assert [r["content"] for r in records if "_type" not in r] == [f"message {i}" for i in range(20)]
+    
+    manager.compact(session)
+    assert sum(r.get("_type") == "metadata" for r in _records(manager, "test:d")) == 1
+
+
+def test_old_format_and_torn_writes(tmp_path, manager) -> None:
+    path = manager.store._get_session_path("test:e")
+    path.write_text(
+        json.dumps({"_type": "metadata", "created_at": "2024-01-01T00:00:00", "metadata": {"k": 1}}) + "\n"
+        + json.dumps({"role": "user", "content": "hi"}) + "\n"
+        + '{"role": "assistant", "cont'
+    )
+    
+    session = manager.get_or_create("test:e")
+    assert [m["content"] for m in session.messages] == ["hi"]
+    assert session.metadata == {"k": 1}
+    
+    _chat(session, 1, 1)
+    manager.save(session)
+    loaded = SessionManager(tmp_path).get_or_create("test:e")
+    assert [m["content"] for m in loaded.messages] == ["hi", "message 1"]
+    assert loaded.created_at.year == 2024
+    assert manager.list_sessions()[0]["key"] == "test:e"
+
+
+def test_snapshot_save_keeps_later_changes_and_merged_messages(tmp_path, manager) -> None:
+    session = manager.get_or_create("test:a")
+    _chat(session, 0, 2)
+    manager.save(session)
+    
+    # Another process appends to the same session
+    other = SessionManager(tmp_path)
+    theirs = other.get_or_create("test:a")
+    _chat(theirs, 2, 2)
+    other.save(theirs)
+    
+    _chat(session, 4, 1)
+    snapshot = session.snapshot()
+    copied, offset = snapshot.messages, snapshot.offset
+    # Changed while the snapshot is being saved
+    _chat(session, 5, 1)
+    session.metadata["summary"] = {"text": "later", "upto": 0}
+    manager.save(session, snapshot)
+    session.merge_saved(snapshot, copied, offset)
+    
+    records = _records(manager, "test:a")
+    assert records[-1]["messages"] == 5
+    assert "summary" not in records[-1]["metadata"]
+    assert [m["content"] for m in session.messages] == [f"message {i}" for i in range(6)]
+    
+    manager.save(session)
+    stored = [r["content"] for r in _records(manager, "test:a") if "_type" not in r]
+    assert stored == [f"message {i}" for i in range(6)]
+    assert _records(manager, "test:a")[-1]["metadata"]["summary"]["text"] == "later"
@@ -0,0 +1,111 @@
+import pytest
+
+from nanobot.agent.tools.sessions import SessionSearchTool
+from nanobot.session.manager import SessionManager
+from nanobot.session.search import SessionIndex
+from nanobot.session.sqlite import SqliteSessionStore
+from nanobot.session.store import JsonlSessionStore
+
+
+@pytest.fixture(params=["jsonl", "sqlite"])
+def make_store(request, tmp_path):
+    def make():
+        if request.param == "sqlite":
+            return SqliteSessionStore(tmp_path / "sessions.db")
+        return JsonlSessionStore(tmp_path / "sessions")
+    return make
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SessionIndex(tmp_path / "index.db")
+    yield index
+    index.close()
+
+
+def _keys(hits) -> list[tuple[str, int]]:
+    return [(h.session_key, h.seq) for h in hits]
+
+
+def test_saves_are_indexed_incrementally(make_store, index, tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=make_store(), index=index)
+    session = manager.get_or_create("telegram:1")
+    session.add_message("user", "Book a table at the Italian restaurant")
+    session.add_message("assistant", "Done, table for two at 8pm")
+    manager.save(session)
+    session.add_message("user", "Also remind me to buy flowers")
+    session.add_message("tool", "flowers flowers flowers")
+    manager.save(session)
+
+    other = manager.get_or_create("slack:2")
+    other.add_message("user", "The restaurant review was bad")
+    manager.save(other)
+
+    assert _keys(manager.search("flowers")) == [("telegram:1", 2)]
+    assert set(_keys(manager.search("restaurant"))) == {("telegram:1", 0), ("slack:2", 0)}
+    assert _keys(manager.search("italian restaurant"))[0] == ("telegram:1", 0)
+    assert _keys(manager.search("restaurant", key="slack:2")) == [("slack:2", 0)]
+    assert "**restaurant**" in manager.search("restaurants", key="slack:2")[0].snippet
+    assert manager.search("?!") == []
+
+
+def test_clear_and_delete_update_the_index(make_store, index, tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=make_store(), index=index)
+    session = manager.get_or_create("cli:direct")
+    session.add_message("user", "secret plans for the weekend")
+    manager.save(session)
+
+    session.clear()
+    session.add_message("user", "something else")
+    manager.save(session)
+    assert manager.search("weekend") == []
+    assert _keys(manager.search("something")) == [("cli:direct", 0)]
+
+    manager.delete("cli:direct")
+    assert manager.search("something") == []
+
+
+def test_sync_indexes_history_stored_without_the_index(make_store, index, tmp_path) -> None:
+    plain = SessionManager(tmp_path, store=make_store())
+    session = plain.get_or_create("test:a")
+    for i in range(20):
+        session.add_message("user", f"note number {i} about zebras" if i == 7 else f"note number {i}")
+    plain.save(session)
+
+    assert index.sync(make_store()) == 20
+    assert index.sync(make_store()) == 0  # Nothing changed
+
+    session.add_message("assistant", "zebras again")
+    plain.save(session)
+    assert index.sync(make_store()) == 1  # Only the new message is read
+    assert _keys(index.search("zebras", 5)) in ([("test:a", 7), ("test:a", 20)], [("test:a", 20), ("test:a", 7)])
+
+    plain.delete("test:a")
+    index.sync(make_store())
+    assert index.search("zebras") == []
+
+
+def test_read_messages_leaves_loaded_sessions_alone(make_store, tmp_path) -> None:
+    store = make_store()
+    manager = SessionManager(tmp_path, store=store)
+    session = manager.get_or_create("test:a")
+    for i in range(5):
+        session.add_message("user", f"m{i}")
+    manager.save(session)
+
+    assert [m["content"] for m in store.read_messages("test:a", 3)] == ["m3", "m4"]
+    session.add_message("user", "m5")
+    manager.save(session)
+    assert [m["content"] for m in store.read_messages("test:a")] == [f"m{i}" for i in range(6)]
+
+
+async def test_session_search_tool(index, tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "sessions"), index=index)
+    session = manager.get_or_create("telegram:1")
+    session.add_message("user", "My passport number ends in 4421")
+    manager.save(session)
+
+    tool = SessionSearchTool(manager)
+    result = await tool.execute(query="passport")
+    assert "[telegram:1 #0, user" in result and "**passport**" in result
+    assert "No earlier messages" in await tool.execute(query="visa")
@@ -0,0 +1,95 @@
+import pytest
+
+from nanobot.session.manager import SessionManager, migrate_sessions
+from nanobot.session.sqlite import SqliteSessionStore
+from nanobot.session.store import JsonlSessionStore
+
+
+@pytest.fixture(params=["jsonl", "sqlite"])
+def make_store(request, tmp_path):
+    def make(load_tokens=None):
+        if request.param == "sqlite":
+            return SqliteSessionStore(tmp_path / "sessions.db", load_tokens=load_tokens)
+        return JsonlSessionStore(tmp_path / "sessions", load_tokens=load_tokens)
+    return make
+
+
+def _chat(session, start: int, count: int) -> None:
+    for i in range(start, start + count):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"message {i}")
+
+
+def _contents(session) -> list[str]:
+    return [m["content"] for m in session.messages]
+
+
+def test_round_trip_and_tail_window(make_store, tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=make_store())
+    session = manager.get_or_create("telegram:ou_123")
+    _chat(session, 0, 100)
+    manager.save(session)
+    _chat(session, 100, 2)
+    session.metadata["summary"] = {"text": "old stuff", "upto": 10}
+    manager.save(session)
+    
+    full = make_store().load("telegram:ou_123")
+    assert full.offset == 10 and full.summary == "old stuff"
+    assert _contents(full) == [f"message {i}" for i in range(10, 102)]
+    
+    tail = make_store(load_tokens=20).load("telegram:ou_123")
+    assert tail.offset + len(tail.messages) == 102
+    assert 0 < len(tail.messages) < 20 and tail.messages[0]["role"] == "user"
+    
+    assert [s["key"] for s in make_store().list_sessions()] == ["telegram:ou_123"]
+
+
+def test_partial_session_rewrite_keeps_unloaded_messages(make_store, tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=make_store())
+    session = manager.get_or_create("test:a")
+    _chat(session, 0, 40)
+    manager.save(session)
+    
+    tail_manager = SessionManager(tmp_path, store=make_store(load_tokens=10))
+    tail = tail_manager.get_or_create("test:a")
+    assert tail.offset > 0
+    tail.messages[-1] = {"role": "assistant", "content": "edited", "tokens": 1}  # No longer extends the stored copy
+    tail_manager.save(tail)
+    
+    reloaded = make_store().load("test:a", full=True)
+    assert _contents(reloaded) == [f"message {i}" for i in range(39)] + ["edited"]
+
+
+def test_listing_is_ordered_by_update(make_store, tmp_path) -> None:
+    manager = SessionManager(tmp_path, store=make_store())
+    for key in ("a:1", "b:2", "c:3"):
+        session = manager.get_or_create(key)
+        _chat(session, 0, 2)
+        manager.save(session)
+    session = manager.get_or_create("a:1")
+    _chat(session, 2, 2)
+    manager.save(session)
+    
+    listed = manager.list_sessions()
+    assert [s["key"] for s in listed] == ["a:1", "c:3", "b:2"]
+    assert listed[0]["messages"] == 4
+    assert manager.delete("b:2") and not manager.delete("b:2")
+
+
+def test_migrate_jsonl_to_sqlite(tmp_path) -> None:
+    jsonl = JsonlSessionStore(tmp_path / "sessions")
+    manager = SessionManager(tmp_path, store=jsonl)
+    for key in ("cli:direct", "heartbeat"):
+        session = manager.get_or_create(key)
+        _chat(session, 0, 6)
+        session.metadata["summary"] = {"text": "s", "upto": 2}
+        manager.save(session)
+    
+    sqlite = SqliteSessionStore(tmp_path / "sessions.db")
+    assert migrate_sessions(jsonl, sqlite) == (2, 0)
+    assert migrate_sessions(jsonl, sqlite) == (0, 2)
+    
+    migrated = sqlite.load("cli:direct", full=True)
+    assert _contents(migrated) == [f"message {i}" for i in range(6)]
+    assert migrated.summary == "s"
+    assert sqlite.load("cli:direct").offset == 2
+    assert {s["key"] for s in sqlite.list_sessions()} == {"cli:direct", "heartbeat"}
@@ -0,0 +1,85 @@
+import pytest
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.tools.skills import ListSkillsTool
+from nanobot.utils.bm25 import BM25Index
+
+TOPICS = [
+    ("weather", "Get current weather and forecasts", "Use wttr.in to fetch temperature, rain and wind."),
+    ("github", "Work with GitHub issues and pull requests", "Use the gh CLI for PRs, issues and CI runs."),
+    ("pdf-tools", "Extract text and tables from PDF files", "Use pdftotext to convert PDF documents."),
+    ("calendar", "Manage calendar events and meetings", "Create, move and cancel events."),
+    ("translate", "Translate text between languages", "Translation of documents and messages."),
+]
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+
+def _workspace(tmp_path, extra: int = 20):
+    fillers = [(f"filler-{i}", f"Filler skill number {i}", "Nothing relevant here.") for i in range(extra)]
+    for name, description, body in TOPICS + fillers:
+        skill = tmp_path / "skills" / name
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {description}\n---\n\n{body}")
+    return tmp_path
+
+
+def test_bm25_ranks_and_updates() -> None:
+    index = BM25Index()
+    index.add("a", "the quick brown fox")
+    index.add("b", "weather forecast rain and wind")
+    index.add("c", "fox hunting weather")
+    
+    assert [d for d, _ in index.search("rain forecast")] == ["b"]
+    assert [d for d, _ in index.search("fox")][0] in {"a", "c"}
+    
+    index.remove("b")
+    assert index.search("rain") == []
+    index.add("c", "rain dance")
+    assert [d for d, _ in index.search("rain")] == ["c"]
+    assert index.search("fox")[0][0] == "a"
+
+
+def test_only_relevant_skills_are_injected(tmp_path) -> None:
+    builder = ContextBuilder(_workspace(tmp_path), skills_top_k=3)
+    builder.skills.builtin_skills = None
+    
+    messages = builder.build_messages(history=[], current_message="Will it rain in Paris tomorrow? Check the weather")
+    system, user = messages[0]["content"], messages[-1]["content"]
+    
+    assert "<skills>" not in system
+    assert "list_skills" in system
+    assert "<name>weather</name>" in user
+    assert user.count("<skill ") <= 3
+
+
+def test_recent_history_informs_retrieval(tmp_path) -> None:
+    builder = ContextBuilder(_workspace(tmp_path), skills_top_k=3)
+    history = [
+        {"role": "user", "content": "I need to pull the tables out of this PDF"},
+        {"role": "assistant", "content": "Sure, send it over."},
+    ]
+    user = builder.build_messages(history=history, current_message="ok here it is")[-1]["content"]
+    assert "<name>pdf-tools</name>" in user
+
+
+def test_small_libraries_are_listed_in_full(tmp_path) -> None:
+    builder = ContextBuilder(_workspace(tmp_path, extra=0), skills_top_k=8)
+    builder.skills.builtin_skills = None
+    messages = builder.build_messages(history=[], current_message="hello")
+    
+    assert messages[0]["content"].count("<skill ") == 5
+    assert "Relevant Skills" not in messages[-1]["content"]
+
+
+async def test_list_skills_tool(tmp_path) -> None:
+    builder = ContextBuilder(_workspace(tmp_path), skills_top_k=3)
+    tool = ListSkillsTool(builder.skills)
+    
+    found = await tool.execute(query="translate this message to French")
+    assert "<name>translate</name>" in found
+    assert "<name>filler-0</name>" in await tool.execute()
@@ -0,0 +1,104 @@
+import os
+
+from nanobot.agent.skills import SkillsLoader
+
+
+def _skill(root, name: str, frontmatter: str, body: str = "Body.") -> None:
+    (root / name).mkdir(parents=True, exist_ok=True)
+    (root / name / "SKILL.md").write_text(f"---\n{frontmatter}\n---\n\n{body}")
+
+
+def _bump(path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _loader(tmp_path) -> SkillsLoader:
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=tmp_path / "builtin", index_path=tmp_path / "index.json")
+    loader.check_interval_s = 0
+    return loader
+
+
+def _count_parses(loader, monkeypatch) -> list[str]:
+    parsed = []
+    original = loader._parse_skill
+    monkeypatch.setattr(loader, "_parse_skill", lambda name, *a: parsed.append(name) or original(name, *a))
+    return parsed
+
+
+def test_yaml_frontmatter(tmp_path) -> None:
+    _skill(tmp_path / "builtin", "notes", (
+        "name: notes\n"
+        "description: >\n  Take notes\n  quickly.\n"
+        "always: true\n"
+        "metadata:\n  nanobot:\n    emoji: x"
+    ))
+    _skill(tmp_path / "builtin", "gh", 'description: "GitHub: issues"\nmetadata: {"nanobot":{"requires":{"bins":["no-such-bin-xyz"]}}}')
+    loader = _loader(tmp_path)
+    
+    assert loader.get_skill_metadata("notes")["description"] == "Take notes quickly.\n"
+    assert loader.get_always_skills() == ["notes"]
+    assert [s["name"] for s in loader.list_skills()] == ["notes"]
+    summary = loader.build_skills_summary()
+    assert "<description>GitHub: issues</description>" in summary
+    assert "<requires>CLI: no-such-bin-xyz</requires>" in summary
+
+
+def test_frontmatter_that_is_not_yaml_is_read_line_by_line(tmp_path) -> None:
+    _skill(tmp_path / "builtin", "todo", "name: todo\ndescription: Track tasks: add, list and close them")
+    loader = _loader(tmp_path)
+    
+    meta = loader.get_skill_metadata("todo")
+    assert meta["description"] == "Track tasks: add, list and close them"
+    assert "<description>Track tasks: add, list and close them</description>" in loader.build_skills_summary()
+
+
+def test_date_in_frontmatter(tmp_path) -> None:
+    _skill(tmp_path / "builtin", "notes", "description: Notes\nupdated: 2024-05-01")
+    loader = _loader(tmp_path)
+    
+    assert "<description>Notes</description>" in loader.build_skills_summary()
+    assert loader.get_skill_metadata("notes")["updated"] == "2024-05-01"
+    assert "2024-05-01" in (tmp_path / "index.json").read_text()
+
+
+def test_index_is_persisted_and_reused(tmp_path, monkeypatch) -> None:
+    for name in ("a", "b", "c"):
+        _skill(tmp_path / "builtin", name, f"description: skill {name}")
+    _loader(tmp_path).list_skills()
+    assert (tmp_path / "index.json").exists()
+    
+    loader = _loader(tmp_path)
+    parsed = _count_parses(loader, monkeypatch)
+    assert len(loader.list_skills()) == 3
+    assert parsed == []  # Nothing changed on disk, so nothing is re-parsed
+
+
+def test_index_updates_incrementally(tmp_path, monkeypatch) -> None:
+    for name in ("a", "b"):
+        _skill(tmp_path / "builtin", name, f"description: skill {name}")
+    loader = _loader(tmp_path)
+    loader.list_skills()
+    parsed = _count_parses(loader, monkeypatch)
+    
+    skill_file = tmp_path / "builtin" / "a" / "SKILL.md"
+    skill_file.write_text("---\ndescription: edited\n---\n")
+    _bump(skill_file)
+    _skill(tmp_path / "ws" / "skills", "b", "description: workspace b")
+    
+    skills = {s["name"]: s for s in loader.list_skills()}
+    assert sorted(parsed) == ["a", "b"]
+    assert loader.get_skill_metadata("a")["description"] == "edited"
+    assert skills["b"]["source"] == "workspace"
+
+
+def test_requirements_are_rechecked(tmp_path, monkeypatch) -> None:
+    _skill(tmp_path / "builtin", "api", 'metadata: {"nanobot":{"requires":{"env":["NANOBOT_TEST_TOKEN"]}}}')
+    monkeypatch.delenv("NANOBOT_TEST_TOKEN", raising=False)
+    loader = _loader(tmp_path)
+    assert loader.list_skills() == []
+    
+    monkeypatch.setenv("NANOBOT_TEST_TOKEN", "x")
+    assert loader.list_skills() == []  # Cached until the requirements TTL expires
+    loader.requirements_ttl_s = 0
+    assert [s["name"] for s in loader.list_skills()] == ["api"]
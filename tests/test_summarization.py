@@ -0,0 +1,112 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.summarizer import ConversationSummarizer
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.session.manager import Session
+
+
+class RecordingProvider(LLMProvider):
+    """Echoes chat turns and answers summary requests with a fixed summary."""
+    
+    def __init__(self):
+        super().__init__()
+        self.summary_requests: list[dict[str, Any]] = []
+        self.systems: list[str] = []
+    
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        system = messages[0]["content"]
+        if "running summary" in system:
+            self.summary_requests.append({"content": messages[-1]["content"], **kwargs})
+            return LLMResponse(content=f"- summary #{len(self.summary_requests)}")
+        self.systems.append(system)
+        return LLMResponse(content="ok " + "word " * 50)
+    
+    def get_default_model(self) -> str:
+        return "main-model"
+
+
+def _session(turns: int) -> Session:
+    session = Session(key="test:1")
+    for i in range(turns):
+        session.add_message("user", f"question {i} " + "blah " * 40)
+        session.add_message("assistant", f"answer {i} " + "blah " * 40)
+    return session
+
+
+async def test_oldest_span_is_summarized() -> None:
+    provider = RecordingProvider()
+    summarizer = ConversationSummarizer(provider, model="cheap-model", trigger_tokens=400, keep_tokens=200)
+    session = _session(10)
+    
+    assert await summarizer.summarize(session)
+    upto = session.summarized_upto
+    assert session.summary == "- summary #1"
+    assert 0 < upto < len(session.messages)
+    assert session.messages[upto]["role"] == "user"
+    assert provider.summary_requests[0]["model"] == "cheap-model"
+    assert "question 0" in provider.summary_requests[0]["content"]
+    
+    # History resumes where the summary ends
+    history = session.get_history(max_messages=None)
+    assert history[0]["content"] == session.messages[upto]["content"]
+    
+    # Nothing more to do until the session grows again
+    assert not await summarizer.summarize(session)
+    for i in range(10, 15):
+        session.add_message("user", f"question {i} " + "blah " * 40)
+        session.add_message("assistant", "answer")
+    assert await summarizer.summarize(session)
+    assert "## Summary so far\n\n- summary #1" in provider.summary_requests[1]["content"]
+    assert session.summarized_upto > upto
+
+
+async def test_cleared_session_discards_summary() -> None:
+    provider = RecordingProvider()
+    summarizer = ConversationSummarizer(provider, trigger_tokens=400)
+    session = _session(10)
+    
+    task = asyncio.create_task(summarizer.summarize(session))
+    session.clear()
+    for i in range(10):
+        session.add_message("user", "new")
+    assert not await task
+    assert session.summary is None
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    ws = tmp_path / "workspace"
+    ws.mkdir()
+    return ws
+
+
+async def test_loop_summarizes_in_background(workspace) -> None:
+    provider = RecordingProvider()
+    agent = AgentLoop(
+        bus=MessageBus(),
+        provider=provider,
+        workspace=workspace,
+        summary_model="cheap-model",
+        summarize_after_tokens=300,
+    )
+    
+    for i in range(6):
+        await agent.process_direct(f"message {i}", session_key="cron:job")
+        await asyncio.gather(*agent._summary_tasks.values())
+    
+    session = agent.sessions.get_or_create("cron:job")
+    assert session.summary
+    assert provider.summary_requests[0]["model"] == "cheap-model"
+    assert "# Earlier in this conversation" in provider.systems[-1]
+    
+    # The summary survives a reload from disk
+    agent.sessions._cache.clear()
+    reloaded = agent.sessions.get_or_create("cron:job")
+    assert reloaded.summary == session.summary
+    assert reloaded.summarized_upto == session.summarized_upto
@@ -0,0 +1,87 @@
+import json
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.session.manager import Session, SessionManager
+from nanobot.utils.tokens import count_tokens, fit_newest, message_tokens
+
+
+def test_count_tokens() -> None:
+    assert count_tokens("") == 0
+    assert 0 < count_tokens("hello world") < 5
+    assert count_tokens("word " * 1000) > count_tokens("word " * 100)
+
+
+def test_fit_newest_fills_from_newest_and_starts_with_user() -> None:
+    messages = [
+        {"role": "user", "content": "a", "tokens": 10},
+        {"role": "assistant", "content": "b", "tokens": 10},
+        {"role": "user", "content": "c", "tokens": 10},
+        {"role": "assistant", "content": "d", "tokens": 10},
+    ]
+    per_message = message_tokens(messages[0])
+    
+    assert fit_newest(messages, per_message * 4) == messages
+    # Room for three, but the window must not open with an assistant reply
+    assert fit_newest(messages, per_message * 3) == messages[2:]
+    assert fit_newest(messages, per_message - 1) == []
+
+
+def test_token_counts_are_stored_with_messages(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("test:c")
+    session.add_message("user", "hello there")
+    manager.save(session)
+    
+    lines = manager.store._get_session_path("test:c").read_text().splitlines()
+    stored = json.loads(lines[-2])  # The last line is the metadata record
+    assert stored["tokens"] == count_tokens("hello there")
+
+
+def test_token_counts_are_filled_in_on_load(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    manager = SessionManager(tmp_path)
+    path = manager.store._get_session_path("test:old")
+    path.write_text(
+        json.dumps({"_type": "metadata", "key": "test:old", "metadata": {}}) + "\n"
+        + json.dumps({"role": "user", "content": "hello there"}) + "\n"
+    )
+    
+    session = manager.get_or_create("test:old")
+    assert session.messages[0]["tokens"] == count_tokens("hello there")
+    
+    # Reading history leaves messages as they are, so snapshots can be saved meanwhile
+    legacy = Session(key="test:legacy", messages=[{"role": "user", "content": "hi"}])
+    assert legacy.get_history()[0]["tokens"] == count_tokens("hi")
+    assert "tokens" not in legacy.messages[0]
+
+
+def test_history_is_bounded_by_tokens_not_count() -> None:
+    session = Session(key="test:c")
+    for i in range(100):
+        session.add_message("user", f"short {i}")
+        session.add_message("assistant", "ok")
+    # Far more than 50 short messages fit a generous budget
+    assert len(session.get_history(max_messages=None, max_tokens=10_000)) == 200
+    
+    session.add_message("user", "log line\n" * 5000)
+    history = session.get_history(max_messages=None, max_tokens=10_000)
+    assert history == []  # The huge paste alone exceeds the budget
+
+
+def test_build_messages_reserves_prompt_and_current_message(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+    history = []
+    for i in range(50):
+        history.append({"role": "user", "content": "question " * 20, "tokens": 40})
+        history.append({"role": "assistant", "content": "answer " * 20, "tokens": 40})
+    
+    full = builder.build_messages(history=history, current_message="hi")
+    prompt_cost = message_tokens(full[0]) + message_tokens(full[-1])
+    budget = prompt_cost + 10 * message_tokens(history[0])
+    
+    messages = builder.build_messages(history=history, current_message="hi", max_input_tokens=budget)
+    assert len(messages) == 2 + 10
+    assert messages[1]["role"] == "user"
+    assert "tokens" not in messages[1]
+    assert sum(message_tokens(m) for m in messages) <= budget
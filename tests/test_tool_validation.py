@@ -1,3 +1,5 @@
+import asyncio
+import time
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
@@ -86,3 +88,85 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+class RecordingTool(Tool):
+    """Sleeps, then records when it finished."""
+
+    def __init__(self, name: str, concurrency: str, log: list[str], delay: float = 0.05):
+        self._name = name
+        self.concurrency = concurrency
+        self.log = log
+        self.delay = delay
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "recording tool"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"tag": {"type": "string"}}}
+
+    async def execute(self, tag: str = "", **kwargs: Any) -> str:
+        self.log.append(f"start {self._name}{tag}")
+        await asyncio.sleep(self.delay)
+        self.log.append(f"end {self._name}{tag}")
+        return f"{self._name}{tag}"
+
+
+async def test_execute_batch_runs_read_only_calls_concurrently() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(RecordingTool("read", "read_only", log, delay=0.1))
+
+    start = time.monotonic()
+    results = await reg.execute_batch([("read", {"tag": str(i)}) for i in range(3)])
+    elapsed = time.monotonic() - start
+
+    assert results == ["read0", "read1", "read2"]
+    assert elapsed < 0.25
+
+
+async def test_execute_batch_orders_side_effects_and_isolates_exclusive() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(RecordingTool("write", "side_effect", log))
+    reg.register(RecordingTool("exec", "exclusive", log))
+    reg.register(RecordingTool("read", "read_only", log))
+
+    results = await reg.execute_batch([
+        ("write", {"tag": "1"}),
+        ("read", {"tag": "1"}),
+        ("write", {"tag": "2"}),
+        ("exec", {}),
+        ("missing", {}),
+    ])
+
+    assert results[:4] == ["write1", "read1", "write2", "exec"]
+    assert "not found" in results[4]
+    # Side-effecting calls never overlap and keep their order
+    assert log.index("end write1") < log.index("start write2")
+    # The exclusive call starts only after everything before it finished
+    assert log.index("start exec") > max(log.index("end write2"), log.index("end read1"))
+
+
+async def test_execute_batch_reads_see_earlier_writes(tmp_path) -> None:
+    from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool
+
+    reg = ToolRegistry()
+    reg.register(WriteFileTool())
+    reg.register(ReadFileTool())
+    target = tmp_path / "notes.txt"
+
+    for i in range(50):
+        results = await reg.execute_batch([
+            ("write_file", {"path": str(target), "content": f"v{i}"}),
+            ("read_file", {"path": str(target)}),
+            ("write_file", {"path": str(target), "content": f"w{i}"}),
+        ])
+        assert results[1] == f"v{i}"
+    assert target.read_text() == "w49"
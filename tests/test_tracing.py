@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.tracing import Tracer, get_tracer, report, set_tracer
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    previous = get_tracer()
+    tracer = Tracer(path=tmp_path / "traces" / "traces.jsonl")
+    set_tracer(tracer)
+    yield tracer
+    set_tracer(previous)
+
+
+def _records(tracer: Tracer) -> list[dict]:
+    tracer.flush()
+    return [json.loads(line) for line in tracer.path.read_text().splitlines()]
+
+
+async def test_spans_nest_across_tasks(tracer) -> None:
+    with tracer.trace("turn", trace_id="t1"):
+        with tracer.span("outer"):
+            async def child(name: str) -> None:
+                with tracer.span(name):
+                    await asyncio.sleep(0.01)
+            await asyncio.gather(asyncio.create_task(child("a")), asyncio.create_task(child("b")))
+    
+    (record,) = _records(tracer)
+    spans = {s["name"]: s for s in record["spans"]}
+    assert record["trace_id"] == "t1"
+    assert spans["outer"]["parent"] == record["span_id"]
+    assert spans["a"]["parent"] == spans["outer"]["id"]
+    assert spans["b"]["parent"] == spans["outer"]["id"]
+    assert spans["a"]["duration_ms"] >= 10
+
+
+def test_span_outside_trace_is_noop(tracer) -> None:
+    with tracer.span("orphan") as s:
+        s.set(x=1)
+    assert not tracer.path.exists()
+
+
+def test_rotation_keeps_backups(tmp_path) -> None:
+    tracer = Tracer(path=tmp_path / "traces.jsonl", max_bytes=300, backups=2)
+    for i in range(20):
+        with tracer.trace("turn", trace_id=f"trace{i:02d}"):
+            pass
+    
+    assert (tmp_path / "traces.1.jsonl").exists()
+    assert (tmp_path / "traces.2.jsonl").exists()
+    assert not (tmp_path / "traces.3.jsonl").exists()
+    traces = report.load_traces(tmp_path / "traces.jsonl", backups=2)
+    assert traces[-1]["trace_id"] == "trace19"
+
+
+class ToolThenReplyProvider(LLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+    
+    async def chat(self, messages, **kwargs) -> LLMResponse:
+        self.calls += 1
+        if self.calls == 1:
+            return LLMResponse(
+                content=None,
+                tool_calls=[ToolCallRequest(id="1", name="list_dir", arguments={"path": "."})],
+                usage={"prompt_tokens": 10, "completion_tokens": 2},
+            )
+        return LLMResponse(content="done", usage={"prompt_tokens": 20, "completion_tokens": 1})
+    
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+async def test_turn_trace_covers_inbound_to_outbound(tracer, tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    bus = MessageBus()
+    agent = AgentLoop(bus=bus, provider=ToolThenReplyProvider(), workspace=workspace)
+    
+    agent._submit(InboundMessage(channel="test", sender_id="u", chat_id="c", content="hi"))
+    out = await asyncio.wait_for(bus.consume_outbound(), 2.0)
+    tracer.record(out.metadata["trace_id"], "outbound.dispatch", 0.0, 5.0, channel="test")
+    tracer.flush()
+    
+    (trace,) = report.load_traces(tracer.path)
+    names = [s["name"] for s in trace["spans"]]
+    assert trace["trace_id"] == out.metadata["trace_id"]
+    assert trace["attrs"]["session"] == "test:c"
+    assert names.count("llm.chat") == 2
+    assert {"bus.wait", "session.load", "context.build", "tool.execute", "session.save", "outbound.dispatch"} <= set(names)
+    
+    llm = [s for s in trace["spans"] if s["name"] == "llm.chat"]
+    assert llm[0]["attrs"]["prompt_tokens"] == 10
+    tool = next(s for s in trace["spans"] if s["name"] == "tool.execute")
+    assert tool["attrs"]["tool"] == "list_dir"
+    
+    phases = {p.name: p for p in report.phase_breakdown([trace])}
+    assert phases["llm.chat"].count == 2
+    assert phases["outbound.dispatch"].max_ms == 5.0